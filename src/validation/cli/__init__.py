@@ -3,14 +3,38 @@
 # SPDX-License-Identifier: MIT
 
 import asyncio
+import json
 import logging
 from os import getenv
 
 import click
 
+from validation.deployment import DEPLOYMENT
+from validation.helpers import log_failure
 from validation.tests.github import GithubTests
 from validation.tests.gitlab import GitlabTests
 from validation.tests.pagure import PagureTests
+from validation.utils.async_http import close_async_http_clients
+from validation.utils.conditional_cache import HTTP_OK
+from validation.utils.events import (
+    EVENTS_PORT_ENV,
+    EVENTS_SECRET_ENV,
+    EventReceiver,
+    events_receiver_enabled,
+    get_event_hub,
+    publish_event,
+)
+from validation.utils.executor import shutdown_executors
+from validation.utils.health import health_monitor
+from validation.utils.history import RunHistory, run_history
+from validation.utils.metrics import (
+    MetricsServer,
+    export_metrics,
+    metrics,
+    metrics_server_enabled,
+)
+from validation.utils.tracing import span
+from validation.utils.trigger_scheduler import TriggerLimits
 
 logging.basicConfig(
     level=logging.DEBUG,
@@ -20,7 +44,13 @@ logging.basicConfig(
 
 @click.group(context_settings={"help_option_names": ["-h", "--help"]}, invoke_without_command=True)
 @click.version_option(prog_name="validation")
-def validation():
+@click.pass_context
+def validation(ctx: click.Context):
+    if ctx.invoked_subcommand is None:
+        run_validation()
+
+
+def run_validation():
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     tasks = []
@@ -32,18 +62,34 @@ def validation():
     else:
         logging.info("GITHUB_TOKEN not set, skipping the validation for GitHub.")
 
-    # GitLab
+    # GitLab, with the limits of the triggers on the instance
     gitlab_instances = [
-        ("https://gitlab.com", "packit-service", "GITLAB_TOKEN"),
-        ("https://gitlab.gnome.org", "packit-validation", "GITLAB_GNOME_TOKEN"),
+        (
+            "https://gitlab.com",
+            "packit-service",
+            "GITLAB_TOKEN",
+            TriggerLimits(per_minute=1, burst=2, max_concurrent=4),
+        ),
+        (
+            "https://gitlab.gnome.org",
+            "packit-validation",
+            "GITLAB_GNOME_TOKEN",
+            TriggerLimits(per_minute=0.5, burst=1, max_concurrent=2),
+        ),
         (
             "https://gitlab.freedesktop.org",
             "packit-service",
             "GITLAB_FREEDESKTOP_TOKEN",
+            TriggerLimits(per_minute=0.5, burst=1, max_concurrent=2),
+        ),
+        (
+            "https://salsa.debian.org",
+            "packit-validation",
+            "SALSA_DEBIAN_TOKEN",
+            TriggerLimits(per_minute=0.5, burst=1, max_concurrent=2),
         ),
-        ("https://salsa.debian.org", "packit-validation", "SALSA_DEBIAN_TOKEN"),
     ]
-    for instance_url, namespace, token in gitlab_instances:
+    for instance_url, namespace, token, trigger_limits in gitlab_instances:
         if not getenv(token):
             logging.info(
                 "%s not set, skipping the validation for GitLab instance: %s",
@@ -58,14 +104,20 @@ def validation():
                 instance_url=instance_url,
                 namespace=namespace,
                 token_name=token,
+                trigger_limits=trigger_limits,
             ).run(),
         )
 
-    # Pagure
+    # Pagure, with the limits of the triggers on the instance
     pagure_instances = [
-        ("https://src.fedoraproject.org/", "rpms", "PAGURE_TOKEN"),
+        (
+            "https://src.fedoraproject.org/",
+            "rpms",
+            "PAGURE_TOKEN",
+            TriggerLimits(per_minute=2, burst=5, max_concurrent=5),
+        ),
     ]
-    for instance_url, namespace, token in pagure_instances:
+    for instance_url, namespace, token, trigger_limits in pagure_instances:
         if not getenv(token):
             logging.info(
                 "%s not set, skipping the validation for Pagure instance: %s",
@@ -80,6 +132,7 @@ def validation():
                 instance_url=instance_url,
                 namespace=namespace,
                 token_name=token,
+                trigger_limits=trigger_limits,
             ).run(),
         )
 
@@ -88,10 +141,31 @@ def validation():
         raise SystemExit(1)
 
     logging.info("Running %d validation test suite(s)", len(tasks))
+    history = run_history()
+    history.start_run(DEPLOYMENT.name)
+    metrics_server = None
+    if metrics_server_enabled():
+        metrics_server = MetricsServer.from_env(metrics())
+        loop.run_until_complete(metrics_server.start())
+    receiver = None
+    if events_receiver_enabled():
+        # Event mode, the polls are woken up by the received webhooks/events
+        receiver = EventReceiver.from_env(get_event_hub())
+        loop.run_until_complete(receiver.start())
     try:
-        results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        # The suites run within the span of the whole run
+        with span("validation", attributes={"deployment": DEPLOYMENT.name}):
+            results = loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
         logging.info("All validation tests completed")
 
+        monitor = health_monitor()
+        if monitor.tripped:
+            # One failure for the whole outage instead of one per test
+            log_failure(
+                f"Validation ended early, {monitor.aborted} test(s) aborted: "
+                f"{monitor.tripped_reason}",
+            )
+
         # Check if any test suite failed
         failed_count = sum(1 for result in results if isinstance(result, Exception))
         if failed_count:
@@ -101,4 +175,103 @@ def validation():
         logging.info("Validation interrupted by user")
         raise SystemExit(130) from None
     finally:
+        history.finish_run(health_monitor().tripped_reason)
+        if metrics_server:
+            loop.run_until_complete(metrics_server.stop())
+        export_metrics(metrics(), DEPLOYMENT.name)
+        if receiver:
+            loop.run_until_complete(receiver.stop())
+            logging.info("Received %d event(s)", receiver.received)
+        loop.run_until_complete(close_async_http_clients())
+        shutdown_executors()
         loop.close()
+
+
+@validation.command("publish-event")
+@click.option(
+    "--url",
+    default=lambda: f"http://localhost:{getenv(EVENTS_PORT_ENV, '8080')}",
+    help="URL of the event receiver of a running validation.",
+)
+@click.option(
+    "--webhook",
+    "webhook_header",
+    help="Send as a forge webhook with this header set to TOPIC (e.g. X-GitHub-Event).",
+)
+@click.argument("topic")
+@click.argument("body")
+def publish_event_command(url: str, webhook_header: str | None, topic: str, body: str):
+    """
+    Publish an event (JSON BODY) to the event receiver of a running validation,
+    a stand-in for the message bus and forge webhooks.
+
+    \b
+    Examples:
+        validation publish-event org.fedoraproject.prod.copr.build.end \\
+            '{"build": 123, "owner": "packit", "copr": "packit-hello-world-1"}'
+        validation publish-event --webhook X-GitHub-Event check_run \\
+            '{"check_run": {"head_sha": "abc123"}}'
+    """
+    status = publish_event(
+        url,
+        topic,
+        json.loads(body),
+        webhook_header=webhook_header,
+        secret=getenv(EVENTS_SECRET_ENV),
+    )
+    click.echo(f"Receiver responded with {status}")
+    if status != HTTP_OK:
+        raise SystemExit(1)
+
+
+@validation.command("history")
+@click.option("--limit", default=20, show_default=True, help="Number of the latest runs to show.")
+@click.option(
+    "--baseline",
+    default=RunHistory.BASELINE_RUNS,
+    show_default=True,
+    help="Number of the preceding runs the latencies of a run are compared with.",
+)
+@click.option(
+    "--threshold",
+    default=RunHistory.REGRESSION_RATIO,
+    show_default=True,
+    help="Median phase latency relative to the baseline reported as a regression.",
+)
+def history_command(limit: int, baseline: int, threshold: float):
+    """
+    Show the trends of the phase latencies of the recorded runs and flag
+    the phases that regressed compared with the preceding runs.
+
+    Exits with 1 if the latest run regressed, the regressions of the older runs
+    are only marked in the output.
+    """
+    trends = run_history().trends(
+        limit=limit,
+        baseline_runs=baseline,
+        regression_ratio=threshold,
+    )
+    if not trends:
+        click.echo("No runs recorded yet")
+        return
+
+    for trend in trends:
+        click.echo(
+            f"Run {trend.run_id} ({trend.deployment}) started {trend.started_at}: "
+            f"{trend.passed} passed, {trend.failed} failed",
+        )
+        if trend.aborted_reason:
+            click.echo(f"  Ended early: {trend.aborted_reason}")
+        for instance_url, medians in sorted(trend.medians.items()):
+            regressions = trend.regressions.get(instance_url, {})
+            phases = []
+            for phase, median in medians.items():
+                entry = f"{phase}={median:.0f}s"
+                if phase in regressions:
+                    entry += f" (REGRESSED, baseline {regressions[phase]:.0f}s)"
+                phases.append(entry)
+            click.echo(f"  {instance_url}: {', '.join(phases)}")
+
+    if trends[-1].regressions:
+        click.echo(f"Latest run {trends[-1].run_id} regressed")
+        raise SystemExit(1)
@@ -7,6 +7,11 @@ from dataclasses import dataclass
 from os import getenv
 from typing import Optional
 
+from validation.utils.trigger_scheduler import TriggerLimits
+
+# Limits of the triggers of a deployment across all the forges
+DEFAULT_TRIGGER_LIMITS = TriggerLimits(per_minute=3, burst=6)
+
 
 # Everywhere else in the deployment repo environments are called 'prod' and 'stg'.
 # Call them some other name here to avoid accidentally deploying the wrong thing.
@@ -34,6 +39,7 @@ class DeploymentInfo:
     push_trigger_tests_prefix: str
     github_bot_name: str
     gitlab_account_name: str
+    trigger_limits: TriggerLimits = DEFAULT_TRIGGER_LIMITS
 
 
 PRODUCTION_INFO = DeploymentInfo(
@@ -6,11 +6,28 @@ import asyncio
 import logging
 import re
 import subprocess
+import threading
 from functools import lru_cache
 from os import getenv
+from typing import Any, Callable, TypeVar
+from urllib.parse import urlparse
 
 import koji as koji_module
 from copr.v3 import Client
+from munch import Munch, munchify
+
+from validation.utils.async_http import get_async_http_client
+from validation.utils.executor import run_blocking
+from validation.utils.health import tracked_call
+from validation.utils.metrics import counted_call
+from validation.utils.tracing import client_span
+
+T = TypeVar("T")
+
+COPR_URL = "https://copr.fedorainfracloud.org"
+# Number of the newest builds fetched when looking for the build of a test,
+# the projects of the test PRs keep the builds of all the previous runs
+COPR_NEWEST_BUILDS_LIMIT = 10
 
 
 class KerberosError(Exception):
@@ -19,7 +36,11 @@ class KerberosError(Exception):
 
 @lru_cache
 def copr():
-    return Client({"copr_url": "https://copr.fedorainfracloud.org"})
+    return Client({"copr_url": COPR_URL})
+
+
+def koji_url() -> str:
+    return getenv("KOJI_URL", "https://koji.fedoraproject.org/kojihub")
 
 
 @lru_cache
@@ -27,8 +48,129 @@ def koji():
     """
     Create and return a Koji session for querying Fedora Koji builds.
     """
-    koji_url = getenv("KOJI_URL", "https://koji.fedoraproject.org/kojihub")
-    return koji_module.ClientSession(koji_url)
+    return koji_module.ClientSession(koji_url())
+
+
+async def copr_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Copr client call without blocking the event loop.
+    """
+    host = urlparse(COPR_URL).hostname
+    with tracked_call("Copr"), counted_call(host), client_span(host, func.__name__):
+        return await run_blocking(host, func, *args, **kwargs)
+
+
+async def get_copr_build_state(build_id: int) -> str:
+    """
+    Get the state of the Copr build, via the async HTTP client if enabled.
+
+    Args:
+        build_id: ID of the Copr build.
+
+    Returns:
+        State of the build (e.g. 'running', 'succeeded').
+    """
+    if client := get_async_http_client(f"{COPR_URL}/api_3"):
+        with tracked_call("Copr"):
+            build = await client.get_json(f"build/{build_id}")
+        return build["state"]
+
+    build = await copr_call(copr().build_proxy.get, build_id)
+    return build.state
+
+
+async def get_newest_copr_builds(
+    owner: str,
+    project: str,
+    limit: int = COPR_NEWEST_BUILDS_LIMIT,
+) -> list[Munch]:
+    """
+    Get the newest builds of the Copr project (newest first) with a bounded query,
+    via the async HTTP client if enabled.
+
+    Args:
+        owner: Owner of the Copr project.
+        project: Name of the Copr project.
+        limit: Maximal number of builds to get.
+
+    Returns:
+        The builds.
+    """
+    pagination = {"limit": limit, "order": "id", "order_type": "DESC"}
+    if client := get_async_http_client(f"{COPR_URL}/api_3"):
+        with tracked_call("Copr"):
+            response = await client.get_json(
+                "build/list",
+                params={"ownername": owner, "projectname": project, **pagination},
+            )
+        return munchify(response["items"])
+
+    return await copr_call(copr().build_proxy.get_list, owner, project, pagination=pagination)
+
+
+async def koji_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Koji client call without blocking the event loop.
+    """
+    host = urlparse(koji_url()).hostname
+    with tracked_call("Koji"), counted_call(host), client_span(host, func.__name__):
+        return await run_blocking(host, func, *args, **kwargs)
+
+
+# Requests (source URL, target, options) of the Koji tasks by their IDs,
+# the request of a task never changes, so each task is fetched at most once per run
+_koji_task_requests: dict[int, list] = {}
+_koji_task_requests_lock = threading.Lock()
+
+
+def get_koji_task_requests(task_ids: list[int]) -> dict[int, list]:
+    """
+    Get the requests of the Koji tasks, fetching all the ones not fetched before
+    in a single multicall (blocking).
+
+    Args:
+        task_ids: IDs of the Koji tasks.
+
+    Returns:
+        Requests of the tasks by their IDs, tasks whose request couldn't be fetched
+        are left out.
+    """
+    with _koji_task_requests_lock:
+        missing = [task_id for task_id in task_ids if task_id not in _koji_task_requests]
+
+    if missing:
+        logging.debug("Fetching requests of %d Koji task(s) in a multicall", len(missing))
+        multicall = koji().multicall(strict=False)
+        for task_id in missing:
+            multicall.getTaskRequest(task_id)
+        # Successful calls are singleton lists, faults are dicts
+        results = dict(zip(missing, multicall.call_all()))
+
+        fetched = {
+            task_id: result[0] for task_id, result in results.items() if isinstance(result, list)
+        }
+        if len(fetched) < len(missing):
+            logging.debug(
+                "Failed to fetch requests of %d Koji task(s)",
+                len(missing) - len(fetched),
+            )
+        with _koji_task_requests_lock:
+            _koji_task_requests.update(fetched)
+
+    with _koji_task_requests_lock:
+        return {
+            task_id: _koji_task_requests[task_id]
+            for task_id in task_ids
+            if task_id in _koji_task_requests
+        }
+
+
+def cache_koji_task_request(task_id: int, request: list):
+    """
+    Remember the request of the Koji task (e.g. returned by listTasks).
+    """
+    with _koji_task_requests_lock:
+        _koji_task_requests.setdefault(task_id, request)
 
 
 @lru_cache
@@ -4,10 +4,13 @@
 
 import asyncio
 import logging
+import re
 import traceback
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Hashable
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from os import getenv
+from typing import Any, Callable, ClassVar, Optional, TypeVar, Union
 
 from github.GitRef import GitRef
 from gitlab.v4.objects import ProjectBranch
@@ -16,14 +19,43 @@ from ogr.exceptions import GithubAPIException
 from ogr.services.github.check_run import GithubCheckRun
 
 from validation.deployment import PRODUCTION_INFO, DeploymentInfo
-from validation.helpers import copr, log_failure
+from validation.helpers import get_copr_build_state, get_newest_copr_builds, log_failure
+from validation.utils.async_http import AsyncHttpClient
+from validation.utils.comments import CommentTracker, TrackedComment
+from validation.utils.copr_monitor import CoprMonitor
+from validation.utils.events import EventHub, commit_key, copr_build_key, copr_project_key
+from validation.utils.executor import run_blocking
+from validation.utils.health import RunHealthMonitor
+from validation.utils.latency import LatencyPhase, TestLatency
+from validation.utils.metrics import counted_call
+from validation.utils.polling import PollingPhase, PollingPolicy, PollingSchedule
+from validation.utils.pr_index import opened_pr_title, test_pr_index
+from validation.utils.rate_limit import RateLimitBudget
+from validation.utils.status_poller import StatusPoller
+from validation.utils.status_tracker import StatusTracker
+from validation.utils.tracing import annotate, client_span, traced
 from validation.utils.trigger import Trigger
+from validation.utils.trigger_scheduler import TriggerScheduler
+
+T = TypeVar("T")
+
+# Abbreviated commit hash in the versions of the builds (e.g. '...pr42.3.g1a2b3c4')
+GIT_DESCRIBE_HASH = re.compile(r"\.g([0-9a-f]{7,40})\b")
+
+# Set to 0 to wait for all the statuses to complete even if some of them has already failed
+FAIL_FAST_ENV = "VALIDATION_FAIL_FAST"
+
+OPENED_PR_BODY = "This test case is triggered automatically by our validation script."
 
 
 class TestFailureError(Exception):
     """Exception raised when a test case fails with a specific failure message."""
 
 
+class TestAbortedError(TestFailureError):
+    """Exception raised when a test case is ended early because of a run-wide outage."""
+
+
 class Testcase(ABC):
     CHECK_TIME_FOR_STATUSES_TO_APPEAR = (
         3  # minutes - time to wait for statuses to appear after trigger
@@ -32,13 +64,31 @@ class Testcase(ABC):
     CHECK_TIME_FOR_SUBMIT_BUILDS = 5  # minutes - time to wait for build to be submitted in Copr
     CHECK_TIME_FOR_BUILD = 60  # minutes - time to wait for build to complete
     CHECK_TIME_FOR_WATCH_STATUSES = 60  # minutes - time to watch for commit statuses
-    POLLING_INTERVAL = 2  # minutes - interval between status/build checks
-    # Initial wait times after triggering build, before first API check (API caching delays)
+    # Intervals between status/build checks in each phase of the test:
+    # poll fast right after the trigger, back off while waiting for long builds/checks
+    # and poll fast again when the watched state changes
+    POLLING_POLICIES: ClassVar[dict[PollingPhase, PollingPolicy]] = {
+        PollingPhase.statuses_appear: PollingPolicy(initial=10, maximum=30),
+        PollingPhase.reaction: PollingPolicy(initial=10, maximum=60),
+        PollingPhase.build_submit: PollingPolicy(initial=15, maximum=120),
+        PollingPhase.build: PollingPolicy(initial=30, maximum=180, after_change=30),
+        PollingPhase.watch_statuses: PollingPolicy(initial=30, maximum=180, after_change=30),
+    }
+    # Longest waits after triggering build for the trigger to be visible in the API
+    # (API caching delays), before the first status check
     WAIT_AFTER_OPENED_PR = 2  # minutes - wait for API to reflect statuses after opening new PR
     WAIT_AFTER_COMMENT_PUSH = 1  # minutes - wait after comment/push trigger
+    READINESS_PROBE_INTERVAL = 5  # seconds - time between the checks of the trigger visibility
     PACKIT_YAML_PATH = ".packit.yaml"
-    MAX_COMMENTS_TO_CHECK = 5  # Limit comment fetching to avoid excessive API calls
+    # Rough number of forge API requests made by one test, the trigger waits
+    # for the reset of the rate limit if the budget is shorter
+    REQUESTS_PER_TEST = 50
+    # Tolerated difference between the local clock and the clock of Copr
+    # when matching the build submission time with the trigger time
+    CLOCK_SKEW = timedelta(seconds=30)
     HTTP_FORBIDDEN = 403  # HTTP status code for forbidden/access denied
+    # End the test as soon as some status or the build fails
+    FAIL_FAST = getenv(FAIL_FAST_ENV, "1").lower() not in ("0", "false", "no")
 
     def __init__(
         self,
@@ -47,7 +97,15 @@ class Testcase(ABC):
         trigger: Trigger = Trigger.pr_opened,
         deployment: DeploymentInfo | None = None,
         comment: str | None = None,
+        *,
         existing_prs: list | None = None,
+        http_client: AsyncHttpClient | None = None,
+        status_poller: StatusPoller | None = None,
+        event_hub: EventHub | None = None,
+        copr_monitor: CoprMonitor | None = None,
+        rate_limit: RateLimitBudget | None = None,
+        trigger_scheduler: TriggerScheduler | None = None,
+        health_monitor: RunHealthMonitor | None = None,
     ):
         self.project = project
         self.pr = pr
@@ -59,9 +117,35 @@ class Testcase(ABC):
         self.deployment = deployment or PRODUCTION_INFO
         self.comment = comment
         self._build = None
+        self._build_failed = False
         self._statuses: list[GithubCheckRun | CommitFlag] = []
         self._build_triggered_at: datetime | None = None
-        self._existing_prs = existing_prs  # Cache to avoid re-fetching in create_pr()
+        self._existing_prs = existing_prs  # Test PRs found by the suite, used in create_pr()
+        # Optional async-native client for the read-only poll endpoints of the forge
+        self.http_client = http_client
+        # Suite-wide poller that fetches the statuses for all the test cases at once
+        self.status_poller = status_poller
+        # Hub of the received webhooks/message bus events waking up the polls
+        self.event_hub = event_hub
+        # Run-wide monitor of the Copr projects/builds watched by all the test cases
+        self.copr_monitor = copr_monitor
+        # Live API rate limit budget of the forge pacing the polls and the trigger
+        self.rate_limit = rate_limit
+        # Scheduler of the triggers, adapting to the observed reaction of packit-service
+        self.trigger_scheduler = trigger_scheduler
+        # Whether the test holds a trigger slot (until packit-service reacts)
+        self._holds_trigger_slot = False
+        # Whether the reaction to the latest trigger was reported to the scheduler
+        self._reaction_recorded = False
+        # Run-wide circuit breaker ending the tests early on an outage
+        self.health_monitor = health_monitor
+        # Comments of the PR since the trigger, shared by all the checks
+        self._comment_tracker: CommentTracker | None = None
+        self._reported_comment_ids: set = set()
+        # Times of the phases of the reaction of packit-service to the trigger
+        self.latency = TestLatency(forge=project.service.hostname, trigger=trigger.value)
+        # Diffs the polled statuses, recreated on the trigger
+        self.status_tracker = self.create_status_tracker()
 
     @property
     def copr_project_name(self):
@@ -73,7 +157,158 @@ class Testcase(ABC):
             self._copr_project_name = self.construct_copr_project_name()
         return self._copr_project_name
 
-    def _cleanup(self):
+    async def forge_call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking forge (ogr) call in the executor dedicated to the forge host,
+        so that the other test cases and suites are not blocked meanwhile.
+        """
+        host = self.project.service.hostname
+        with counted_call(host), client_span(host, getattr(func, "__name__", "call")):
+            return await run_blocking(host, func, *args, **kwargs)
+
+    def get_statuses(self) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+        """
+        Get the statuses (checks in GitHub) of the head commit.
+        """
+        return self.filter_statuses(self.get_commit_statuses(self.head_commit))
+
+    async def fetch_statuses(self) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+        """
+        Get the statuses without blocking the event loop, from the suite-wide
+        status poller if available.
+        """
+        if self.status_poller:
+            statuses = await self.status_poller.get_statuses(
+                self.head_commit,
+                self.fetch_commit_statuses,
+            )
+        else:
+            statuses = await self.fetch_commit_statuses(self.head_commit)
+        statuses = self.filter_statuses(statuses)
+        self.status_tracker.update(statuses)
+        if self._build_triggered_at and self.status_tracker.statuses:
+            self.latency.record(LatencyPhase.first_status)
+            if self.health_monitor:
+                self.health_monitor.record_status(id(self))
+        return statuses
+
+    async def fetch_commit_statuses(
+        self,
+        commit: str,
+    ) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+        """
+        Get all the statuses of the commit, natively via the async HTTP client
+        if available, otherwise via ogr in the forge executor.
+        """
+        if self.http_client:
+            return await self.get_commit_statuses_via_http(commit)
+        return await self.forge_call(self.get_commit_statuses, commit)
+
+    async def fetch_copr_builds(self) -> list:
+        """
+        Get the newest builds in the Copr project of the PR (newest first),
+        from the run-wide Copr monitor if available.
+        """
+        if self.copr_monitor:
+            return await self.copr_monitor.get_builds(
+                self.deployment.copr_user,
+                self.copr_project_name,
+            )
+        return await get_newest_copr_builds(self.deployment.copr_user, self.copr_project_name)
+
+    def is_copr_build_triggered(self, build) -> bool:
+        """
+        Check whether the Copr build was submitted by our trigger, i.e. after the trigger
+        and for the head commit (if the commit is already known from the version of the build).
+        """
+        submitted_on = build.get("submitted_on")
+        if not submitted_on or not self._build_triggered_at:
+            return False
+        submitted_at = datetime.fromtimestamp(submitted_on, tz=timezone.utc)
+        if submitted_at < self._build_triggered_at - self.CLOCK_SKEW:
+            return False
+
+        version = (build.get("source_package") or {}).get("version") or ""
+        if self.head_commit and (match := GIT_DESCRIBE_HASH.search(version)):
+            return self.head_commit.startswith(match.group(1))
+        return True
+
+    async def fetch_copr_build_state(self, build_id: int) -> str:
+        """
+        Get the state of the Copr build, from the run-wide Copr monitor if available.
+        """
+        if self.copr_monitor and (
+            build := await self.copr_monitor.get_build(
+                self.deployment.copr_user,
+                self.copr_project_name,
+                build_id,
+            )
+        ):
+            return build.state
+        return await get_copr_build_state(build_id)
+
+    def filter_statuses(
+        self,
+        statuses: Union[list[GithubCheckRun], list[CommitFlag]],
+    ) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+        """
+        Filter the statuses of a commit to the ones set by packit-service.
+        """
+        return statuses
+
+    def polling_schedule(
+        self,
+        phase: PollingPhase,
+        *event_keys: str,
+        policy: Optional[PollingPolicy] = None,
+    ) -> PollingSchedule:
+        """
+        Create a new schedule of the polls for the given phase of the test.
+
+        Args:
+            phase: Phase of the test.
+            *event_keys: Keys of the events (see validation.utils.events) that
+                wake up the polls when the event mode is enabled.
+            policy: Policy overriding the default one of the phase.
+
+        Returns:
+            Polling schedule.
+        """
+        wakeup = None
+        if self.event_hub and event_keys:
+            wakeup = self.event_hub.subscribe(*event_keys)
+        return PollingSchedule(
+            phase,
+            policy or self.POLLING_POLICIES[phase],
+            wakeup=wakeup,
+            rate_limit=self.rate_limit,
+        )
+
+    async def wait_for_rate_limit(self):
+        """
+        Wait before triggering the build until the forge API rate limit budget
+        is sufficient for the whole test.
+        """
+        if self.rate_limit:
+            await self.rate_limit.wait_for(self.REQUESTS_PER_TEST)
+
+    async def prepare_trigger(self):
+        """
+        Wait until the build can be triggered and record the time of the trigger.
+        """
+        await self.wait_for_rate_limit()
+        if self.trigger_scheduler and not self._holds_trigger_slot:
+            await self.trigger_scheduler.acquire()
+            self._holds_trigger_slot = True
+        self._build_triggered_at = datetime.now(tz=timezone.utc)
+        self._reaction_recorded = False
+        # The recency of the statuses known so far was evaluated against no trigger
+        self.status_tracker = self.create_status_tracker()
+        self.latency.start(self._build_triggered_at, checks=self.status_tracker.timelines)
+        if self.health_monitor:
+            self.health_monitor.record_trigger(id(self))
+
+    async def _cleanup(self):
         """
         Hook for subclasses to perform cleanup after test completion.
         Called in finally block to ensure cleanup happens even if test fails.
@@ -95,10 +330,44 @@ class Testcase(ABC):
             return dt.replace(tzinfo=timezone.utc)
         return dt
 
+    @property
+    def comment_tracker(self) -> CommentTracker:
+        """
+        Tracker of the comments of the PR created since the build was triggered.
+        """
+        if self._comment_tracker is None:
+            since = self._build_triggered_at or datetime.now(tz=timezone.utc)
+            self._comment_tracker = CommentTracker(
+                self.fetch_comments_since,
+                since - self.CLOCK_SKEW,
+            )
+        return self._comment_tracker
+
+    def fetch_comments_since(self, since: datetime) -> list[TrackedComment]:
+        """
+        Fetch the comments of the PR created at or after the given time (blocking).
+        Goes through the comments from the newest one, so that only the pages
+        with the new comments are fetched.
+        """
+        comments = []
+        for comment in self.pr.get_comments(reverse=True):
+            created = self._ensure_aware_datetime(comment.created)
+            if created < since:
+                break
+            comments.append(
+                TrackedComment(
+                    id=comment.id,
+                    author=comment.author,
+                    body=comment.body,
+                    created=created,
+                ),
+            )
+        return comments
+
     def _check_for_error_comment(self) -> str | None:
         """
-        Check for new error comments from packit-service.
-        Uses generator to avoid fetching all comment pages.
+        Check for new error comments from packit-service (not reported before).
+        Only the comments created since the last check are fetched.
 
         Returns:
             The comment body if a new error comment is found, None otherwise
@@ -106,18 +375,15 @@ class Testcase(ABC):
         if not self.pr:
             return None
 
-        # Get comments in reverse order (newest first)
-        # Generator is lazy - stops fetching pages once we find what we need
-        for i, comment in enumerate(self.pr.get_comments(reverse=True)):
-            if comment.author == self.account_name:
-                # Found a comment from packit-service
+        self.comment_tracker.update()
+        for comment in self.comment_tracker.by_author(self.account_name):
+            if comment.id not in self._reported_comment_ids:
+                self._reported_comment_ids.add(comment.id)
                 return comment.body
-            # Only check first MAX_COMMENTS_TO_CHECK comments to avoid excessive API calls
-            if i >= self.MAX_COMMENTS_TO_CHECK - 1:
-                break
 
         return None
 
+    @traced("run_test")
     async def run_test(self) -> bool:
         """
         Run all checks, if there is any failure message, send it to Sentry and in case of
@@ -128,9 +394,20 @@ class Testcase(ABC):
         """
         pr_id = f"PR#{self.pr.id}" if self.pr else "new PR"
         logging.info("Starting test for %s (%s trigger)", pr_id, self.trigger.value)
+        annotate(
+            forge=self.project.service.hostname,
+            trigger=self.trigger.value,
+            pr=self.pr.url if self.pr else None,
+        )
         test_passed = False
         try:
-            await self.run_checks()
+            if self.health_monitor:
+                if not await self.run_until(self.run_checks(), self.health_monitor.wait_tripped()):
+                    self.health_monitor.aborted += 1
+                    reason = self.health_monitor.tripped_reason
+                    raise TestAbortedError(f"Aborted: {reason}\n{self.failure_msg}".strip())
+            else:
+                await self.run_checks()
             if self.failure_msg:
                 message = f"{self.pr.title} ({self.pr.url}) failed: {self.failure_msg}"
                 logging.error("Test failed: %s", message)
@@ -142,9 +419,10 @@ class Testcase(ABC):
 
             if self.trigger == Trigger.pr_opened:
                 logging.debug("Closing PR and deleting branch for %s", pr_id)
-                self.pr.close()
+                await self.forge_call(self.pr.close)
+                await self.forge_call(self.unindex_opened_pr)
                 if self.pr_branch_ref:
-                    self.pr_branch_ref.delete()
+                    await self.forge_call(self.pr_branch_ref.delete)
         except TestFailureError:
             # Re-raise TestFailureError to preserve the failure message
             raise
@@ -156,100 +434,197 @@ class Testcase(ABC):
             logging.error(tb)
             test_passed = False
         finally:
-            self._cleanup()
+            self.release_trigger_slot()
+            if self.health_monitor:
+                self.health_monitor.record_done(id(self))
+            await self._cleanup()
 
         return test_passed
 
-    def trigger_build(self):
+    @traced("trigger_build")
+    async def run_trigger(self):
         """
-        Trigger the build (by commenting/pushing to the PR/opening a new PR).
+        Trigger the build (by commenting/pushing to the PR/opening a new PR)
+        without blocking the event loop.
         """
         logging.info(
             "Triggering a build for %s",
             self.pr if self.pr else "new PR",
         )
         if self.trigger == Trigger.comment:
-            if not self.pr:
-                msg = "Cannot post comment: PR is not set"
-                raise ValueError(msg)
-
-            # For skip_build tests, use test comment instead of build comment
-            if self.comment:
-                comment = self.comment
-            elif self.pr and "skip" in self.pr.title.lower() and "build" in self.pr.title.lower():
-                comment = self.deployment.pr_comment_test
-                logging.info("Using test comment for skip_build test: %s", comment)
-            else:
-                comment = self.deployment.pr_comment
-            try:
-                self.pr.comment(comment)
-            except GithubAPIException as e:
-                if e.response_code == self.HTTP_FORBIDDEN:
-                    error_msg = (
-                        f"Failed to post comment to PR {self.pr.url} (HTTP 403 Forbidden).\n"
-                        "This typically means:\n"
-                        "  1. The PR has reached GitHub's 2,500 comment limit and "
-                        "commenting is disabled, OR\n"
-                        "  2. The PR has been closed/locked by GitHub.\n"
-                        f"Please check the PR at {self.pr.url} and verify its status.\n"
-                        "If the PR has hit the comment limit, close it and create a "
-                        "fresh test PR.\n"
-                    )
-                    logging.error(error_msg)
-                    raise RuntimeError(error_msg) from e
-                # Re-raise if it's a different error
-                raise
+            await self.forge_call(self.post_trigger_comment)
         elif self.trigger == Trigger.push:
-            self.push_to_pr()
+            await self.push_to_pr()
         else:
-            self.create_pr()
+            await self.create_pr()
+
+    def get_trigger_comment(self) -> str:
+        """
+        Get the comment triggering the build.
+        """
+        if self.comment:
+            return self.comment
+        # For skip_build tests, use test comment instead of build comment
+        if self.pr and "skip" in self.pr.title.lower() and "build" in self.pr.title.lower():
+            logging.info(
+                "Using test comment for skip_build test: %s",
+                self.deployment.pr_comment_test,
+            )
+            return self.deployment.pr_comment_test
+        return self.deployment.pr_comment
+
+    def is_trigger_visible(self) -> bool:
+        """
+        Check whether the trigger (comment, pushed commit, new PR) is visible
+        in the API (blocking).
+        """
+        if self.trigger == Trigger.comment:
+            comment = self.get_trigger_comment()
+            self.comment_tracker.update()
+            return any(tracked.body.strip() == comment for tracked in self.comment_tracker.comments)
 
-    def push_to_pr(self):
+        return self.project.get_pr(self.pr.id).head_commit == self.head_commit
+
+    @property
+    def max_wait_for_trigger_visible(self) -> int:
+        """
+        Minutes the API is known to need to reflect the trigger.
+        """
+        return (
+            self.WAIT_AFTER_OPENED_PR
+            if self.trigger == Trigger.pr_opened
+            else self.WAIT_AFTER_COMMENT_PUSH
+        )
+
+    async def wait_for_trigger_visible(self):
+        """
+        Wait until the trigger is visible in the API, at most the time
+        the API is known to need for it.
+        """
+        max_wait = self.max_wait_for_trigger_visible
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait * 60
+        started = loop.time()
+        while loop.time() < deadline:
+            try:
+                if await self.forge_call(self.is_trigger_visible):
+                    logging.debug(
+                        "Trigger visible in the API after %d seconds",
+                        loop.time() - started,
+                    )
+                    return
+            except Exception as e:
+                logging.debug("Failed to check the visibility of the trigger: %s", e)
+            await asyncio.sleep(self.READINESS_PROBE_INTERVAL)
+
+        logging.debug("Trigger not visible in the API after %d minute(s)", max_wait)
+
+    def post_trigger_comment(self):
+        """
+        Post the comment triggering the build to the PR (blocking).
+        """
+        if not self.pr:
+            msg = "Cannot post comment: PR is not set"
+            raise ValueError(msg)
+
+        comment = self.get_trigger_comment()
+        try:
+            self.pr.comment(comment)
+        except GithubAPIException as e:
+            if e.response_code == self.HTTP_FORBIDDEN:
+                error_msg = (
+                    f"Failed to post comment to PR {self.pr.url} (HTTP 403 Forbidden).\n"
+                    "This typically means:\n"
+                    "  1. The PR has reached GitHub's 2,500 comment limit and "
+                    "commenting is disabled, OR\n"
+                    "  2. The PR has been closed/locked by GitHub.\n"
+                    f"Please check the PR at {self.pr.url} and verify its status.\n"
+                    "If the PR has hit the comment limit, close it and create a "
+                    "fresh test PR.\n"
+                )
+                logging.error(error_msg)
+                raise RuntimeError(error_msg) from e
+            # Re-raise if it's a different error
+            raise
+
+    async def push_to_pr(self):
         """
         Push a new commit to the PR.
         """
         branch = self.pr.source_branch
-        commit_msg = f"Commit build trigger ({datetime.now(tz=timezone.utc).strftime('%d/%m/%y')})"
-        self.head_commit = self.create_empty_commit(branch, commit_msg)
+        self.head_commit = await self.create_empty_commit(
+            branch,
+            self.push_trigger_commit_message(),
+        )
+
+    @staticmethod
+    def push_trigger_commit_message() -> str:
+        return f"Commit build trigger ({datetime.now(tz=timezone.utc).strftime('%d/%m/%y')})"
 
-    def create_pr(self):
+    def get_existing_prs(self) -> list[PullRequest]:
+        """
+        Get the open test PRs (blocking), found by the suite if available
+        to avoid re-fetching them.
+        """
+        if self._existing_prs is None:
+            logging.debug("Fetching PR list to check for existing PR...")
+            return list(self.project.get_pr_list())
+
+        logging.debug("Using cached PR list to check for existing PR")
+        return self._existing_prs
+
+    async def create_pr(self):
         """
         Create a new PR, if the source branch 'test_case_opened_pr' does not exist,
         create one and commit some changes before it.
         """
         source_branch = f"test/{self.deployment.name}/opened_pr"
-        pr_title = f"Basic test case ({self.deployment.name}): opened PR trigger"
+        pr_title = opened_pr_title(self.deployment.name)
         logging.info("Creating new PR: %s from branch %s", pr_title, source_branch)
-        self.delete_previous_branch(source_branch)
+        await self.delete_previous_branch(source_branch)
 
-        # Delete the PR from the previous test run if it exists.
-        # Use cached PR list from constructor to avoid re-fetching
-        if self._existing_prs is None:
-            logging.debug("Fetching PR list to check for existing PR...")
-            existing_prs = list(self.project.get_pr_list())
-        else:
-            logging.debug("Using cached PR list to check for existing PR")
-            existing_prs = self._existing_prs
-
-        existing_pr = [pr for pr in existing_prs if pr.title == pr_title]
+        # Delete the PR from the previous test run if it exists
+        existing_pr = [
+            pr for pr in await self.forge_call(self.get_existing_prs) if pr.title == pr_title
+        ]
         if len(existing_pr) == 1:
             logging.debug("Closing existing PR: %s", existing_pr[0].url)
-            existing_pr[0].close()
+            await self.forge_call(existing_pr[0].close)
 
         logging.debug("Creating file in new branch: %s", source_branch)
-        self.create_file_in_new_branch(source_branch)
+        await self.create_file_in_new_branch(source_branch)
         if self.deployment.opened_pr_trigger__packit_yaml_fix:
-            self.fix_packit_yaml(source_branch)
+            await self.fix_packit_yaml(source_branch)
 
         logging.debug("Creating PR...")
-        self.pr = self.project.create_pr(
-            title=pr_title,
-            body="This test case is triggered automatically by our validation script.",
+        self.pr = await self.forge_call(self.open_pr, pr_title, source_branch)
+        await self.forge_call(self.index_opened_pr)
+        self.head_commit = self.pr.head_commit
+        logging.info("PR created: %s", self.pr.url)
+
+    def open_pr(self, title: str, source_branch: str) -> PullRequest:
+        """
+        Open the PR of the opened PR test from the source branch (blocking).
+        """
+        return self.project.create_pr(
+            title=title,
+            body=OPENED_PR_BODY,
             target_branch=self.project.default_branch,
             source_branch=source_branch,
         )
-        self.head_commit = self.pr.head_commit
-        logging.info("PR created: %s", self.pr.url)
+
+    def index_opened_pr(self):
+        """
+        Add the PR created by the opened PR test to the test PR index (blocking),
+        so that the next runs close it if this one leaves it open.
+        """
+        test_pr_index().add_opened_pr(self.project.get_web_url(), self.pr.id)
+
+    def unindex_opened_pr(self):
+        """
+        Remove the PR of the opened PR test closed by the test from the index (blocking).
+        """
+        test_pr_index().remove_opened_pr(self.project.get_web_url(), self.pr.id)
 
     async def run_checks(self):
         """
@@ -263,22 +638,11 @@ class Testcase(ABC):
 
         if skip_copr_checks:
             # For skip_build tests, trigger the build but don't wait for Copr submission/completion
-            self._build_triggered_at = datetime.now(tz=timezone.utc)
-            self.trigger_build()
+            await self.prepare_trigger()
+            await self.run_trigger()
 
-            # Wait for API to reflect newly created statuses (caching/eventual consistency)
-            if self.trigger == Trigger.pr_opened:
-                logging.debug(
-                    "Waiting %d minute(s) for API to reflect new statuses...",
-                    self.WAIT_AFTER_OPENED_PR,
-                )
-                await asyncio.sleep(self.WAIT_AFTER_OPENED_PR * 60)
-            else:
-                logging.debug(
-                    "Waiting %d minute(s) for webhook processing...",
-                    self.WAIT_AFTER_COMMENT_PUSH,
-                )
-                await asyncio.sleep(self.WAIT_AFTER_COMMENT_PUSH * 60)
+            # Wait for API to reflect the trigger (caching/eventual consistency)
+            await self.wait_for_trigger_visible()
 
             # Check that statuses are set (should show build was skipped)
             await self.check_pending_check_runs()
@@ -289,11 +653,12 @@ class Testcase(ABC):
             if not self._build:
                 return
 
-            await self.check_build(self._build.id)
+            await self.run_until_status_fails(self.check_build(self._build.id))
 
         await self.check_completed_statuses()
-        self.check_comment()
+        await self.forge_call(self.check_comment)
 
+    @traced("check_pending_check_runs")
     async def check_pending_check_runs(self):
         """
         Check whether some check run is set to queued
@@ -301,24 +666,29 @@ class Testcase(ABC):
         """
         # Don't filter by recency here - just check that statuses exist
         # Recency filtering happens later in watch_statuses() to exclude old completed statuses
-        all_statuses = self.get_statuses()
+        all_statuses = await self.fetch_statuses()
         status_names = [self.get_status_name(status) for status in all_statuses]
 
-        # Phase 1: Wait for statuses to appear
-        watch_end = datetime.now(tz=timezone.utc) + timedelta(
-            minutes=self.CHECK_TIME_FOR_STATUSES_TO_APPEAR,
+        # Phase 1: Wait for statuses to appear, counted from the trigger including
+        # the time the API may need to reflect it (however soon it became visible)
+        watch_end = (self._build_triggered_at or datetime.now(tz=timezone.utc)) + timedelta(
+            minutes=self.max_wait_for_trigger_visible + self.CHECK_TIME_FOR_STATUSES_TO_APPEAR,
         )
 
         # when a new PR is opened
+        schedule = self.polling_schedule(
+            PollingPhase.statuses_appear,
+            commit_key(self.head_commit),
+        )
         while len(status_names) == 0:
             if datetime.now(tz=timezone.utc) > watch_end:
-                self.failure_msg += (
-                    f"Commit statuses did not appear in time "
-                    f"({self.CHECK_TIME_FOR_STATUSES_TO_APPEAR} minutes).\n"
-                )
+                wait = self.max_wait_for_trigger_visible + self.CHECK_TIME_FOR_STATUSES_TO_APPEAR
+                self.failure_msg += f"Commit statuses did not appear in time ({wait} minutes).\n"
+                # No reaction at all, the slowest one possible
+                self.record_reaction(watch_end)
                 return
-            await asyncio.sleep(30)
-            all_statuses = self.get_statuses()
+            await schedule.wait()
+            all_statuses = await self.fetch_statuses()
             status_names = [self.get_status_name(status) for status in all_statuses]
 
         logging.info(
@@ -332,18 +702,20 @@ class Testcase(ABC):
         # Phase 2: Wait for statuses to be set to pending (reset timeout)
         watch_end = datetime.now(tz=timezone.utc) + timedelta(minutes=self.CHECK_TIME_FOR_REACTION)
 
+        schedule = self.polling_schedule(PollingPhase.reaction, commit_key(self.head_commit))
         while True:
             if datetime.now(tz=timezone.utc) > watch_end:
                 self.failure_msg += (
                     f"Commit statuses were not set to pending in time "
                     f"({self.CHECK_TIME_FOR_REACTION} minutes).\n"
                 )
+                self.record_reaction()
                 return
 
             # Check all statuses with matching names (don't filter by recency yet)
             new_statuses = [
                 status
-                for status in self.get_statuses()
+                for status in await self.fetch_statuses()
                 if self.get_status_name(status) in status_names
             ]
 
@@ -352,41 +724,56 @@ class Testcase(ABC):
                 # (Task was accepted) to in_progress, so check only that it doesn't
                 # have completed status
                 if not self.is_status_completed(status):
+                    self.record_reaction(self.first_pending_seen_at())
                     return
 
-            await asyncio.sleep(self.POLLING_INTERVAL * 60)
+            await schedule.wait()
+
+    def first_pending_seen_at(self) -> Optional[datetime]:
+        """
+        Get the time the first status set by packit-service after the trigger
+        was seen pending, None if not seen yet.
+        """
+        return min(
+            (
+                timeline.pending_at
+                for timeline in self.status_tracker.timelines.values()
+                if timeline.pending_at
+            ),
+            default=None,
+        )
 
+    def record_reaction(self, reacted_at: Optional[datetime] = None):
+        """
+        Report the time from the trigger to the reaction of packit-service
+        (or to giving up on it) to the trigger scheduler and free the trigger slot.
+        Only the first report after a trigger counts.
+
+        Args:
+            reacted_at: Time of the reaction, now by default.
+        """
+        if self.trigger_scheduler and self._build_triggered_at and not self._reaction_recorded:
+            self._reaction_recorded = True
+            reacted_at = reacted_at or datetime.now(tz=timezone.utc)
+            latency = reacted_at - self._build_triggered_at
+            self.trigger_scheduler.record_reaction(latency.total_seconds())
+        self.release_trigger_slot()
+
+    def release_trigger_slot(self):
+        if self._holds_trigger_slot:
+            self._holds_trigger_slot = False
+            self.trigger_scheduler.release()
+
+    @traced("check_build_submitted")
     async def check_build_submitted(self):
         """
         Check whether the build was submitted in Copr in time.
         """
-        # Only check for existing builds if PR already exists
-        # For new PR test, there can't be any existing builds
-        old_build_len = 0
-        if self.pr and self.trigger != Trigger.pr_opened:
-            try:
-                old_build_len = len(
-                    copr().build_proxy.get_list(self.deployment.copr_user, self.copr_project_name),
-                )
-            except Exception:
-                old_build_len = 0
-
-        self._build_triggered_at = datetime.now(tz=timezone.utc)
-        self.trigger_build()
+        await self.prepare_trigger()
+        await self.run_trigger()
 
-        # Wait for API to reflect newly created statuses (caching/eventual consistency)
-        if self.trigger == Trigger.pr_opened:
-            logging.debug(
-                "Waiting %d minute(s) for API to reflect new statuses...",
-                self.WAIT_AFTER_OPENED_PR,
-            )
-            await asyncio.sleep(self.WAIT_AFTER_OPENED_PR * 60)
-        else:
-            logging.debug(
-                "Waiting %d minute(s) for webhook processing...",
-                self.WAIT_AFTER_COMMENT_PUSH,
-            )
-            await asyncio.sleep(self.WAIT_AFTER_COMMENT_PUSH * 60)
+        # Wait for API to reflect the trigger (caching/eventual consistency)
+        await self.wait_for_trigger_visible()
 
         watch_end = datetime.now(tz=timezone.utc) + timedelta(
             minutes=self.CHECK_TIME_FOR_SUBMIT_BUILDS,
@@ -399,6 +786,10 @@ class Testcase(ABC):
             self.pr,
             self.copr_project_name,
         )
+        schedule = self.polling_schedule(
+            PollingPhase.build_submit,
+            copr_project_key(self.deployment.copr_user, self.copr_project_name),
+        )
         while True:
             if datetime.now(tz=timezone.utc) > watch_end:
                 self.failure_msg += (
@@ -408,31 +799,107 @@ class Testcase(ABC):
                 return
 
             try:
-                new_builds = copr().build_proxy.get_list(
-                    self.deployment.copr_user,
-                    self.copr_project_name,
-                )
+                new_builds = await self.fetch_copr_builds()
             except Exception as e:
                 # project does not exist yet
                 msg = f"Copr project doesn't exist yet: {e}"
                 logging.debug(msg)
-                await asyncio.sleep(30)
+                await schedule.wait()
                 continue
 
-            if len(new_builds) >= old_build_len + 1:
-                self._build = new_builds[0]
+            # The oldest matching build, newer ones can be from a concurrent re-trigger
+            triggered_builds = [
+                build for build in new_builds if self.is_copr_build_triggered(build)
+            ]
+            if triggered_builds:
+                self._build = triggered_builds[-1]
+                self.latency.record(LatencyPhase.build_submitted)
+                logging.info("Found Copr build %s", self._build.id)
                 return
 
             # Check for new error comments from packit-service after build was triggered
             if self.pr:
-                error_comment = self._check_for_error_comment()
+                error_comment = await self.forge_call(self._check_for_error_comment)
                 if error_comment:
                     self.failure_msg += (
                         f"New comment from packit-service while submitting build: {error_comment}\n"
                     )
 
-            await asyncio.sleep(120)
+            await schedule.wait()
+
+    def get_failed_statuses(
+        self,
+        statuses: Union[list[GithubCheckRun], list[CommitFlag]],
+    ) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+        """
+        Get the statuses that were set to failure since the build was triggered.
+        """
+        return [
+            status
+            for status in statuses
+            if self.status_tracker.is_recent(status)
+            and self.is_status_completed(status)
+            and not self.is_status_successful(status)
+        ]
+
+    async def wait_for_failed_status(self):
+        """
+        Poll the statuses until some of them is set to failure.
+        """
+        schedule = self.polling_schedule(
+            PollingPhase.watch_statuses,
+            commit_key(self.head_commit),
+        )
+        while True:
+            await schedule.wait()
+            if failed := self.get_failed_statuses(await self.fetch_statuses()):
+                logging.info(
+                    "Status %s of commit %s was set to failure",
+                    self.get_status_name(failed[0]),
+                    self.head_commit,
+                )
+                return
+
+    async def run_until_status_fails(self, check: Awaitable[None]):
+        """
+        Run the check, in the fail-fast mode cancel it as soon as some status fails,
+        so that the test doesn't wait for the rest of it in vain.
+        """
+        if not self.FAIL_FAST:
+            await check
+            return
+
+        if not await self.run_until(check, self.wait_for_failed_status()):
+            logging.info("Ending the checks of commit %s early, a status failed", self.head_commit)
+
+    @staticmethod
+    async def run_until(check: Awaitable[None], stop: Awaitable[None]) -> bool:
+        """
+        Run the check until it finishes or until the stop condition is met.
+
+        Args:
+            check: The check to run.
+            stop: Awaitable finishing when the check should be cancelled.
+
+        Returns:
+            Whether the check has finished (False if it was cancelled).
+        """
+        check_task = asyncio.ensure_future(check)
+        stop_task = asyncio.ensure_future(stop)
+        try:
+            await asyncio.wait({check_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (check_task, stop_task):
+                task.cancel()
+            await asyncio.gather(check_task, stop_task, return_exceptions=True)
+
+        if check_task.cancelled():
+            return False
+        if exception := check_task.exception():
+            raise exception
+        return True
 
+    @traced("check_build")
     async def check_build(self, build_id):
         """
         Check whether the build was successful in Copr.
@@ -444,6 +911,7 @@ class Testcase(ABC):
         state_reported = ""
         logging.info("Watching Copr build %s", build_id)
 
+        schedule = self.polling_schedule(PollingPhase.build, copr_build_key(build_id))
         while True:
             if datetime.now(tz=timezone.utc) > watch_end:
                 self.failure_msg += (
@@ -451,11 +919,13 @@ class Testcase(ABC):
                 )
                 return
 
-            build = copr().build_proxy.get(build_id)
-            if build.state == state_reported:
-                await asyncio.sleep(self.POLLING_INTERVAL * 60)
+            build_state = await self.fetch_copr_build_state(build_id)
+            if build_state == state_reported:
+                await schedule.wait()
                 continue
-            state_reported = build.state
+            if state_reported:
+                schedule.changed()
+            state_reported = build_state
 
             if state_reported not in [
                 "running",
@@ -465,13 +935,15 @@ class Testcase(ABC):
                 "importing",
                 "waiting",
             ]:
+                self.latency.record(LatencyPhase.build_finished)
                 if state_reported != "succeeded":
+                    self._build_failed = True
                     self.failure_msg += (
                         f"The build in Copr was not successful. Copr state: {state_reported}.\n"
                     )
                 return
 
-            await asyncio.sleep(self.POLLING_INTERVAL * 60)
+            await schedule.wait()
 
     def check_comment(self):
         """
@@ -480,17 +952,8 @@ class Testcase(ABC):
         failure = "The build in Copr was not successful." in self.failure_msg
 
         if failure and self.pr:
-            # Check recent comments (newest first) using generator
-            found_packit_comment = False
-            for i, comment in enumerate(self.pr.get_comments(reverse=True)):
-                if comment.author == self.account_name:
-                    found_packit_comment = True
-                    break
-                # Only check first MAX_COMMENTS_TO_CHECK comments
-                if i >= self.MAX_COMMENTS_TO_CHECK - 1:
-                    break
-
-            if not found_packit_comment:
+            self.comment_tracker.update()
+            if not self.comment_tracker.by_author(self.account_name):
                 self.failure_msg += (
                     "No comment from packit-service about unsuccessful last Copr build found.\n"
                 )
@@ -502,18 +965,23 @@ class Testcase(ABC):
         """
         return branch
 
-    def fix_packit_yaml(self, branch: str):
+    def get_fixed_packit_yaml(self, branch: str) -> str:
         """
-        Update .packit.yaml file in the branch according to the deployment needs
+        Get the content of .packit.yaml for the branch updated according to the deployment needs
         """
         ref = self._get_packit_yaml_ref(branch)
         packit_yaml_content = self.project.get_file_content(path=self.PACKIT_YAML_PATH, ref=ref)
-        packit_yaml_content = packit_yaml_content.replace(
+        return packit_yaml_content.replace(
             self.deployment.opened_pr_trigger__packit_yaml_fix.from_str,
             self.deployment.opened_pr_trigger__packit_yaml_fix.to_str,
         )
 
-        self.update_file_and_commit(
+    async def fix_packit_yaml(self, branch: str):
+        """
+        Update .packit.yaml file in the branch according to the deployment needs
+        """
+        packit_yaml_content = await self.forge_call(self.get_fixed_packit_yaml, branch)
+        await self.update_file_and_commit(
             path=self.PACKIT_YAML_PATH,
             commit_msg=self.deployment.opened_pr_trigger__packit_yaml_fix.git_msg,
             content=packit_yaml_content,
@@ -526,18 +994,23 @@ class Testcase(ABC):
         """
         if "The build in Copr was not successful." in self.failure_msg:
             return
+        if self.FAIL_FAST and self._build_failed:
+            return
 
         await self.watch_statuses()
+        # The statuses that didn't complete in time were already reported by watch_statuses(),
+        # in the fail-fast mode the rest were not waited for
         for status in self._statuses:
-            if not self.is_status_successful(status):
+            if self.is_status_completed(status) and not self.is_status_successful(status):
                 self.failure_msg += (
                     f"Check run {self.get_status_name(status)} was set to failure.\n"
                 )
 
+    @traced("watch_statuses")
     async def watch_statuses(self):
         """
         Watch the check runs, if all the check runs have completed status,
-        return.
+        return. In the fail-fast mode, return as soon as some of them fails.
         """
         watch_end = datetime.now(tz=timezone.utc) + timedelta(
             minutes=self.CHECK_TIME_FOR_WATCH_STATUSES,
@@ -547,10 +1020,23 @@ class Testcase(ABC):
             self.head_commit,
         )
 
+        schedule = self.polling_schedule(
+            PollingPhase.watch_statuses,
+            commit_key(self.head_commit),
+        )
+        previous_version = None
         while True:
-            all_statuses = self.get_statuses()
-            # Filter to only recent statuses (created after build was triggered)
-            self._statuses = [status for status in all_statuses if self.is_status_recent(status)]
+            all_statuses = await self.fetch_statuses()
+            # Filter to only recent statuses (created after build was triggered),
+            # evaluated by the tracker only for the new or changed ones
+            self._statuses = [
+                status for status in all_statuses if self.status_tracker.is_recent(status)
+            ]
+
+            # Poll faster when some status has changed, more changes are likely to follow
+            if previous_version is not None and self.status_tracker.version != previous_version:
+                schedule.changed()
+            previous_version = self.status_tracker.version
 
             # Log if we filtered out any old statuses
             filtered_count = len(all_statuses) - len(self._statuses)
@@ -560,10 +1046,19 @@ class Testcase(ABC):
                     filtered_count,
                 )
 
+            if self.FAIL_FAST and (failed := self.get_failed_statuses(self._statuses)):
+                logging.info(
+                    "Status %s of commit %s was set to failure, not waiting for the rest",
+                    self.get_status_name(failed[0]),
+                    self.head_commit,
+                )
+                break
+
             # Only consider checks complete if we have statuses AND they're all done
             if self._statuses and all(
                 self.is_status_completed(status) for status in self._statuses
             ):
+                self.latency.record(LatencyPhase.checks_completed)
                 break
 
             if datetime.now(tz=timezone.utc) > watch_end:
@@ -584,7 +1079,7 @@ class Testcase(ABC):
                             self.failure_msg += f"{self.get_status_name(status)}\n"
                 return
 
-            await asyncio.sleep(self.POLLING_INTERVAL * 60)
+            await schedule.wait()
 
     @property
     @abstractmethod
@@ -601,9 +1096,18 @@ class Testcase(ABC):
         """
 
     @abstractmethod
-    def get_statuses(self) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+    def get_commit_statuses(self, commit: str) -> Union[list[GithubCheckRun], list[CommitFlag]]:
+        """
+        Get all the statuses (checks in GitHub) of the commit via ogr.
+        """
+
+    @abstractmethod
+    async def get_commit_statuses_via_http(
+        self,
+        commit: str,
+    ) -> Union[list[GithubCheckRun], list[CommitFlag]]:
         """
-        Get the statuses (checks in GitHub).
+        Get all the statuses (checks in GitHub) of the commit via the async HTTP client.
         """
 
     @abstractmethod
@@ -626,23 +1130,39 @@ class Testcase(ABC):
         """
 
     @abstractmethod
-    def delete_previous_branch(self, ref: str):
+    async def delete_previous_branch(self, ref: str):
         """
         Delete the branch from the previous test run if it exists.
         """
 
     @abstractmethod
-    def create_file_in_new_branch(self, branch: str):
+    async def create_file_in_new_branch(self, branch: str):
         """
         Create a new branch and a new file in it via API (creates new commit).
         """
 
     @abstractmethod
-    def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
+    async def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
         """
         Update a file via API (creates new commit).
         """
 
+    def create_status_tracker(self) -> StatusTracker:
+        return StatusTracker(
+            name_of=self.get_status_name,
+            key_of=self.get_status_key,
+            is_recent=self.is_status_recent,
+            is_completed=self.is_status_completed,
+            is_successful=self.is_status_successful,
+        )
+
+    @abstractmethod
+    def get_status_key(self, status: Union[GithubCheckRun, CommitFlag]) -> Hashable:
+        """
+        Get the identity of the status in its current state, the status
+        is considered unchanged between the polls while its key is the same.
+        """
+
     @abstractmethod
     def get_status_name(self, status: Union[GithubCheckRun, CommitFlag]) -> str:
         """
@@ -650,7 +1170,7 @@ class Testcase(ABC):
         """
 
     @abstractmethod
-    def create_empty_commit(self, branch: str, commit_msg: str) -> str:
+    async def create_empty_commit(self, branch: str, commit_msg: str) -> str:
         """
         Create an empty commit via API.
         """
@@ -2,9 +2,13 @@
 #
 # SPDX-License-Identifier: MIT
 
-from datetime import timedelta
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
 
-from github import InputGitAuthor
+from github import GithubException, InputGitAuthor
+from github.CheckRun import CheckRun
 from github.Commit import Commit
 from ogr.services.github import GithubProject
 from ogr.services.github.check_run import (
@@ -14,11 +18,120 @@ from ogr.services.github.check_run import (
 )
 
 from validation.testcase.base import Testcase
+from validation.utils.comments import TrackedComment
+from validation.utils.conditional_cache import (
+    HTTP_BAD_REQUEST,
+    HTTP_NOT_MODIFIED,
+    CachedResponse,
+    conditional_cache,
+)
+
+PER_PAGE = 100  # maximum page size of the GitHub REST API
+
+
+def check_run_from_raw(project: GithubProject, raw_check_run: dict) -> GithubCheckRun:
+    """
+    Wrap the raw check run data returned by the REST API in the ogr object.
+    """
+    return GithubCheckRun(
+        project,
+        project.github_instance.create_from_raw_data(CheckRun, raw_check_run),
+    )
+
+
+def get_json_conditionally(
+    project: GithubProject,
+    url: str,
+    parameters: dict[str, Any] | None = None,
+) -> Any:
+    """
+    Send a conditional GET request via the PyGithub requester of the project,
+    replaying the cached response if it was not modified (304 responses are
+    not counted against the GitHub rate limit). If the cached response was evicted
+    meanwhile, the request is repeated unconditionally.
+
+    Args:
+        project: GitHub project whose requester (and authentication) is used.
+        url: Path of the API endpoint.
+        parameters: Query parameters.
+
+    Returns:
+        Decoded JSON response.
+    """
+    cache = conditional_cache(project.service.hostname)
+    key = f"{url}?{json.dumps(parameters, sort_keys=True)}"
+    request_headers = cache.conditional_headers(key)
+    while True:
+        status, headers, output = project.github_instance.requester.requestJson(
+            "GET",
+            url,
+            parameters=parameters,
+            headers=request_headers,
+        )
+        if status != HTTP_NOT_MODIFIED or not request_headers:
+            break
+        if entry := cache.get(key):
+            cache.record(hit=True)
+            return entry.data
+        logging.debug("Cached response of %s evicted, repeating the request", url)
+        request_headers = {}
+
+    data = json.loads(output) if output else None
+    if status >= HTTP_BAD_REQUEST:
+        raise GithubException(status, data, headers)
+
+    cache.record(hit=False)
+    cache.store(
+        key,
+        CachedResponse(
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            data=data,
+        ),
+    )
+    return data
+
+
+def get_pages_conditionally(
+    project: GithubProject,
+    url: str,
+    parameters: dict[str, Any] | None = None,
+    items_key: str | None = None,
+) -> list:
+    """
+    Get the items of all the pages of a paginated endpoint, each page is requested
+    conditionally via `get_json_conditionally`.
+
+    Args:
+        project: GitHub project whose requester (and authentication) is used.
+        url: Path of the API endpoint.
+        parameters: Query parameters (without the pagination ones).
+        items_key: Key of the items in the response, for the endpoints responding
+            with an object (e.g. check runs) instead of a list.
+
+    Returns:
+        Items of all the pages.
+    """
+    items: list = []
+    page = 1
+    while True:
+        data = get_json_conditionally(
+            project,
+            url,
+            parameters={**(parameters or {}), "per_page": PER_PAGE, "page": page},
+        )
+        page_items = data[items_key] if items_key else data
+        items.extend(page_items)
+        # A short page is the last one
+        if len(page_items) < PER_PAGE:
+            return items
+        page += 1
 
 
 class GithubTestcase(Testcase):
     project: GithubProject
     user = InputGitAuthor(name="Release Bot", email="user-cont-team+release-bot@redhat.com")
+    REQUESTS_PER_TEST = 100
 
     @property
     def account_name(self):
@@ -30,7 +143,14 @@ class GithubTestcase(Testcase):
     def get_status_name(self, status: GithubCheckRun) -> str:
         return status.name
 
-    def create_empty_commit(self, branch: str, commit_msg: str) -> str:
+    def get_status_key(self, status: GithubCheckRun) -> tuple:
+        raw = status.raw_check_run
+        return raw.id, raw.status, raw.conclusion
+
+    async def create_empty_commit(self, branch: str, commit_msg: str) -> str:
+        return await self.forge_call(self._create_empty_commit, branch, commit_msg)
+
+    def _create_empty_commit(self, branch: str, commit_msg: str) -> str:
         contents = self.project.github_repo.get_contents("test.txt", ref=branch)
         # https://pygithub.readthedocs.io/en/latest/examples/Repository.html#update-a-file-in-the-repository
         # allows empty commit (always the same content of file)
@@ -45,11 +165,57 @@ class GithubTestcase(Testcase):
         )["commit"]
         return commit.sha
 
-    def get_statuses(self) -> list[GithubCheckRun]:
+    def get_commit_statuses(self, commit: str) -> list[GithubCheckRun]:
+        raw_check_runs = get_pages_conditionally(
+            self.project,
+            f"/repos/{self.project.namespace}/{self.project.repo}/commits/{commit}/check-runs",
+            items_key="check_runs",
+        )
+        return [check_run_from_raw(self.project, raw_check_run) for raw_check_run in raw_check_runs]
+
+    async def get_commit_statuses_via_http(self, commit: str) -> list[GithubCheckRun]:
+        raw_check_runs: list[dict] = []
+        page = 1
+        while True:
+            response = await self.http_client.get_json(
+                f"repos/{self.project.namespace}/{self.project.repo}/commits/{commit}/check-runs",
+                params={"per_page": PER_PAGE, "page": page},
+            )
+            raw_check_runs.extend(response["check_runs"])
+            # A short page is the last one
+            if len(response["check_runs"]) < PER_PAGE:
+                break
+            page += 1
+        return [check_run_from_raw(self.project, raw_check_run) for raw_check_run in raw_check_runs]
+
+    def fetch_comments_since(self, since: datetime) -> list[TrackedComment]:
+        """
+        Fetch the comments of the PR updated since the given time with conditional
+        requests (one per page), so that unchanged results don't count against
+        the rate limit.
+        """
+        comments = get_pages_conditionally(
+            self.project,
+            f"/repos/{self.project.namespace}/{self.project.repo}/issues/{self.pr.id}/comments",
+            parameters={
+                "since": since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            },
+        )
+        return [
+            TrackedComment(
+                id=comment["id"],
+                author=comment["user"]["login"],
+                body=comment["body"],
+                created=datetime.strptime(comment["created_at"], "%Y-%m-%dT%H:%M:%SZ").replace(
+                    tzinfo=timezone.utc,
+                ),
+            )
+            for comment in comments
+        ]
+
+    def filter_statuses(self, statuses: list[GithubCheckRun]) -> list[GithubCheckRun]:
         return [
-            check_run
-            for check_run in self.project.get_check_runs(commit_sha=self.head_commit)
-            if check_run.app.name == self.deployment.app_name
+            check_run for check_run in statuses if check_run.app.name == self.deployment.app_name
         ]
 
     def is_status_successful(self, status: GithubCheckRun) -> bool:
@@ -75,12 +241,18 @@ class GithubTestcase(Testcase):
         buffer_time = self._build_triggered_at - timedelta(minutes=1)
         return status_time >= buffer_time
 
-    def delete_previous_branch(self, branch: str):
+    async def delete_previous_branch(self, branch: str):
+        await self.forge_call(self._delete_previous_branch, branch)
+
+    def _delete_previous_branch(self, branch: str):
         existing_branch = self.project.github_repo.get_git_matching_refs(f"heads/{branch}")
         if existing_branch.totalCount:
             existing_branch[0].delete()
 
-    def create_file_in_new_branch(self, branch: str):
+    async def create_file_in_new_branch(self, branch: str):
+        await self.forge_call(self._create_file_in_new_branch, branch)
+
+    def _create_file_in_new_branch(self, branch: str):
         commit = self.project.github_repo.get_commit("HEAD")
         ref = f"refs/heads/{branch}"
         self.pr_branch_ref = self.project.github_repo.create_git_ref(ref, commit.sha)
@@ -93,7 +265,10 @@ class GithubTestcase(Testcase):
             author=self.user,
         )
 
-    def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
+    async def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
+        await self.forge_call(self._update_file_and_commit, path, commit_msg, content, branch)
+
+    def _update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
         contents = self.project.github_repo.get_contents(path=path, ref=branch)
         self.project.github_repo.update_file(
             path,
@@ -5,17 +5,26 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta, timezone
+from urllib.parse import quote
 
 from gitlab import GitlabGetError
+from gitlab.v4.objects import ProjectCommitStatus
 from ogr.abstract import CommitFlag, CommitStatus
 from ogr.services.gitlab import GitlabProject
+from ogr.services.gitlab.flag import GitlabCommitFlag
 
 from validation.testcase.base import Testcase
+from validation.utils.events import commit_key
+from validation.utils.polling import PollingPhase, PollingPolicy
+from validation.utils.tracing import traced
 from validation.utils.trigger import Trigger
 
 
 class GitlabTestcase(Testcase):
     project: GitlabProject
+    # Polling while waiting (up to an hour) for a delayed webhook delivery
+    DELAYED_WEBHOOK_POLLING = PollingPolicy(initial=30, maximum=300)
+    DELAYED_WEBHOOK_WAIT = 60  # minutes - additional wait for a delayed opened PR webhook
 
     @property
     def account_name(self):
@@ -27,7 +36,13 @@ class GitlabTestcase(Testcase):
     def get_status_name(self, status: CommitFlag) -> str:
         return status.context
 
-    def create_file_in_new_branch(self, branch: str):
+    def get_status_key(self, status: CommitFlag) -> tuple:
+        return status.uid, status.state
+
+    async def create_file_in_new_branch(self, branch: str):
+        await self.forge_call(self._create_file_in_new_branch, branch)
+
+    def _create_file_in_new_branch(self, branch: str):
         self.pr_branch_ref = self.project.gitlab_repo.branches.create(
             {"branch": branch, "ref": "master"},
         )
@@ -43,8 +58,27 @@ class GitlabTestcase(Testcase):
             },
         )
 
-    def get_statuses(self) -> list[CommitFlag]:
-        all_statuses = list(self.project.get_commit_statuses(commit=self.head_commit))
+    def get_commit_statuses(self, commit: str) -> list[CommitFlag]:
+        return list(self.project.get_commit_statuses(commit=commit))
+
+    async def get_commit_statuses_via_http(self, commit: str) -> list[CommitFlag]:
+        project_path = quote(f"{self.project.namespace}/{self.project.repo}", safe="")
+        raw_statuses = await self.http_client.get_json(
+            f"projects/{project_path}/repository/commits/{commit}/statuses",
+            params={"per_page": 100},
+        )
+        # Wrap the raw data the same way python-gitlab and ogr do
+        manager = self.project.gitlab_repo.commits.get(commit, lazy=True).statuses
+        return [
+            GitlabCommitFlag(
+                raw_commit_flag=ProjectCommitStatus(manager, raw_status),
+                project=self.project,
+            )
+            for raw_status in raw_statuses
+        ]
+
+    def filter_statuses(self, statuses: list[CommitFlag]) -> list[CommitFlag]:
+        all_statuses = statuses
 
         logging.debug(
             "Fetching statuses for commit %s, total found: %d",
@@ -101,7 +135,10 @@ class GitlabTestcase(Testcase):
         buffer_time = self._build_triggered_at - timedelta(minutes=1)
         return status_time >= buffer_time
 
-    def delete_previous_branch(self, branch: str):
+    async def delete_previous_branch(self, branch: str):
+        await self.forge_call(self._delete_previous_branch, branch)
+
+    def _delete_previous_branch(self, branch: str):
         try:
             existing_branch = self.project.gitlab_repo.branches.get(branch)
         except GitlabGetError:
@@ -109,12 +146,18 @@ class GitlabTestcase(Testcase):
 
         existing_branch.delete()
 
-    def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
+    async def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
+        await self.forge_call(self._update_file_and_commit, path, commit_msg, content, branch)
+
+    def _update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
         file = self.project.gitlab_repo.files.get(file_path=path, ref=branch)
         file.content = content
         file.save(branch=branch, commit_message=commit_msg)
 
-    def create_empty_commit(self, branch: str, commit_msg: str) -> str:
+    async def create_empty_commit(self, branch: str, commit_msg: str) -> str:
+        return await self.forge_call(self._create_empty_commit, branch, commit_msg)
+
+    def _create_empty_commit(self, branch: str, commit_msg: str) -> str:
         data = {
             "branch": branch,
             "commit_message": commit_msg,
@@ -124,6 +167,7 @@ class GitlabTestcase(Testcase):
         commit = self.project.gitlab_repo.commits.create(data)
         return commit.id
 
+    @traced("check_pending_check_runs")
     async def check_pending_check_runs(self):
         """
         Override to add extended wait time for GitLab opened PR webhook delays.
@@ -139,37 +183,49 @@ class GitlabTestcase(Testcase):
             and self.failure_msg != initial_failure_msg
             and "Commit statuses did not appear in time" in self.failure_msg
         ):
+            appear_wait = self.max_wait_for_trigger_visible + self.CHECK_TIME_FOR_STATUSES_TO_APPEAR
             logging.error(
                 "GitLab webhook delivery delayed - statuses did not appear within %d minutes. "
                 "This is a known issue with GitLab webhook queuing during high load. "
-                "Waiting an additional 60 minutes for delayed webhook delivery...",
-                self.CHECK_TIME_FOR_STATUSES_TO_APPEAR,
+                "Waiting an additional %d minutes for delayed webhook delivery...",
+                appear_wait,
+                self.DELAYED_WEBHOOK_WAIT,
             )
+            # The silence of packit-service is expected for a while, don't end the run
+            if self.health_monitor:
+                self.health_monitor.extend_wait(id(self), self.DELAYED_WEBHOOK_WAIT * 60)
 
             # Clear the failure message and wait longer
             self.failure_msg = initial_failure_msg
 
-            # Wait up to 60 more minutes for statuses to appear
-            watch_end = datetime.now(tz=timezone.utc) + timedelta(minutes=60)
-            all_statuses = self.get_statuses()
+            # Wait for statuses to appear a while longer
+            watch_end = datetime.now(tz=timezone.utc) + timedelta(minutes=self.DELAYED_WEBHOOK_WAIT)
+            all_statuses = await self.fetch_statuses()
             status_names = [self.get_status_name(status) for status in all_statuses]
 
+            schedule = self.polling_schedule(
+                PollingPhase.statuses_appear,
+                commit_key(self.head_commit),
+                policy=self.DELAYED_WEBHOOK_POLLING,
+            )
             while len(status_names) == 0:
                 if datetime.now(tz=timezone.utc) > watch_end:
                     logging.error(
-                        "GitLab webhook still not received after extended 60 minute wait. "
+                        "GitLab webhook still not received after extended %d minute wait. "
                         "Total wait time: %d minutes. "
                         "This indicates a significant GitLab webhook delay.",
-                        self.CHECK_TIME_FOR_STATUSES_TO_APPEAR + 60,
+                        self.DELAYED_WEBHOOK_WAIT,
+                        appear_wait + self.DELAYED_WEBHOOK_WAIT,
                     )
+                    total_wait = appear_wait + self.DELAYED_WEBHOOK_WAIT
                     self.failure_msg += (
                         f"Commit statuses did not appear even after extended wait "
-                        f"({self.CHECK_TIME_FOR_STATUSES_TO_APPEAR + 60} minutes total).\n"
+                        f"({total_wait} minutes total).\n"
                         "Note: GitLab webhook delivery was significantly delayed.\n"
                     )
                     return
-                await asyncio.sleep(30)
-                all_statuses = self.get_statuses()
+                await schedule.wait()
+                all_statuses = await self.fetch_statuses()
                 status_names = [self.get_status_name(status) for status in all_statuses]
 
             logging.error(
@@ -190,17 +246,19 @@ class GitlabTestcase(Testcase):
                 minutes=self.CHECK_TIME_FOR_REACTION,
             )
 
+            schedule = self.polling_schedule(PollingPhase.reaction, commit_key(self.head_commit))
             while True:
                 if datetime.now(tz=timezone.utc) > watch_end:
                     self.failure_msg += (
                         f"Commit statuses were not set to pending in time "
                         f"({self.CHECK_TIME_FOR_REACTION} minutes).\n"
                     )
+                    self.record_reaction()
                     return
 
                 new_statuses = [
                     status
-                    for status in self.get_statuses()
+                    for status in await self.fetch_statuses()
                     if self.get_status_name(status) in status_names
                 ]
 
@@ -210,6 +268,7 @@ class GitlabTestcase(Testcase):
                             "At least one commit status is now pending/running: %s",
                             self.get_status_name(status),
                         )
+                        self.record_reaction(self.first_pending_seen_at())
                         return
 
-                await asyncio.sleep(30)
+                await schedule.wait()
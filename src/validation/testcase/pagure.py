@@ -2,21 +2,29 @@
 #
 # SPDX-License-Identifier: MIT
 
-import asyncio
-import configparser
 import logging
 import os
-import shutil
 import subprocess
-import tempfile
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import ClassVar
 
-from ogr.abstract import CommitFlag, CommitStatus
+from ogr.abstract import CommitFlag, CommitStatus, PullRequest
 from ogr.services.pagure import PagureProject
-
-from validation.helpers import koji
-from validation.testcase.base import Testcase
+from ogr.services.pagure.flag import PagureCommitFlag
+
+from validation.helpers import (
+    cache_koji_task_request,
+    get_koji_task_requests,
+    koji,
+    koji_call,
+)
+from validation.testcase.base import OPENED_PR_BODY, Testcase
+from validation.utils.events import koji_task_key
+from validation.utils.git_mirror import GitMirror, git_mirror
+from validation.utils.latency import LatencyPhase
+from validation.utils.polling import PollingPhase, PollingPolicy
+from validation.utils.tracing import traced
 
 # Koji task states
 KOJI_TASK_FREE = 0
@@ -39,11 +47,64 @@ class KojiBuildWrapper:
         return self._build.get("build_id") or self._build.get("id")
 
 
+class KojiTaskCursor:
+    """
+    Position in the listing of the Koji build tasks, so that each poll fetches only
+    the tasks created since the previous one, no matter how busy Koji is.
+    """
+
+    PAGE_SIZE = 50  # tasks fetched in one listTasks call
+
+    def __init__(self, since: datetime):
+        # Timestamp of the oldest task that can still be new (createdAfter)
+        self.created_after = since.timestamp()
+        # Highest ID of the inspected tasks
+        self.last_task_id = 0
+
+    def fetch_new_tasks(self, koji_session, opts: dict) -> list[dict]:
+        """
+        Fetch the tasks matching the options created since the previous call (blocking).
+
+        Args:
+            koji_session: Koji session.
+            opts: Options of listTasks (method, states, ...).
+
+        Returns:
+            The new tasks (oldest first).
+        """
+        new_tasks = []
+        offset = 0
+        while True:
+            tasks = koji_session.listTasks(
+                opts={**opts, "createdAfter": self.created_after},
+                queryOpts={"limit": self.PAGE_SIZE, "offset": offset, "order": "id"},
+            )
+            new_tasks.extend(task for task in tasks if task["id"] > self.last_task_id)
+            if len(tasks) < self.PAGE_SIZE:
+                break
+            offset += self.PAGE_SIZE
+
+        if new_tasks:
+            self.last_task_id = new_tasks[-1]["id"]
+            # Tasks created in the same second can be listed again, they are skipped by ID
+            self.created_after = max(
+                self.created_after,
+                new_tasks[-1].get("create_ts", self.created_after) - 1,
+            )
+        logging.debug(
+            "Found %d new Koji task(s), last inspected task: %d",
+            len(new_tasks),
+            self.last_task_id,
+        )
+        return new_tasks
+
+
 class PagureTestcase(Testcase):
     """
     Testcase implementation for Pagure-based forges (src.fedoraproject.org, etc.).
 
-    This testcase uses fedpkg for repository cloning and SSH keys for git operations.
+    This testcase works in worktrees of a persistent mirror of the dist-git repository
+    and uses SSH keys for git operations.
     The Pagure account name defaults to 'packit-ci-test-bot' but can be overridden.
 
     Environment variables:
@@ -51,6 +112,8 @@ class PagureTestcase(Testcase):
         PAGURE_SSH_KEY: Path to SSH private key for git operations
         PAGURE_TOKEN: API token for Pagure operations
         PAGURE_KEYTAB: Path to Kerberos keytab file for authentication
+        VALIDATION_GIT_MIRROR_DIR: Directory of the persistent git mirrors
+            (default: ~/.cache/packit-validation/git)
 
     Example usage:
         # Use default packit-ci-test-bot account
@@ -69,12 +132,17 @@ class PagureTestcase(Testcase):
 
     # Pagure is slower than GitHub/GitLab, increase timeout for build submission
     CHECK_TIME_FOR_SUBMIT_BUILDS = 10  # minutes
+    # Koji task discovery is more expensive than listing Copr builds, poll less eagerly
+    POLLING_POLICIES: ClassVar[dict[PollingPhase, PollingPolicy]] = {
+        **Testcase.POLLING_POLICIES,
+        PollingPhase.build_submit: PollingPolicy(initial=30, maximum=120),
+    }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self._temp_dir = None
+        self._worktree: Path | None = None
         self._fork = None
-        self._config_dir = None
+        self._koji_task_cursor: KojiTaskCursor | None = None
 
     @property
     def account_name(self):
@@ -85,6 +153,10 @@ class PagureTestcase(Testcase):
     def get_status_name(self, status: CommitFlag) -> str:
         return status.context
 
+    def get_status_key(self, status: CommitFlag) -> tuple:
+        # The flags are updated in place (by their uid), with a new update time
+        return status.context, status._raw_commit_flag.get("date_updated"), status.state
+
     def construct_copr_project_name(self) -> str:
         """
         Not applicable for Pagure - uses Koji builds instead of Copr.
@@ -93,42 +165,12 @@ class PagureTestcase(Testcase):
         msg = "Pagure uses Koji builds, not Copr builds"
         raise NotImplementedError(msg)
 
-    def _cleanup(self):
-        """Clean up temporary directories created for git operations and config."""
-        if self._temp_dir and Path(self._temp_dir).exists():
-            logging.debug("Cleaning up temporary directory: %s", self._temp_dir)
-            shutil.rmtree(self._temp_dir)
-            self._temp_dir = None
-        if self._config_dir and Path(self._config_dir).exists():
-            logging.debug("Cleaning up config directory: %s", self._config_dir)
-            shutil.rmtree(self._config_dir)
-            self._config_dir = None
-
-    def _setup_fedpkg_token(self):
-        """
-        Write PAGURE_TOKEN to fedpkg config file in a temporary directory.
-        Returns the config file path to be used with --user-config option.
-        """
-        token = os.getenv("PAGURE_TOKEN")
-        if not token:
-            logging.warning("PAGURE_TOKEN not set, fedpkg commands may fail")
-            return None
-
-        # Create temporary config directory
-        self._config_dir = tempfile.mkdtemp(prefix="validation-fedpkg-config-")
-        config_file = Path(self._config_dir) / "fedpkg.conf"
-
-        # Create config with token
-        config = configparser.ConfigParser()
-        config.add_section("fedpkg.distgit")
-        config.set("fedpkg.distgit", "token", token)
-
-        # Write config
-        with open(config_file, "w") as f:
-            config.write(f)
-
-        logging.debug("Wrote PAGURE_TOKEN to %s", config_file)
-        return str(config_file)
+    async def _cleanup(self):
+        """Remove the worktree created for git operations."""
+        if self._worktree:
+            logging.debug("Removing worktree: %s", self._worktree)
+            await self._git_mirror().remove_worktree(self._worktree)
+            self._worktree = None
 
     def _get_authenticated_username(self):
         """Get the authenticated user's username."""
@@ -154,196 +196,134 @@ class PagureTestcase(Testcase):
                 # Some other error, re-raise
                 raise
 
-    def _setup_git_repo(self):
-        """Clone the repository using fedpkg and set up fork."""
-        if self._temp_dir is None:
-            # Set up fedpkg token from environment variable
-            config_file = self._setup_fedpkg_token()
-
-            # Create parent temporary directory
-            parent_temp = tempfile.mkdtemp(prefix="validation-pagure-")
-            logging.debug("Created temporary directory: %s", parent_temp)
-
-            # Check for SSH key to use for git operations
-            ssh_key_path = os.getenv("PAGURE_SSH_KEY")
-            if ssh_key_path and os.path.exists(ssh_key_path):
-                logging.debug("Will use SSH key: %s", ssh_key_path)
-            else:
-                logging.warning(
-                    "PAGURE_SSH_KEY not set or file doesn't exist, SSH authentication may fail",
-                )
-
-            # Use fedpkg to clone
-            package_name = self.project.repo
-            logging.info("Cloning %s using fedpkg", package_name)
+    def _git_mirror(self) -> GitMirror:
+        """Get the persistent mirror of the dist-git repository."""
+        return git_mirror(
+            f"https://{self.project.service.hostname}/"
+            f"{self.project.namespace}/{self.project.repo}.git",
+        )
 
-            # Build fedpkg command with config file if available
-            clone_cmd = ["fedpkg"]
-            if config_file:
-                clone_cmd.extend(["--user-config", config_file])
-            clone_cmd.extend(["clone", "-a", package_name])
+    @staticmethod
+    def _get_ssh_key_path() -> str | None:
+        """Get the SSH key to use for git operations."""
+        ssh_key_path = os.getenv("PAGURE_SSH_KEY")
+        if ssh_key_path and Path(ssh_key_path).exists():
+            logging.debug("Will use SSH key: %s", ssh_key_path)
+        else:
+            logging.warning(
+                "PAGURE_SSH_KEY not set or file doesn't exist, SSH authentication may fail",
+            )
+        return ssh_key_path
 
+    async def _setup_git_repo(self) -> Path:
+        """
+        Set up a worktree of the persistent dist-git mirror with the fork remote.
+        The mirror is fetched incrementally instead of cloning the repository.
+        """
+        if self._worktree is None:
+            mirror = self._git_mirror()
             try:
-                subprocess.run(  # noqa: S603
-                    clone_cmd,
-                    cwd=parent_temp,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-                self._temp_dir = str(Path(parent_temp) / package_name)
-                logging.debug("Repository cloned to: %s", self._temp_dir)
-            except subprocess.CalledProcessError as e:
-                logging.error("Failed to clone with fedpkg: %s\nstderr: %s", e, e.stderr)
-                shutil.rmtree(parent_temp)
+                await mirror.sync()
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+                logging.error("Failed to sync git mirror: %s\nstderr: %s", e, e.stderr)
                 raise
 
             # Ensure fork exists via API
-            self._ensure_fork_exists()
+            await self.forge_call(self._ensure_fork_exists)
 
-            # Use fedpkg to set up fork remote
-            logging.info("Setting up fork with fedpkg")
+            # Use SSH for the fork remote (named after the account) for Kerberos
             user = self.account_name
+            hostname = self.project.service.hostname
+            if hostname == "src.fedoraproject.org":
+                git_hostname = "pkgs.fedoraproject.org"
+            else:
+                git_hostname = hostname
 
-            # Build fedpkg fork command with config file if available
-            fork_cmd = ["fedpkg"]
-            if config_file:
-                fork_cmd.extend(["--user-config", config_file])
-            fork_cmd.append("fork")
+            ssh_url = f"ssh://{user}@{git_hostname}/forks/{user}/{self.project.namespace}/{self.project.repo}.git"
+            logging.debug("Configuring fork remote to SSH: %s", ssh_url)
 
+            ssh_key_path = self._get_ssh_key_path()
             try:
-                subprocess.run(  # noqa: S603
-                    fork_cmd,
-                    cwd=self._temp_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
-                )
-
-                # fedpkg fork creates HTTPS remote, but we need SSH for Kerberos
-                # Change the fork remote URL to SSH
-                hostname = self.project.service.hostname
-                if hostname == "src.fedoraproject.org":
-                    git_hostname = "pkgs.fedoraproject.org"
-                else:
-                    git_hostname = hostname
-
-                ssh_url = f"ssh://{user}@{git_hostname}/forks/{user}/{self.project.namespace}/{self.project.repo}.git"
-                logging.debug("Configuring fork remote to SSH: %s", ssh_url)
-
-                # Check if remote exists, create if not
-                check_remote = subprocess.run(  # noqa: S603
-                    ["git", "remote", "get-url", user],  # noqa: S607
-                    cwd=self._temp_dir,
-                    capture_output=True,
-                    check=False,
-                )
-
-                if check_remote.returncode == 0:
-                    # Remote exists, update URL
-                    subprocess.run(  # noqa: S603
-                        ["git", "remote", "set-url", user, ssh_url],  # noqa: S607
-                        cwd=self._temp_dir,
-                        check=True,
-                        capture_output=True,
-                    )
-                    logging.debug("Updated existing fork remote")
-                else:
-                    # Remote doesn't exist, create it
-                    subprocess.run(  # noqa: S603
-                        ["git", "remote", "add", user, ssh_url],  # noqa: S607
-                        cwd=self._temp_dir,
-                        check=True,
-                        capture_output=True,
-                    )
-                    logging.debug("Created new fork remote")
-
+                await mirror.set_remote(user, ssh_url)
                 # Configure git to use SSH key if provided
-                ssh_key_path = os.getenv("PAGURE_SSH_KEY")
                 if ssh_key_path:
                     ssh_command = f"ssh -i {ssh_key_path} -o IdentitiesOnly=yes"
-                    subprocess.run(  # noqa: S603
-                        ["git", "config", "core.sshCommand", ssh_command],  # noqa: S607
-                        cwd=self._temp_dir,
-                        check=True,
-                        capture_output=True,
-                    )
+                    await mirror.set_config("core.sshCommand", ssh_command)
                     logging.debug("Configured git to use SSH key: %s", ssh_key_path)
-
-            except subprocess.CalledProcessError as e:
+                # Branches of the fork, e.g. the ones of the existing test PRs
+                await mirror.fetch(user)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
                 logging.warning("Fork setup failed: %s\nstderr: %s", e, e.stderr)
 
-        return self._temp_dir
+            default_branch = await self.forge_call(self._get_default_branch)
+            self._worktree = await mirror.add_worktree(f"origin/{default_branch}")
 
-    def create_file_in_new_branch(self, branch: str):
+        return self._worktree
+
+    def _get_default_branch(self) -> str:
+        """Get the default branch of the project (blocking, fetched from the Pagure API)."""
+        return self.project.default_branch
+
+    async def _checkout_branch(self, repo_dir: Path, branch: str):
+        """
+        Check out the branch at its state in the fork (or upstream), the local branches
+        of the persistent mirror can be outdated.
+        """
+        mirror = self._git_mirror()
+        for remote in (self.account_name, "origin"):
+            ref = f"refs/remotes/{remote}/{branch}"
+            try:
+                await mirror.git("rev-parse", "--verify", "--quiet", ref, cwd=repo_dir)
+            except subprocess.CalledProcessError:
+                continue
+            await mirror.git("checkout", "-B", branch, ref, cwd=repo_dir, exclusive=True)
+            return
+
+        await mirror.git("checkout", branch, cwd=repo_dir)
+
+    async def create_file_in_new_branch(self, branch: str):
         """Create a new branch and add a file using git operations."""
-        repo_dir = self._setup_git_repo()
+        mirror = self._git_mirror()
+        repo_dir = await self._setup_git_repo()
 
-        # Create and checkout new branch
+        # Create and checkout new branch (it can exist in the mirror from previous runs)
         logging.info("Creating branch: %s", branch)
-        subprocess.run(  # noqa: S603
-            ["git", "checkout", "-b", branch],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
+        await mirror.git("checkout", "-B", branch, cwd=repo_dir, exclusive=True)
 
         # Create a test file
         test_file = Path(repo_dir) / "test.txt"
         test_file.write_text("Testing the opened PR trigger.")
 
         # Add and commit the file
-        subprocess.run(  # noqa: S603
-            ["git", "add", "test.txt"],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(  # noqa: S603
-            ["git", "commit", "-m", "Opened PR trigger"],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
+        await mirror.git("add", "test.txt", cwd=repo_dir)
+        await mirror.git("commit", "-m", "Opened PR trigger", cwd=repo_dir)
         logging.debug("Created commit with test file")
 
-        # Push to fork (fedpkg fork creates remote named after Kerberos principal)
+        # Push to fork (the fork remote is named after the Kerberos principal)
         # Use deployment account name which should match the Kerberos principal
         fork_remote = self.account_name
         logging.info("Pushing branch %s to fork remote '%s'", branch, fork_remote)
         try:
-            # Push to fork with upstream tracking (force push to overwrite existing test branch)
-            subprocess.run(  # noqa: S603
-                ["git", "push", "--force", "--set-upstream", fork_remote, branch],  # noqa: S607
+            # Push to fork with upstream tracking (force push to overwrite existing test branch),
+            # setting the upstream changes the config of the mirror
+            await mirror.git(
+                "push",
+                "--force",
+                "--set-upstream",
+                fork_remote,
+                branch,
                 cwd=repo_dir,
-                check=True,
-                capture_output=True,
-                text=True,
+                exclusive=True,
             )
             logging.info("Successfully pushed branch to fork")
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
             logging.error("git push failed: %s\nstderr: %s", e, e.stderr)
             raise
 
-    def create_pr(self):
-        """Override create_pr to implement Pagure-specific PR creation."""
-        source_branch = f"test/{self.deployment.name}/opened_pr"
-        pr_title = f"Basic test case ({self.deployment.name}): opened PR trigger"
-        logging.info("Creating new PR: %s from branch %s", pr_title, source_branch)
-        self.delete_previous_branch(source_branch)
-
-        # Delete the PR from the previous test run if it exists
-        existing_pr = [pr for pr in self.project.get_pr_list() if pr.title == pr_title]
-        if len(existing_pr) == 1:
-            logging.debug("Closing existing PR: %s", existing_pr[0].url)
-            existing_pr[0].close()
-
-        logging.debug("Creating file in new branch: %s", source_branch)
-        self.create_file_in_new_branch(source_branch)
-        if self.deployment.opened_pr_trigger__packit_yaml_fix:
-            self.fix_packit_yaml(source_branch)
-
-        logging.debug("Creating PR via Pagure API...")
+    def open_pr(self, title: str, source_branch: str) -> PullRequest:
+        """
+        Open the PR from the branch of the fork via the Pagure API (blocking).
+        """
         # For Pagure, we need to create PR from the fork to the parent project
         self._ensure_fork_exists()
 
@@ -357,12 +337,10 @@ class PagureTestcase(Testcase):
             "new",
             method="POST",
             data={
-                "title": pr_title,
+                "title": title,
                 "branch_to": self.project.default_branch,
                 "branch_from": source_branch,
-                "initial_comment": (
-                    "This test case is triggered automatically by our validation script."
-                ),
+                "initial_comment": OPENED_PR_BODY,
                 "repo_from": self.project.repo,
                 "repo_from_username": fork_username,
                 "repo_from_namespace": self.project.namespace,
@@ -373,17 +351,27 @@ class PagureTestcase(Testcase):
         from ogr.services.pagure.pull_request import PagurePullRequest
 
         # PagurePullRequest expects the raw PR data, not just the ID
-        self.pr = PagurePullRequest(raw_pr=pr_data, project=self.project)
-        self.head_commit = self.pr.head_commit
-        logging.info("PR created: %s", self.pr.url)
+        return PagurePullRequest(raw_pr=pr_data, project=self.project)
+
+    def get_commit_statuses(self, commit: str) -> list[CommitFlag]:
+        return self.project.get_commit_statuses(commit=commit)
+
+    async def get_commit_statuses_via_http(self, commit: str) -> list[CommitFlag]:
+        response = await self.http_client.get_json(
+            f"{self.project.namespace}/{self.project.repo}/c/{commit}/flag",
+        )
+        return [
+            PagureCommitFlag(raw_commit_flag=flag, project=self.project)
+            for flag in response["flags"]
+        ]
 
-    def get_statuses(self) -> list[CommitFlag]:
+    def filter_statuses(self, statuses: list[CommitFlag]) -> list[CommitFlag]:
         # Filter by the Packit service account that sets commit statuses
         # This is the same as the Copr user (packit for prod, packit-stg for staging)
         packit_user = self.deployment.copr_user
         return [
             status
-            for status in self.project.get_commit_statuses(commit=self.head_commit)
+            for status in statuses
             if status._raw_commit_flag.get("user", {}).get("name") == packit_user
         ]
 
@@ -413,11 +401,11 @@ class PagureTestcase(Testcase):
         buffer_time = self._build_triggered_at - timedelta(minutes=1)
         return status_time >= buffer_time
 
-    def delete_previous_branch(self, branch: str):
+    async def delete_previous_branch(self, branch: str):
         """Delete a branch from the fork."""
         try:
             # Set up git repo if not already done (this ensures fork exists)
-            repo_dir = self._setup_git_repo()
+            repo_dir = await self._setup_git_repo()
 
             # Get fork remote name (should match deployment account)
             fork_remote = self.account_name
@@ -425,61 +413,41 @@ class PagureTestcase(Testcase):
             # Try to delete the branch via git push
             logging.info("Attempting to delete branch %s from fork", branch)
             try:
-                subprocess.run(  # noqa: S603
-                    ["git", "push", fork_remote, f":{branch}"],  # noqa: S607
+                await self._git_mirror().git(
+                    "push",
+                    fork_remote,
+                    f":{branch}",
                     cwd=repo_dir,
-                    check=True,
-                    capture_output=True,
-                    text=True,
+                    exclusive=True,
                 )
                 logging.info("Deleted branch %s from fork", branch)
-            except subprocess.CalledProcessError as e:
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
                 logging.warning("Could not delete branch %s: %s\nstderr: %s", branch, e, e.stderr)
         except Exception as e:
             logging.warning("Error deleting branch %s: %s", branch, e)
 
-    def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
+    async def update_file_and_commit(self, path: str, commit_msg: str, content: str, branch: str):
         """Update a file and commit the changes using git operations."""
-        repo_dir = self._setup_git_repo()
+        mirror = self._git_mirror()
+        repo_dir = await self._setup_git_repo()
 
         # Checkout the branch
         logging.info("Checking out branch: %s", branch)
-        subprocess.run(  # noqa: S603
-            ["git", "checkout", branch],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
+        await self._checkout_branch(repo_dir, branch)
 
         # Update the file
         file_path = Path(repo_dir) / path
         file_path.write_text(content)
 
         # Add and commit
-        subprocess.run(  # noqa: S603
-            ["git", "add", path],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(  # noqa: S603
-            ["git", "commit", "-m", commit_msg],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
+        await mirror.git("add", path, cwd=repo_dir)
+        await mirror.git("commit", "-m", commit_msg, cwd=repo_dir)
         logging.debug("Updated file %s and committed", path)
 
-        # Push to fork (fedpkg fork creates remote named after deployment account)
+        # Push to fork (the fork remote is named after the deployment account)
         fork_remote = self.account_name
         logging.info("Pushing updated branch %s to fork", branch)
-        subprocess.run(  # noqa: S603
-            ["git", "push", "--force", fork_remote, branch],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        await mirror.git("push", "--force", fork_remote, branch, cwd=repo_dir)
 
     def _get_packit_yaml_ref(self, branch: str) -> str:  # noqa: ARG002
         """
@@ -488,51 +456,31 @@ class PagureTestcase(Testcase):
         """
         return self.project.default_branch
 
-    def create_empty_commit(self, branch: str, commit_msg: str) -> str:
+    async def create_empty_commit(self, branch: str, commit_msg: str) -> str:
         """Create an empty commit using git operations."""
-        repo_dir = self._setup_git_repo()
+        mirror = self._git_mirror()
+        repo_dir = await self._setup_git_repo()
 
         # Checkout the branch
         logging.info("Checking out branch: %s", branch)
-        subprocess.run(  # noqa: S603
-            ["git", "checkout", branch],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
+        await self._checkout_branch(repo_dir, branch)
 
         # Create empty commit
-        subprocess.run(  # noqa: S603
-            ["git", "commit", "--allow-empty", "-m", commit_msg],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-        )
+        await mirror.git("commit", "--allow-empty", "-m", commit_msg, cwd=repo_dir)
 
         # Get commit SHA
-        result = subprocess.run(  # noqa: S603
-            ["git", "rev-parse", "HEAD"],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        result = await mirror.git("rev-parse", "HEAD", cwd=repo_dir)
         commit_sha = result.stdout.strip()
         logging.debug("Created empty commit: %s", commit_sha)
 
-        # Push to fork (fedpkg fork creates remote named after deployment account)
+        # Push to fork (the fork remote is named after the deployment account)
         fork_remote = self.account_name
         logging.info("Pushing branch %s to fork", branch)
-        subprocess.run(  # noqa: S603
-            ["git", "push", "--force", fork_remote, branch],  # noqa: S607
-            cwd=repo_dir,
-            check=True,
-            capture_output=True,
-            text=True,
-        )
+        await mirror.git("push", "--force", fork_remote, branch, cwd=repo_dir)
 
         return commit_sha
 
+    @traced("check_build_submitted")
     async def check_build_submitted(self):
         """
         Check whether the Koji build task was submitted.
@@ -540,10 +488,9 @@ class PagureTestcase(Testcase):
         Scratch builds don't appear in listBuilds(), so we query listTasks() instead.
         """
         logging.info("Checking Koji build submission for Pagure PR")
-        old_comment_len = len(list(self.pr.get_comments())) if self.pr else 0
-
-        self._build_triggered_at = datetime.now(tz=timezone.utc)
-        self.trigger_build()
+        await self.prepare_trigger()
+        self._koji_task_cursor = KojiTaskCursor(since=self._build_triggered_at - self.CLOCK_SKEW)
+        await self.run_trigger()
 
         watch_end = datetime.now(tz=timezone.utc) + timedelta(
             minutes=self.CHECK_TIME_FOR_SUBMIT_BUILDS,
@@ -557,6 +504,7 @@ class PagureTestcase(Testcase):
             self.CHECK_TIME_FOR_SUBMIT_BUILDS,
         )
 
+        schedule = self.polling_schedule(PollingPhase.build_submit, koji_task_key())
         check_count = 0
         while True:
             check_count += 1
@@ -570,30 +518,30 @@ class PagureTestcase(Testcase):
                 return
 
             # Query Koji for build tasks matching our commit
-            koji_task = self.get_koji_task_for_pr()
+            try:
+                koji_task = await koji_call(self.get_koji_task_for_pr)
+            except Exception as e:
+                # Already reported to the run health by koji_call, retry on the next poll
+                logging.warning("Error fetching Koji tasks: %s", e)
+                koji_task = None
 
             if koji_task:
                 self._build = KojiBuildWrapper({"build_id": koji_task["id"], "id": koji_task["id"]})
+                self.latency.record(LatencyPhase.build_submitted)
                 logging.info("Found Koji task: %s", koji_task["id"])
                 return
 
-            # Check for error comments from packit-service
-            new_comments = list(self.pr.get_comments(reverse=True))
-            new_comments = new_comments[: (len(new_comments) - old_comment_len)]
-
-            if new_comments:
-                packit_comments = [
-                    comment.body for comment in new_comments if comment.author == self.account_name
-                ]
-                if packit_comments:
-                    comment_text = packit_comments[0]
-                    self.failure_msg += (
-                        f"New comment from packit-service while submitting Koji build: "
-                        f"{comment_text}\n"
-                    )
+            # Check for new error comments from packit-service
+            error_comment = await self.forge_call(self._check_for_error_comment)
+            if error_comment:
+                self.failure_msg += (
+                    f"New comment from packit-service while submitting Koji build: "
+                    f"{error_comment}\n"
+                )
 
-            await asyncio.sleep(120)
+            await schedule.wait()
 
+    @traced("check_build")
     async def check_build(self, build_id):
         """
         Check whether the Koji task completed successfully.
@@ -613,6 +561,7 @@ class PagureTestcase(Testcase):
 
         koji_session = koji()
 
+        schedule = self.polling_schedule(PollingPhase.build, koji_task_key(task_id))
         while True:
             if datetime.now(tz=timezone.utc) > watch_end:
                 self.failure_msg += (
@@ -620,7 +569,7 @@ class PagureTestcase(Testcase):
                 )
                 return
 
-            task_info = koji_session.getTaskInfo(task_id)
+            task_info = await koji_call(koji_session.getTaskInfo, task_id)
             task_state = task_info.get("state")
 
             # Koji task states:
@@ -632,9 +581,11 @@ class PagureTestcase(Testcase):
             # 5 = FAILED
 
             if task_state == state_reported:
-                await asyncio.sleep(self.POLLING_INTERVAL * 60)
+                await schedule.wait()
                 continue
 
+            if state_reported is not None:
+                schedule.changed()
             state_reported = task_state
             state_names = {
                 KOJI_TASK_FREE: "FREE",
@@ -650,6 +601,8 @@ class PagureTestcase(Testcase):
                 state_names.get(task_state, task_state),
             )
 
+            if task_state in [KOJI_TASK_COMPLETED, KOJI_TASK_CANCELED, KOJI_TASK_FAILED]:
+                self.latency.record(LatencyPhase.build_finished)
             if task_state == KOJI_TASK_COMPLETED:
                 # Task completed successfully
                 logging.info("Koji task %s completed successfully", task_id)
@@ -662,10 +615,11 @@ class PagureTestcase(Testcase):
                     state_names.get(task_state, task_state),
                 )
                 state = state_names.get(task_state, task_state)
+                self._build_failed = True
                 self.failure_msg += f"The Koji task was not successful. Koji state: {state}.\n"
                 return
 
-            await asyncio.sleep(self.POLLING_INTERVAL * 60)
+            await schedule.wait()
 
     def get_package_name(self) -> str:
         """
@@ -678,57 +632,69 @@ class PagureTestcase(Testcase):
         Get Koji build task associated with this PR's commit.
         Scratch builds are tasks, not builds, so we query listTasks() instead of listBuilds().
         We match tasks by commit hash in the source URL, not by package name.
+        Only the tasks created after the trigger and not inspected by the previous
+        calls are fetched. The errors of Koji are raised to the caller.
         """
-        koji_session = koji()
+        if not self._koji_task_cursor:
+            self._koji_task_cursor = KojiTaskCursor(
+                since=(self._build_triggered_at or datetime.now(tz=timezone.utc)) - self.CLOCK_SKEW,
+            )
 
+        # Query the build tasks created since the previous poll
+        # Method 'build' is the standard build task type
+        cursor = self._koji_task_cursor
+        position = cursor.created_after, cursor.last_task_id
+        tasks = cursor.fetch_new_tasks(
+            koji(),
+            {
+                "method": "build",
+                "decode": True,
+                "state": [
+                    KOJI_TASK_FREE,
+                    KOJI_TASK_OPEN,
+                    KOJI_TASK_COMPLETED,
+                    KOJI_TASK_CANCELED,
+                    KOJI_TASK_ASSIGNED,
+                ],
+            },
+        )
+
+        # The decoded request is usually part of the listing already,
+        # the rest is fetched in one multicall (and cached for the next polls)
+        for task in tasks:
+            if task.get("request"):
+                cache_koji_task_request(task["id"], task["request"])
         try:
-            # Query recent build tasks for this package
-            # Method 'build' is the standard build task type
-            tasks = koji_session.listTasks(
-                opts={
-                    "method": "build",
-                    "decode": True,
-                    "state": [
-                        KOJI_TASK_FREE,
-                        KOJI_TASK_OPEN,
-                        KOJI_TASK_COMPLETED,
-                        KOJI_TASK_CANCELED,
-                        KOJI_TASK_ASSIGNED,
-                    ],
-                },
-                queryOpts={"limit": 20, "order": "-id"},
-            )
+            requests = get_koji_task_requests([task["id"] for task in tasks])
+        except Exception:
+            # Inspect the tasks again on the next poll
+            cursor.created_after, cursor.last_task_id = position
+            raise
 
-            # Filter tasks that match our commit
-            for task in tasks:
-                if self.is_task_for_pr(task):
-                    return task
+        # Filter tasks that match our commit
+        for task in tasks:
+            if self.is_task_for_pr(task, requests.get(task["id"])):
+                return task
 
-            return None
-        except Exception as e:
-            logging.warning("Error fetching Koji tasks: %s", e)
-            return None
+        return None
 
-    def is_task_for_pr(self, task: dict) -> bool:
+    def is_task_for_pr(self, task: dict, request: list | None) -> bool:
         """
         Check if a Koji task is associated with this PR's commit.
         The task request contains the git URL with the commit hash.
+
+        Args:
+            task: Koji task.
+            request: Request of the task.
         """
-        try:
-            koji_session = koji()
-            # Get the task request which contains the source URL
-            request = koji_session.getTaskRequest(task["id"])
-
-            # Request format: [source_url, target, opts]
-            # Example: ['git+https://src.fedoraproject.org/forks/...', 'rawhide', {...}]
-            if request and len(request) > 0:
-                source_url = request[0]
-                # Check if our commit hash is in the source URL
-                # The commit hash uniquely identifies our build
-                if self.head_commit in source_url:
-                    logging.debug("Task %s matches commit %s", task["id"], self.head_commit)
-                    return True
-        except Exception as e:
-            logging.debug("Error checking task %s: %s", task.get("id"), e)
+        # Request format: [source_url, target, opts]
+        # Example: ['git+https://src.fedoraproject.org/forks/...', 'rawhide', {...}]
+        if request and len(request) > 0:
+            source_url = request[0]
+            # Check if our commit hash is in the source URL
+            # The commit hash uniquely identifies our build
+            if isinstance(source_url, str) and self.head_commit in source_url:
+                logging.debug("Task %s matches commit %s", task["id"], self.head_commit)
+                return True
 
         return False
@@ -3,92 +3,71 @@
 # SPDX-License-Identifier: MIT
 
 import asyncio
+import json
 import logging
+from typing import Optional
 
-from ogr.abstract import GitProject
+from ogr.abstract import GitProject, PRStatus, PullRequest
 
 from validation.deployment import DEPLOYMENT
-from validation.testcase.base import TestFailureError
+from validation.testcase.base import TestAbortedError, Testcase, TestFailureError
+from validation.utils.async_http import AsyncHttpClient
+from validation.utils.conditional_cache import conditional_cache
+from validation.utils.copr_monitor import copr_monitor
+from validation.utils.events import get_event_hub
+from validation.utils.executor import run_blocking
+from validation.utils.health import health_monitor
+from validation.utils.history import SuiteRecord, TestRecord, run_history
+from validation.utils.latency import LatencyPhase, TestLatency, latency_summary
+from validation.utils.metrics import metrics
+from validation.utils.pr_index import TEST_PR_TITLE_PREFIX, opened_pr_title, test_pr_index
+from validation.utils.rate_limit import RateLimitBudget, RateLimitState, rate_limit_budget
+from validation.utils.status_poller import StatusPoller
+from validation.utils.tracing import annotate, traced
 from validation.utils.trigger import Trigger
+from validation.utils.trigger_scheduler import (
+    TriggerLimits,
+    TriggerScheduler,
+    get_trigger_scheduler,
+)
 
 
 class Tests:
     project: GitProject
     test_case_kls: type
+    # Async-native client for polling the forge, set by subclasses if enabled
+    http_client: Optional[AsyncHttpClient] = None
+    # Poller fetching the statuses for all the test cases of the suite, created in run()
+    status_poller: Optional[StatusPoller] = None
     # Minimum required API rate limit - can be overridden in subclasses
     min_required_rate_limit: int = 100
-    # Stagger delay in seconds between tests - can be overridden in subclasses
-    test_stagger_seconds: int = 0
-    # Threshold for displaying delay in minutes vs seconds
-    SECONDS_PER_MINUTE: int = 60
+    # Limits of the triggers on the forge host - can be overridden in subclasses
+    # or per instance
+    trigger_limits: TriggerLimits = TriggerLimits(per_minute=2, burst=5)
+
+    def __init__(self):
+        # Phase latencies of the tests of the last run()
+        self.latencies: list[TestLatency] = []
+
+    @property
+    def rate_limit(self) -> RateLimitBudget:
+        """
+        Live API rate limit budget of the forge, shared by all the clients of its host.
+        """
+        return rate_limit_budget(self.project.service.hostname)
 
     async def check_rate_limit(self) -> None:
         """
         Check API rate limit before running tests.
-        If quota is insufficient, wait proportionally and retry.
+        Waits for the reset of the rate limit only if the budget is short.
         """
-        max_retries = 3
-        retry_count = 0
-
-        while retry_count < max_retries:
+        if self.rate_limit.remaining is None:
             try:
-                # Use OGR's built-in rate limit checking
-                remaining = self.project.service.get_rate_limit_remaining()
-
-                if remaining is None:
-                    # Rate limit info not available (e.g., Pagure), skip the check
-                    logging.debug(
-                        "Rate limit information not available for %s, skipping check",
-                        self.project.service.instance_url,
-                    )
-                    return
-
-                logging.info(
-                    "API rate limit for %s: %d requests remaining",
-                    self.project.service.instance_url,
-                    remaining,
+                # The response feeds the budget too, unless the client hides its headers
+                remaining = await run_blocking(
+                    self.project.service.hostname,
+                    self.project.service.get_rate_limit_remaining,
                 )
-
-                if remaining < self.min_required_rate_limit:
-                    # Calculate deficit and wait proportionally
-                    deficit = self.min_required_rate_limit - remaining
-                    # Wait time: roughly 1 second per missing request, with a minimum of 60s
-                    # and maximum of 3600s (1 hour)
-                    wait_seconds = max(60, min(deficit, 3600))
-
-                    retry_count += 1
-                    if retry_count >= max_retries:
-                        logging.warning(
-                            "Insufficient API quota for %s after %d retries: "
-                            "%d remaining (need %d). Proceeding anyway.",
-                            self.project.service.instance_url,
-                            max_retries,
-                            remaining,
-                            self.min_required_rate_limit,
-                        )
-                        return
-
-                    from datetime import datetime, timedelta, timezone
-
-                    resume_time = datetime.now(tz=timezone.utc) + timedelta(seconds=wait_seconds)
-                    logging.warning(
-                        "Insufficient API quota for %s: %d remaining (need %d). "
-                        "Waiting %d seconds until %s (retry %d/%d)",
-                        self.project.service.instance_url,
-                        remaining,
-                        self.min_required_rate_limit,
-                        wait_seconds,
-                        resume_time.strftime("%H:%M:%S UTC"),
-                        retry_count,
-                        max_retries,
-                    )
-                    await asyncio.sleep(wait_seconds)
-                    logging.info("Retrying rate limit check...")
-                    continue  # Retry the check
-
-                # Sufficient quota, proceed
-                return
-
             except Exception as e:
                 # Log but don't fail on errors
                 logging.warning(
@@ -98,16 +77,151 @@ class Tests:
                 )
                 return
 
+            if remaining is None:
+                # Rate limit info not available (e.g., Pagure), skip the check
+                logging.debug(
+                    "Rate limit information not available for %s, skipping check",
+                    self.project.service.instance_url,
+                )
+                return
+
+            if self.rate_limit.remaining is None:
+                self.rate_limit.update(remaining)
+
+        logging.info(
+            "API rate limit for %s: %d requests remaining",
+            self.project.service.instance_url,
+            self.rate_limit.remaining,
+        )
+        await self.rate_limit.wait_for(self.min_required_rate_limit)
+
+    def prepare_clients(self):
+        """
+        Hook for subclasses to set up the forge clients before running the tests
+        (e.g. to feed the rate limit budget from their responses), called in the executor
+        of the forge since it can talk to the forge.
+        """
+
+    def create_status_poller(self) -> StatusPoller:
+        """
+        Create the status poller of the suite, subclasses can provide a batch fetcher.
+        """
+        return StatusPoller()
+
+    @property
+    def trigger_scheduler(self) -> TriggerScheduler:
+        """
+        Scheduler of the triggers on the forge host, shared by the suites of the host.
+        """
+        return get_trigger_scheduler(
+            self.project.service.hostname,
+            self.trigger_limits,
+            DEPLOYMENT.name,
+            DEPLOYMENT.trigger_limits,
+        )
+
+    def search_test_prs(self) -> Optional[list[PullRequest]]:
+        """
+        Hook for subclasses to find the open test PRs via a server-side search
+        of the forge (blocking).
+
+        Returns:
+            The test PRs or None if the forge can't search the PRs.
+        """
+        return None
+
+    def find_test_prs(self) -> list[PullRequest]:
+        """
+        Find the open test PRs of the project (blocking).
+
+        Uses the server-side search of the forge if available. Otherwise the known
+        test PRs from the persisted index are re-validated, and all the open PRs
+        are listed only when the project is not indexed yet, the index is stale or
+        the PR of the opened PR test might have been left open without being indexed.
+        """
+        index = test_pr_index()
+        project_key = self.project.get_web_url()
+        opened_title = opened_pr_title(DEPLOYMENT.name)
+
+        def opened_pr_closed(prs: list[PullRequest]) -> bool:
+            return not any(pr.title == opened_title for pr in prs)
+
+        try:
+            prs = self.search_test_prs()
+        except Exception as e:
+            logging.warning("Failed to search the test PRs of %s: %s", project_key, e)
+            prs = None
+        if prs is not None:
+            logging.debug("Found %d test PRs via search in %s", len(prs), project_key)
+            index.store(project_key, [pr.id for pr in prs], opened_pr_closed=opened_pr_closed(prs))
+            return prs
+
+        indexed = index.get(project_key)
+        if indexed:
+            logging.debug(
+                "Re-validating %d indexed test PRs of %s",
+                len(indexed.pr_ids),
+                project_key,
+            )
+            prs = []
+            for pr_id in indexed.pr_ids:
+                try:
+                    pr = self.project.get_pr(pr_id)
+                except Exception as e:
+                    logging.debug("Dropping test PR #%s from the index: %s", pr_id, e)
+                    continue
+                if pr.status == PRStatus.open and pr.title.startswith(TEST_PR_TITLE_PREFIX):
+                    prs.append(pr)
+            # Unless the test closed it, a PR of the opened PR test missing from the index
+            # could have been left open by a failed run, don't trust the index then
+            if indexed.opened_pr_closed or not opened_pr_closed(prs):
+                index.store(
+                    project_key,
+                    [pr.id for pr in prs],
+                    indexed_at=indexed.indexed_at,
+                    opened_pr_closed=opened_pr_closed(prs),
+                )
+                return prs
+            logging.debug("The PR of the opened PR test of %s is not indexed", project_key)
+
+        logging.debug("Listing all the open PRs of %s to index the test PRs", project_key)
+        prs = [pr for pr in self.project.get_pr_list() if pr.title.startswith(TEST_PR_TITLE_PREFIX)]
+        index.store(project_key, [pr.id for pr in prs], opened_pr_closed=opened_pr_closed(prs))
+        return prs
+
+    def create_testcase(self, **kwargs) -> Testcase:
+        """
+        Create a test case of the suite, sharing the suite-wide clients.
+        """
+        return self.test_case_kls(
+            project=self.project,
+            deployment=DEPLOYMENT,
+            http_client=self.http_client,
+            status_poller=self.status_poller,
+            event_hub=get_event_hub(),
+            copr_monitor=copr_monitor(),
+            rate_limit=self.rate_limit,
+            trigger_scheduler=self.trigger_scheduler,
+            health_monitor=health_monitor(),
+            **kwargs,
+        )
+
+    @traced("suite")
     async def run(self):
+        annotate(instance_url=self.project.service.instance_url)
+        await run_blocking(self.project.service.hostname, self.prepare_clients)
         # Check rate limit before starting tests
         await self.check_rate_limit()
+        rate_limit_at_start = self.rate_limit.state
         logging.info("Starting validation tests for %s", self.project.service.instance_url)
-        logging.debug("Fetching PR list from %s/%s", self.project.namespace, self.project.repo)
-        tasks = []
+        logging.debug("Finding test PRs in %s/%s", self.project.namespace, self.project.repo)
+        testcases = []
         test_metadata = []  # Track test details for summary
 
-        # Fetch PR list once and cache it
-        all_prs = list(self.project.get_pr_list())
+        self.status_poller = self.create_status_poller()
+
+        # Find the test PRs once and cache them
+        all_prs = await run_blocking(self.project.service.hostname, self.find_test_prs)
 
         # Run non-comment tests first (these don't trigger abuse detection)
         # 1. New PR test (creates PR via API, no comment)
@@ -117,13 +231,7 @@ class Tests:
         )
         logging.info(msg)
         try:
-            tasks.append(
-                self.test_case_kls(
-                    project=self.project,
-                    deployment=DEPLOYMENT,
-                    existing_prs=all_prs,
-                ).run_test(),
-            )
+            testcases.append(self.create_testcase(existing_prs=all_prs))
             test_metadata.append(
                 {
                     "type": "new_pr",
@@ -147,14 +255,7 @@ class Tests:
                 f"for {self.project.service.instance_url}"
             )
             logging.warning(msg)
-            tasks.append(
-                self.test_case_kls(
-                    project=self.project,
-                    pr=pr_for_push[0],
-                    trigger=Trigger.push,
-                    deployment=DEPLOYMENT,
-                ).run_test(),
-            )
+            testcases.append(self.create_testcase(pr=pr_for_push[0], trigger=Trigger.push))
             test_metadata.append(
                 {
                     "type": "push",
@@ -189,14 +290,12 @@ class Tests:
             )
 
             for pr, comment in all_comment_prs:
-                tasks.append(
-                    self.test_case_kls(
-                        project=self.project,
+                testcases.append(
+                    self.create_testcase(
                         pr=pr,
                         trigger=Trigger.comment,
-                        deployment=DEPLOYMENT,
                         comment=comment,
-                    ).run_test(),
+                    ),
                 )
                 test_metadata.append(
                     {
@@ -214,28 +313,16 @@ class Tests:
 
         logging.info(
             "Created %d test tasks for %s",
-            len(tasks),
+            len(testcases),
             self.project.service.instance_url,
         )
 
-        # Run tests with staggered starts to avoid API rate limiting
-        # Stagger delay is configurable per service (test_stagger_seconds)
-        async def run_with_delay(task, delay):
-            if delay > 0:
-                if delay >= self.SECONDS_PER_MINUTE:
-                    minutes = delay // self.SECONDS_PER_MINUTE
-                    logging.info("Waiting %d minutes before starting next test...", minutes)
-                else:
-                    logging.info("Waiting %d seconds before starting next test...", delay)
-            await asyncio.sleep(delay)
-            return await task
-
-        staggered_tasks = [
-            run_with_delay(task, i * self.test_stagger_seconds) for i, task in enumerate(tasks)
-        ]
+        # Each test triggers packit-service as soon as a trigger slot of the host
+        # and the deployment is free, to avoid API rate limiting and overloading packit-service
+        tasks = [testcase.run_test() for testcase in testcases]
 
         # Wait for all tasks to complete
-        results = await asyncio.gather(*staggered_tasks, return_exceptions=True)
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
         # Count successful and failed tests
         passed = sum(1 for r in results if r is True)
@@ -291,9 +378,21 @@ class Tests:
                 summary_lines.append(f"     Trigger: {failed_test['trigger']}")
                 summary_lines.append(f"     Reason: {failed_test['reason']}")
 
+        # Add the latencies of the reaction of packit-service if any phase was reached
+        self.latencies = [testcase.latency for testcase in testcases]
+        if latency_lines := latency_summary(self.latencies):
+            summary_lines.append("")
+            summary_lines.append("Phase latencies since the trigger:")
+            summary_lines.extend(latency_lines)
+
         summary_lines.append(separator)
 
         logging.log(log_level, "\n".join(summary_lines))
+        logging.info(
+            "Phase latencies for %s: %s",
+            self.project.service.instance_url,
+            json.dumps([latency.as_dict() for latency in self.latencies]),
+        )
 
         # Log detailed exceptions separately
         for i, result in enumerate(results):
@@ -305,3 +404,95 @@ class Tests:
                     pr_info,
                     exc_info=result,
                 )
+
+        self.record_metrics(testcases, results)
+        await run_blocking(
+            self.project.service.hostname,
+            self.record_history,
+            testcases,
+            results,
+            test_metadata,
+            rate_limit_at_start,
+        )
+
+    def record_metrics(self, testcases: list[Testcase], results: list):
+        """
+        Record the results and the phase latencies of the tests to the metrics of the run.
+        """
+        registry = metrics()
+        tests = registry.counter(
+            "validation_tests_total",
+            "Finished validation tests by the result.",
+            ("forge", "trigger", "result"),
+        )
+        latencies = registry.histogram(
+            "validation_phase_latency_seconds",
+            "Time from the trigger of a test to a phase of the reaction of packit-service.",
+            ("forge", "trigger", "phase"),
+        )
+        forge = self.project.service.hostname
+        for testcase, result in zip(testcases, results):
+            if result is True:
+                outcome = "passed"
+            elif isinstance(result, TestAbortedError):
+                outcome = "aborted"
+            else:
+                outcome = "failed"
+            tests.inc(forge=forge, trigger=testcase.trigger.value, result=outcome)
+            for phase in LatencyPhase:
+                if (seconds := testcase.latency.seconds(phase)) is not None:
+                    latencies.observe(
+                        seconds,
+                        forge=forge,
+                        trigger=testcase.trigger.value,
+                        phase=phase.value,
+                    )
+
+    def record_history(
+        self,
+        testcases: list[Testcase],
+        results: list,
+        test_metadata: list[dict],
+        rate_limit_at_start: Optional[RateLimitState],
+    ):
+        """
+        Record the results of the suite to the run history.
+        """
+        tests = []
+        for testcase, result, metadata in zip(testcases, results, test_metadata):
+            if isinstance(result, Exception):
+                reason = str(result)
+            elif result is False:
+                reason = testcase.failure_msg or None
+            else:
+                reason = None
+            tests.append(
+                TestRecord(
+                    latency=testcase.latency,
+                    passed=result is True,
+                    pr_url=testcase.pr.url if testcase.pr else metadata.get("pr_url"),
+                    pr_title=metadata.get("pr_title"),
+                    reason=reason,
+                ),
+            )
+
+        # Requests used of the rate limit, unless it has been reset meanwhile
+        api_requests = None
+        rate_limit_at_end = self.rate_limit.state
+        if (
+            rate_limit_at_start
+            and rate_limit_at_end
+            and rate_limit_at_start.reset_at == rate_limit_at_end.reset_at
+        ):
+            api_requests = rate_limit_at_start.remaining - rate_limit_at_end.remaining
+
+        cache = conditional_cache(self.project.service.hostname)
+        run_history().record_suite(
+            SuiteRecord(
+                instance_url=self.project.service.instance_url,
+                tests=tests,
+                api_requests=api_requests,
+                cache_hits=cache.hits,
+                cache_misses=cache.misses,
+            ),
+        )
@@ -3,11 +3,77 @@
 # SPDX-License-Identifier: MIT
 
 from os import getenv
+from typing import Callable, Optional
 
+from github import GithubException
+from github.PullRequest import PullRequest as PyGithubPullRequest
 from ogr import GithubService
+from ogr.abstract import PullRequest
+from ogr.services.github.check_run import GithubCheckRun, GithubCheckRunStatus
+from ogr.services.github.pull_request import GithubPullRequest
+from requests.structures import CaseInsensitiveDict
 
-from validation.testcase.github import GithubTestcase
+from validation.testcase.github import GithubTestcase, check_run_from_raw
 from validation.tests.base import Tests
+from validation.utils.async_http import get_async_http_client
+from validation.utils.conditional_cache import HTTP_BAD_REQUEST
+from validation.utils.executor import run_blocking
+from validation.utils.metrics import counted_call
+from validation.utils.pr_index import TEST_PR_TITLE_PREFIX
+from validation.utils.rate_limit import RateLimitBudget
+from validation.utils.status_poller import StatusPoller
+from validation.utils.tracing import client_span
+from validation.utils.trigger_scheduler import TriggerLimits
+
+# Check runs of all the watched commits in one request,
+# each commit is queried as an aliased object (c0, c1, ...)
+CHECK_RUNS_QUERY_FRAGMENT = """
+fragment CommitCheckRuns on Commit {
+  checkSuites(first: 50) {
+    nodes {
+      app { name }
+      checkRuns(first: 100) {
+        nodes { databaseId name status conclusion startedAt completedAt detailsUrl }
+      }
+    }
+  }
+}
+"""
+
+# Open test PRs with everything the tests need, so that the PRs
+# don't have to be fetched one by one via the REST API
+TEST_PRS_QUERY = """
+query($query: String!, $cursor: String) {
+  search(query: $query, type: ISSUE, first: 100, after: $cursor) {
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on PullRequest { number title url body state headRefName headRefOid baseRefName }
+    }
+  }
+}
+"""
+
+# GraphQL has more check run states than the REST API (and ogr),
+# these are all waiting for being picked up
+CHECK_RUN_QUEUED_STATES = ("waiting", "pending", "requested")
+
+HTTP_NOT_FOUND = 404
+
+
+class _PyGithubRateLimitHook:
+    """
+    Wraps the per-response hook of the PyGithub requester, the only place
+    where the headers of all its responses are available.
+    """
+
+    def __init__(self, on_response: Callable[[int, dict, str], None], budget: RateLimitBudget):
+        self.on_response = on_response
+        self.budget = budget
+
+    def __call__(self, status: int, headers: dict, data: str):
+        self.on_response(status, headers, data)
+        # PyGithub lowercases the names of the headers
+        self.budget.update_from_headers(CaseInsensitiveDict(headers))
 
 
 class GithubTests(Tests):
@@ -16,8 +82,170 @@ class GithubTests(Tests):
     # So require at least sufficient quota
     min_required_rate_limit = 1200
     # Space out tests to avoid hitting rate limits and reduce load on packit-service
-    test_stagger_seconds = 180
+    trigger_limits = TriggerLimits(per_minute=1, burst=3, max_concurrent=10)
 
     def __init__(self):
+        super().__init__()
         github_service = GithubService(token=getenv("GITHUB_TOKEN"))
         self.project = github_service.get_project(repo="hello-world", namespace="packit")
+        self.http_client = get_async_http_client(
+            "https://api.github.com",
+            headers={
+                "Authorization": f"token {getenv('GITHUB_TOKEN')}",
+                "Accept": "application/vnd.github+json",
+            },
+            rate_limit=self.rate_limit,
+        )
+
+    def prepare_clients(self):
+        # PyGithub keeps the rate limit of the last response only, whichever API
+        # (search, GraphQL) it was from, so pass the headers of all its responses
+        # to the budget, which takes just the ones of the core API
+        requester = self.project.github_instance.requester
+        if not isinstance(requester.DEBUG_ON_RESPONSE, _PyGithubRateLimitHook):
+            requester.DEBUG_ON_RESPONSE = _PyGithubRateLimitHook(
+                requester.DEBUG_ON_RESPONSE,
+                self.rate_limit,
+            )
+
+    def search_test_prs(self) -> Optional[list[PullRequest]]:
+        variables = {
+            "query": f"repo:{self.project.namespace}/{self.project.repo} is:pr is:open "
+            f'in:title "{TEST_PR_TITLE_PREFIX}"',
+            "cursor": None,
+        }
+        host = self.project.service.hostname
+        prs = []
+        while True:
+            with counted_call(host), client_span(host, "graphql_query"):
+                _, response = self.project.github_instance.requester.graphql_query(
+                    TEST_PRS_QUERY,
+                    variables,
+                )
+            search = response["data"]["search"]
+            # The search is fuzzy, the titles are checked for the prefix afterwards
+            prs.extend(
+                self._pull_request_from_graphql(node)
+                for node in search["nodes"]
+                if node and node["title"].startswith(TEST_PR_TITLE_PREFIX)
+            )
+            if not search["pageInfo"]["hasNextPage"]:
+                return prs
+            variables["cursor"] = search["pageInfo"]["endCursor"]
+
+    def _pull_request_from_graphql(self, node: dict) -> GithubPullRequest:
+        """
+        Create the ogr PR from the search result, the PyGithub object is only
+        partially initialized and fetches the rest of the PR only when some other
+        attribute is accessed.
+        """
+        requester = self.project.github_instance.requester
+        raw_pr = PyGithubPullRequest(
+            requester,
+            attributes={
+                "url": f"{requester.base_url}/repos/{self.project.namespace}/"
+                f"{self.project.repo}/pulls/{node['number']}",
+                "number": node["number"],
+                "title": node["title"],
+                "html_url": node["url"],
+                "body": node["body"],
+                "state": node["state"].lower(),
+                "head": {"ref": node["headRefName"], "sha": node["headRefOid"]},
+                "base": {"ref": node["baseRefName"]},
+            },
+            completed=False,
+        )
+        return GithubPullRequest(raw_pr, self.project)
+
+    def create_status_poller(self) -> StatusPoller:
+        return StatusPoller(batch_fetch=self.fetch_check_runs)
+
+    async def fetch_check_runs(self, commits: list[str]) -> dict[str, list[GithubCheckRun]]:
+        """
+        Fetch the check runs of all the commits with a single GraphQL query.
+
+        Args:
+            commits: SHAs of the commits.
+
+        Returns:
+            Check runs for each of the commits.
+        """
+        variables = {"owner": self.project.namespace, "name": self.project.repo}
+        variable_definitions = ["$owner: String!", "$name: String!"]
+        objects = []
+        for i, commit in enumerate(commits):
+            variables[f"oid{i}"] = commit
+            variable_definitions.append(f"$oid{i}: GitObjectID!")
+            objects.append(f"c{i}: object(oid: $oid{i}) {{ ...CommitCheckRuns }}")
+
+        query = (
+            f"query({', '.join(variable_definitions)}) {{\n"
+            "  repository(owner: $owner, name: $name) {\n"
+            f"    {' '.join(objects)}\n"
+            "  }\n"
+            "}\n"
+            f"{CHECK_RUNS_QUERY_FRAGMENT}"
+        )
+
+        if self.http_client:
+            response = await self.http_client.post_json(
+                "graphql",
+                {"query": query, "variables": variables},
+            )
+        else:
+            host = self.project.service.hostname
+            with counted_call(host), client_span(host, "graphql_query"):
+                _, response = await run_blocking(
+                    self.project.service.hostname,
+                    self.project.github_instance.requester.graphql_query,
+                    query,
+                    variables,
+                )
+
+        # The errors are raised by PyGithub already, the async client returns them
+        if errors := response.get("errors"):
+            messages = "; ".join(error.get("message", str(error)) for error in errors)
+            raise GithubException(
+                HTTP_BAD_REQUEST,
+                response,
+                message=f"GraphQL query of the check runs failed: {messages}",
+            )
+        repository = (response.get("data") or {}).get("repository")
+        if repository is None:
+            raise GithubException(
+                HTTP_NOT_FOUND,
+                response,
+                message=f"Repository {self.project.full_repo_name} not found via GraphQL",
+            )
+        return {
+            commit: self._check_runs_from_graphql(repository.get(f"c{i}"))
+            for i, commit in enumerate(commits)
+        }
+
+    def _check_runs_from_graphql(self, commit_data: dict | None) -> list[GithubCheckRun]:
+        if not commit_data:
+            return []
+
+        check_runs = []
+        for check_suite in commit_data["checkSuites"]["nodes"]:
+            for check_run in check_suite["checkRuns"]["nodes"]:
+                status = check_run["status"].lower()
+                if status in CHECK_RUN_QUEUED_STATES:
+                    status = GithubCheckRunStatus.queued.value
+                conclusion = check_run["conclusion"]
+                if conclusion == "STARTUP_FAILURE":
+                    conclusion = "FAILURE"
+                # Use the shape of the REST API response, so that the check runs
+                # are the same objects as the ones from ogr
+                raw_check_run = {
+                    "id": check_run["databaseId"],
+                    "name": check_run["name"],
+                    "status": status,
+                    "conclusion": conclusion.lower() if conclusion else None,
+                    "started_at": check_run["startedAt"],
+                    "completed_at": check_run["completedAt"],
+                    "details_url": check_run["detailsUrl"],
+                    "app": check_suite["app"],
+                }
+                check_runs.append(check_run_from_raw(self.project, raw_check_run))
+        return check_runs
@@ -3,12 +3,19 @@
 # SPDX-License-Identifier: MIT
 
 from os import getenv
+from typing import Optional
 
 from ogr import GitlabService
-from ogr.services.gitlab import GitlabProject
+from ogr.abstract import PullRequest
+from ogr.services.gitlab import GitlabProject, GitlabPullRequest
 
 from validation.testcase.gitlab import GitlabTestcase
 from validation.tests.base import Tests
+from validation.utils.async_http import get_async_http_client
+from validation.utils.conditional_cache import conditional_cache, install_conditional_cache
+from validation.utils.pr_index import TEST_PR_TITLE_PREFIX
+from validation.utils.rate_limit import install_rate_limit_tracking
+from validation.utils.trigger_scheduler import TriggerLimits
 
 
 class GitlabTests(Tests):
@@ -17,18 +24,49 @@ class GitlabTests(Tests):
     # (new PR, push trigger, comment tests)
     # GitLab has more generous limits than GitHub (2000/min vs 5000/hour)
     min_required_rate_limit = 250
-    # Stagger tests to avoid overloading packit-service instances
+    # Space out tests to avoid overloading packit-service instances
     # when multiple events arrive simultaneously for the same project
-    test_stagger_seconds = 180
+    trigger_limits = TriggerLimits(per_minute=1, burst=2, max_concurrent=4)
 
     def __init__(
         self,
         instance_url="https://gitlab.com",
         namespace="packit-service",
         token_name="GITLAB_TOKEN",
+        trigger_limits: Optional[TriggerLimits] = None,
     ):
+        super().__init__()
+        if trigger_limits:
+            self.trigger_limits = trigger_limits
         gitlab_service = GitlabService(token=getenv(token_name), instance_url=instance_url)
         self.project: GitlabProject = gitlab_service.get_project(
             repo="hello-world",
             namespace=namespace,
         )
+        self.http_client = get_async_http_client(
+            f"{instance_url.rstrip('/')}/api/v4",
+            headers={"PRIVATE-TOKEN": getenv(token_name)},
+            rate_limit=self.rate_limit,
+        )
+
+    def prepare_clients(self):
+        # Make the polls of statuses and comments conditional (ETag/Last-Modified)
+        install_conditional_cache(
+            self.project.service.gitlab_instance.session,
+            conditional_cache(self.project.service.hostname),
+        )
+        install_rate_limit_tracking(self.project.service.gitlab_instance.session, self.rate_limit)
+
+    def search_test_prs(self) -> Optional[list[PullRequest]]:
+        # The search matches the words anywhere in the title, check the prefix afterwards
+        mrs = self.project.gitlab_repo.mergerequests.list(
+            state="opened",
+            search=TEST_PR_TITLE_PREFIX,
+            get_all=True,
+            **{"in": "title"},
+        )
+        return [
+            GitlabPullRequest(mr, self.project)
+            for mr in mrs
+            if mr.title.startswith(TEST_PR_TITLE_PREFIX)
+        ]
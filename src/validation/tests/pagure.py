@@ -4,6 +4,7 @@
 
 import logging
 from os import getenv
+from typing import Optional
 
 from ogr import PagureService
 from ogr.services.pagure import PagureProject
@@ -11,6 +12,11 @@ from ogr.services.pagure import PagureProject
 from validation.helpers import KerberosError, destroy_kerberos_ticket, init_kerberos_ticket
 from validation.testcase.pagure import PagureTestcase
 from validation.tests.base import Tests
+from validation.utils.async_http import get_async_http_client
+from validation.utils.conditional_cache import conditional_cache, install_conditional_cache
+from validation.utils.rate_limit import install_rate_limit_tracking
+from validation.utils.tracing import traced
+from validation.utils.trigger_scheduler import TriggerLimits
 
 
 class PagureTests(Tests):
@@ -21,14 +27,32 @@ class PagureTests(Tests):
         instance_url="https://src.fedoraproject.org/",
         namespace="rpms",
         token_name="PAGURE_TOKEN",
+        trigger_limits: Optional[TriggerLimits] = None,
     ):
+        super().__init__()
+        if trigger_limits:
+            self.trigger_limits = trigger_limits
         pagure_service = PagureService(token=getenv(token_name), instance_url=instance_url)
         self.project: PagureProject = pagure_service.get_project(
             repo="python-requre",
             namespace=namespace,
         )
+        self.http_client = get_async_http_client(
+            f"{instance_url.rstrip('/')}/api/0",
+            headers={"Authorization": f"token {getenv(token_name)}"},
+            rate_limit=self.rate_limit,
+        )
         self._kerberos_principal = None
 
+    def prepare_clients(self):
+        # Make the polls of statuses and comments conditional (ETag/Last-Modified)
+        install_conditional_cache(
+            self.project.service.session,
+            conditional_cache(self.project.service.hostname),
+        )
+        install_rate_limit_tracking(self.project.service.session, self.rate_limit)
+
+    @traced("suite")
     async def run(self):
         """Override run to initialize Kerberos ticket before tests."""
         keytab_file = getenv("PAGURE_KEYTAB")
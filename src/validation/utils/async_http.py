@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+from os import getenv
+from typing import Any, Optional
+from urllib.parse import urlencode, urlparse
+
+from validation.utils.conditional_cache import (
+    HTTP_NOT_MODIFIED,
+    CachedResponse,
+    ConditionalRequestCache,
+)
+from validation.utils.metrics import counted_call
+from validation.utils.rate_limit import RateLimitBudget
+from validation.utils.tracing import client_span
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Set to a truthy value to poll the read-only endpoints via aiohttp instead of
+# running the synchronous clients in the thread pools
+ASYNC_HTTP_ENV = "VALIDATION_ASYNC_HTTP"
+
+
+def async_http_enabled() -> bool:
+    """
+    Check whether the async-native HTTP client path was requested and is available.
+    """
+    if getenv(ASYNC_HTTP_ENV, "").lower() not in ("1", "true", "yes"):
+        return False
+
+    if aiohttp is None:
+        logging.warning(
+            "%s is set, but aiohttp is not installed, falling back to the synchronous clients",
+            ASYNC_HTTP_ENV,
+        )
+        return False
+
+    return True
+
+
+class AsyncHttpClient:
+    """
+    Read-only HTTP client for polling a single service instance.
+
+    All the requests share one pooled aiohttp session which is created lazily
+    (it needs to be created inside the running event loop). GET requests are
+    conditional, unchanged responses are replayed from the cache.
+    """
+
+    TIMEOUT = 60  # seconds - total timeout of one request
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[dict[str, str]] = None,
+        max_connections: int = 10,
+        rate_limit: Optional[RateLimitBudget] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.host = urlparse(base_url).hostname
+        self.headers = headers or {}
+        self.max_connections = max_connections
+        # Budget of the service fed from the rate limit headers of the responses
+        self.rate_limit = rate_limit
+        self.cache = ConditionalRequestCache()
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def __repr__(self):
+        return f"AsyncHttpClient(base_url='{self.base_url}')"
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+                raise_for_status=True,
+            )
+        return self._session
+
+    async def get_json(self, path: str, params: Optional[dict[str, Any]] = None) -> Any:
+        """
+        Send a GET request and return the decoded JSON body, the request is
+        conditional if the response is cached.
+
+        Args:
+            path: Path relative to the base URL of the instance.
+            params: Query parameters.
+
+        Returns:
+            Decoded JSON response.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        key = f"{url}?{urlencode(params)}" if params else url
+        with counted_call(self.host), client_span(self.host, f"GET /{path.lstrip('/')}"):
+            headers = self.cache.conditional_headers(key)
+            while True:
+                async with self._get_session().get(
+                    url,
+                    params=params,
+                    headers=headers,
+                ) as response:
+                    self._track_rate_limit(response)
+                    if response.status != HTTP_NOT_MODIFIED or not headers:
+                        return await self._store_json(key, response)
+                    if entry := self.cache.get(key):
+                        self.cache.record(hit=True)
+                        return entry.data
+                logging.debug("Cached response of %s evicted, repeating the request", url)
+                headers = {}
+
+    async def _store_json(self, key: str, response: "aiohttp.ClientResponse") -> Any:
+        data = await response.json()
+        self.cache.record(hit=False)
+        self.cache.store(
+            key,
+            CachedResponse(
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                data=data,
+            ),
+        )
+        return data
+
+    async def post_json(self, path: str, data: Any) -> Any:
+        """
+        Send a POST request with JSON body (used only for read-only queries,
+        e.g. GraphQL) and return the decoded JSON body.
+
+        Args:
+            path: Path relative to the base URL of the instance.
+            data: Data to be sent as JSON.
+
+        Returns:
+            Decoded JSON response.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        with counted_call(self.host), client_span(self.host, f"POST /{path.lstrip('/')}"):
+            async with self._get_session().post(url, json=data) as response:
+                self._track_rate_limit(response)
+                return await response.json()
+
+    def _track_rate_limit(self, response: "aiohttp.ClientResponse"):
+        if self.rate_limit:
+            self.rate_limit.update_from_headers(response.headers)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_clients: dict[str, AsyncHttpClient] = {}
+
+
+def get_async_http_client(
+    base_url: str,
+    headers: Optional[dict[str, str]] = None,
+    rate_limit: Optional[RateLimitBudget] = None,
+) -> Optional[AsyncHttpClient]:
+    """
+    Get the shared async HTTP client for the given service instance.
+
+    Args:
+        base_url: Base URL of the API of the instance.
+        headers: Headers sent with every request (e.g. authentication).
+        rate_limit: Budget of the service to feed from the responses.
+
+    Returns:
+        The client, or None if the async-native path is disabled.
+    """
+    if not async_http_enabled():
+        return None
+
+    if base_url not in _clients:
+        logging.debug("Creating async HTTP client for %s", base_url)
+        _clients[base_url] = AsyncHttpClient(
+            base_url,
+            headers=headers,
+            rate_limit=rate_limit,
+        )
+    return _clients[base_url]
+
+
+async def close_async_http_clients():
+    """
+    Close the sessions of all the async HTTP clients.
+    """
+    for client in _clients.values():
+        await client.close()
+    _clients.clear()
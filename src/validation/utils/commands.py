@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_TIMEOUT = 300  # seconds - e.g. a slow SSH push to dist-git
+
+
+async def run_command(
+    args: list[str],
+    cwd: Optional[Path | str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    *,
+    check: bool = True,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command (git, fedpkg, ...) as a subprocess without blocking the event loop.
+
+    Args:
+        args: Command and its arguments.
+        cwd: Working directory.
+        timeout: Seconds after which the command is killed.
+        check: Whether to raise if the command fails.
+
+    Returns:
+        Completed process with the captured (text) output.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails and `check` is set.
+        subprocess.TimeoutExpired: If the command doesn't finish in time.
+    """
+    result = await _run(args, cwd, timeout)
+    if check:
+        result.check_returncode()
+    return result
+
+
+async def _run(
+    args: list[str],
+    cwd: Optional[Path | str],
+    timeout: float,
+) -> subprocess.CompletedProcess:
+    logging.debug("Running %s", " ".join(args))
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        stdout, stderr = await proc.communicate()
+        raise subprocess.TimeoutExpired(
+            args,
+            timeout,
+            output=stdout.decode(errors="replace"),
+            stderr=stderr.decode(errors="replace"),
+        ) from None
+
+    return subprocess.CompletedProcess(
+        args,
+        proc.returncode,
+        stdout=stdout.decode(errors="replace"),
+        stderr=stderr.decode(errors="replace"),
+    )
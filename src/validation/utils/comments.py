@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable
+
+
+@dataclass(frozen=True)
+class TrackedComment:
+    id: Any
+    author: str
+    body: str
+    created: datetime
+
+
+class CommentTracker:
+    """
+    Incremental view of the comments of a PR shared by all the checks of a test case.
+
+    Remembers the creation time of the newest seen comment, so that each update
+    fetches only the newer comments instead of re-listing all of them.
+    """
+
+    def __init__(
+        self,
+        fetch_since: Callable[[datetime], Iterable[TrackedComment]],
+        since: datetime,
+    ):
+        """
+        Args:
+            fetch_since: Function fetching the comments created at or after the given
+                time (blocking), it can return some older or already seen comments too.
+            since: Time of the oldest comment to track (e.g. the trigger time).
+        """
+        self._fetch_since = fetch_since
+        self.cursor = since
+        # All the tracked comments, oldest first
+        self.comments: list[TrackedComment] = []
+        self._seen_ids: set = set()
+        # Updated from the executor threads
+        self._lock = threading.Lock()
+
+    def update(self) -> list[TrackedComment]:
+        """
+        Fetch the comments created since the newest seen one (blocking).
+
+        Returns:
+            The new comments, oldest first.
+        """
+        with self._lock:
+            new_comments = sorted(
+                (
+                    comment
+                    for comment in self._fetch_since(self.cursor)
+                    if comment.id not in self._seen_ids and comment.created >= self.cursor
+                ),
+                key=lambda comment: comment.created,
+            )
+            if new_comments:
+                logging.debug("Found %d new comment(s)", len(new_comments))
+                self._seen_ids.update(comment.id for comment in new_comments)
+                self.comments.extend(new_comments)
+                self.cursor = new_comments[-1].created
+            return new_comments
+
+    def by_author(self, author: str) -> list[TrackedComment]:
+        """
+        Get the tracked comments of the author, oldest first.
+        """
+        return [comment for comment in self.comments if comment.author == author]
@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Optional
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+HTTP_OK = 200
+HTTP_NOT_MODIFIED = 304
+HTTP_BAD_REQUEST = 400
+
+# Headers describing the body of the response, these are kept from the cached
+# response when replaying it for a 304
+_BODY_HEADERS = ("content-length", "content-encoding", "content-type", "transfer-encoding")
+
+
+@dataclass
+class CachedResponse:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    # Decoded JSON body (for the clients we call directly)
+    data: Any = None
+    # Raw response (for replaying to clients using requests sessions)
+    content: bytes = b""
+    encoding: Optional[str] = None
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+class ConditionalRequestCache:
+    """
+    Cache of the responses of GET requests validated by ETag/Last-Modified headers.
+
+    The cached validators are sent as If-None-Match/If-Modified-Since and the cached
+    body is replayed when the server responds with 304 Not Modified. GitHub doesn't
+    count such responses against the rate limit.
+    """
+
+    MAX_ENTRIES = 1000
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        # Used from the executor threads
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+            return entry
+
+    def conditional_headers(self, key: str) -> dict[str, str]:
+        """
+        Get the headers making the request for the key conditional.
+        """
+        entry = self.get(key)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(self, key: str, entry: CachedResponse):
+        """
+        Store the response, if the server has provided some validator for it.
+        """
+        if not entry.etag and not entry.last_modified:
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, *, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+@lru_cache
+def conditional_cache(host: str) -> ConditionalRequestCache:
+    """
+    Get the conditional request cache shared by all the clients of the given host.
+    """
+    logging.debug("Creating conditional request cache for %s", host)
+    return ConditionalRequestCache()
+
+
+class ConditionalRequestAdapter(BaseAdapter):
+    """
+    Transport adapter making the GET requests of a requests session conditional.
+
+    Wraps the adapter originally mounted in the session (keeping its retries
+    and pool settings) and replays the cached response as 200 OK on 304,
+    so the client library doesn't notice the difference.
+    """
+
+    def __init__(self, adapter: BaseAdapter, cache: ConditionalRequestCache):
+        super().__init__()
+        self.adapter = adapter
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET":
+            return self.adapter.send(request, **kwargs)
+
+        key = request.url
+        added = []
+        for header, value in self.cache.conditional_headers(key).items():
+            if header not in request.headers:
+                request.headers[header] = value
+                added.append(header)
+
+        response = self.adapter.send(request, **kwargs)
+
+        if response.status_code == HTTP_NOT_MODIFIED and added:
+            # release the connection, there is no body to read
+            response.close()
+            if entry := self.cache.get(key):
+                self.cache.record(hit=True)
+                return self._replay(entry, response)
+
+            # The cached response was evicted meanwhile, there is nothing to replay
+            logging.debug("Cached response of %s evicted, repeating the request", key)
+            for header in added:
+                del request.headers[header]
+            response = self.adapter.send(request, **kwargs)
+
+        if response.status_code == HTTP_OK:
+            self.cache.record(hit=False)
+            self.cache.store(
+                key,
+                CachedResponse(
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                    content=response.content,
+                    encoding=response.encoding,
+                    headers=dict(response.headers),
+                ),
+            )
+        return response
+
+    @staticmethod
+    def _replay(entry: CachedResponse, not_modified: requests.Response) -> requests.Response:
+        response = requests.Response()
+        response.status_code = HTTP_OK
+        response.reason = "OK"
+        # Keep the fresh headers (e.g. rate limit) from the 304 response
+        response.headers = CaseInsensitiveDict(entry.headers)
+        response.headers.update(
+            {
+                header: value
+                for header, value in not_modified.headers.items()
+                if header.lower() not in _BODY_HEADERS
+            },
+        )
+        response._content = entry.content
+        response.encoding = entry.encoding
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.connection = getattr(not_modified, "connection", None)
+        response.elapsed = not_modified.elapsed
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+def install_conditional_cache(
+    session: requests.Session,
+    cache: ConditionalRequestCache,
+) -> ConditionalRequestCache:
+    """
+    Make the GET requests of the session conditional, using the given cache.
+
+    Args:
+        session: Session of the client library (e.g. python-gitlab, ogr Pagure).
+        cache: Cache to store the responses in.
+
+    Returns:
+        The cache.
+    """
+    for prefix in ("https://", "http://"):
+        adapter = session.get_adapter(prefix)
+        if isinstance(adapter, ConditionalRequestAdapter):
+            continue
+        session.mount(prefix, ConditionalRequestAdapter(adapter, cache))
+    return cache
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from munch import Munch
+
+from validation.helpers import get_newest_copr_builds
+from validation.utils.events import EventHub, copr_build_key, copr_project_key, get_event_hub
+
+
+@dataclass
+class _WatchedProject:
+    builds: list[Munch] = field(default_factory=list)
+    error: Optional[Exception] = None
+    last_access: float = 0
+    # Set once the builds of the project were fetched for the first time
+    fetched: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class CoprMonitor:
+    """
+    Run-wide monitor of the Copr projects (and their builds) watched by the test cases.
+
+    The newest builds of each watched project are listed once per cycle, no matter
+    how many test cases wait for it, and the states of its builds are taken from
+    the same listing, so there are no per-build requests. The waiting test cases are notified
+    via the event hub when a build appears or changes its state.
+    """
+
+    CYCLE_INTERVAL = 30  # seconds - time between the refreshes of the watched projects
+    IDLE_TIMEOUT = 300  # seconds - stop watching a project nobody has asked for since
+
+    def __init__(
+        self,
+        event_hub: Optional[EventHub] = None,
+        cycle_interval: float = CYCLE_INTERVAL,
+    ):
+        self.event_hub = event_hub
+        self.cycle_interval = cycle_interval
+        self.cycles = 0
+        self._projects: dict[tuple[str, str], _WatchedProject] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def get_builds(self, owner: str, project: str) -> list[Munch]:
+        """
+        Get the newest builds of the Copr project (newest first) as of the last cycle,
+        start watching the project if it's not watched yet.
+
+        Raises:
+            The exception of the last listing of the project, e.g. if it doesn't exist.
+        """
+        loop = asyncio.get_running_loop()
+        key = (owner, project)
+        watched = self._projects.get(key)
+        if watched is None:
+            logging.debug("Watching Copr project %s/%s", owner, project)
+            watched = self._projects[key] = _WatchedProject()
+            await self._refresh(key, watched)
+        watched.last_access = loop.time()
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+        await watched.fetched.wait()
+        if watched.error:
+            raise watched.error
+        return watched.builds
+
+    async def get_build(self, owner: str, project: str, build_id: int) -> Optional[Munch]:
+        """
+        Get the latest known state of the build of the Copr project.
+
+        Returns:
+            The build or None if it's not among the newest builds of the project.
+        """
+        for build in await self.get_builds(owner, project):
+            if build.id == build_id:
+                return build
+        return None
+
+    async def _refresh(self, key: tuple[str, str], watched: _WatchedProject):
+        owner, project = key
+        try:
+            builds = await get_newest_copr_builds(owner, project)
+        except Exception as e:
+            logging.debug("Failed to list Copr builds of %s/%s: %s", owner, project, e)
+            watched.error = e
+            watched.fetched.set()
+            return
+
+        previous_states = {build.id: build.state for build in watched.builds}
+        changed = [
+            copr_build_key(build.id)
+            for build in builds
+            if previous_states.get(build.id) != build.state
+        ]
+        if watched.fetched.is_set() and self.event_hub and changed:
+            if any(build.id not in previous_states for build in builds):
+                changed.append(copr_project_key(owner, project))
+            self.event_hub.publish(*changed)
+
+        watched.builds = builds
+        watched.error = None
+        watched.fetched.set()
+
+    async def _run(self):
+        while self._projects:
+            await asyncio.sleep(self.cycle_interval)
+
+            now = asyncio.get_running_loop().time()
+            for key, watched in list(self._projects.items()):
+                if now - watched.last_access > self.IDLE_TIMEOUT:
+                    logging.debug("Not watching Copr project %s/%s anymore", *key)
+                    del self._projects[key]
+
+            self.cycles += 1
+            await asyncio.gather(
+                *(self._refresh(key, watched) for key, watched in self._projects.items()),
+            )
+
+
+@lru_cache
+def copr_monitor() -> CoprMonitor:
+    """
+    Get the Copr monitor shared by all the suites of the run.
+    """
+    return CoprMonitor(event_hub=get_event_hub())
@@ -0,0 +1,291 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import contextlib
+import hashlib
+import hmac
+import json
+import logging
+import weakref
+from functools import lru_cache
+from os import getenv
+from typing import Any, Optional
+
+import requests
+
+# Port of the local HTTP receiver of the forge webhooks and message bus events,
+# the receiver is started only if it is set
+EVENTS_PORT_ENV = "VALIDATION_EVENTS_PORT"
+EVENTS_HOST_ENV = "VALIDATION_EVENTS_HOST"
+EVENTS_SECRET_ENV = "VALIDATION_EVENTS_SECRET"
+
+WEBHOOK_PATH = "/webhook"
+MESSAGE_BUS_PATH = "/bus"
+MAX_BODY_SIZE = 10 * 1024 * 1024  # bytes
+
+
+def commit_key(commit: str) -> str:
+    return f"commit:{commit}"
+
+
+def copr_project_key(owner: str, project: str) -> str:
+    return f"copr-project:{owner}/{project}"
+
+
+def copr_build_key(build_id: Any) -> str:
+    return f"copr-build:{build_id}"
+
+
+def koji_task_key(task_id: Any = None) -> str:
+    """
+    Key of the events of the Koji task, or of any Koji build task if no ID is given.
+    """
+    return f"koji-task:{task_id}" if task_id is not None else "koji-task"
+
+
+class EventHub:
+    """
+    In-process hub delivering the events (received webhooks/messages or changes
+    noticed by the run-wide monitors) to the waiting test cases.
+
+    The test cases subscribe with the keys of the things they poll (commits,
+    Copr builds, Koji tasks) and get an asyncio.Event that is set whenever
+    a matching event is published; the polling wait points wake up on it.
+    """
+
+    def __init__(self):
+        self.published = 0
+        self._subscriptions: dict[str, weakref.WeakSet[asyncio.Event]] = {}
+
+    def subscribe(self, *keys: str) -> asyncio.Event:
+        """
+        Subscribe to the events with any of the given keys.
+
+        The subscription lasts as long as the returned event is referenced.
+        """
+        wakeup = asyncio.Event()
+        for key in keys:
+            self._subscriptions.setdefault(key, weakref.WeakSet()).add(wakeup)
+        return wakeup
+
+    def publish(self, *keys: str):
+        self.published += 1
+        for key in keys:
+            logging.debug("Event %s", key)
+            for wakeup in list(self._subscriptions.get(key, ())):
+                wakeup.set()
+
+
+@lru_cache
+def get_event_hub() -> EventHub:
+    """
+    Get the event hub shared by all the suites of the run.
+
+    The hub is used in-process (e.g. by the Copr monitor) even if the receiver
+    of the external events is not enabled.
+    """
+    return EventHub()
+
+
+def events_receiver_enabled() -> bool:
+    return bool(getenv(EVENTS_PORT_ENV))
+
+
+def keys_from_webhook(headers: dict[str, str], payload: dict) -> list[str]:
+    """
+    Get the event keys from a forge webhook (GitHub, GitLab or Pagure).
+
+    Args:
+        headers: Request headers (lowercase names).
+        payload: Decoded JSON body of the webhook.
+
+    Returns:
+        Keys of the commits the webhook is about.
+    """
+    commits = set()
+    if github_event := headers.get("x-github-event"):
+        if github_event in ("check_run", "check_suite"):
+            commits.add(payload.get(github_event, {}).get("head_sha"))
+        elif github_event == "status":
+            commits.add(payload.get("sha"))
+    elif headers.get("x-gitlab-event"):
+        # Pipeline and Job hooks
+        commits.add(payload.get("object_attributes", {}).get("sha"))
+        commits.add(payload.get("sha"))
+        commits.add(payload.get("checkout_sha"))
+    elif headers.get("x-pagure-topic"):
+        return keys_from_message(headers["x-pagure-topic"], payload.get("msg", payload))
+
+    return [commit_key(commit) for commit in commits if commit]
+
+
+def keys_from_message(topic: str, body: dict) -> list[str]:
+    """
+    Get the event keys from a message bus (Fedora Messaging) message.
+
+    Args:
+        topic: Topic of the message (e.g. 'org.fedoraproject.prod.copr.build.end').
+        body: Body of the message.
+
+    Returns:
+        Keys of the Copr builds, Koji tasks or commits the message is about.
+    """
+    if ".copr.build." in topic:
+        keys = [copr_build_key(body.get("build"))]
+        if body.get("owner") and body.get("copr"):
+            keys.append(copr_project_key(body["owner"], body["copr"]))
+        return keys
+
+    if topic.endswith("buildsys.task.state.change"):
+        return [koji_task_key(body.get("id")), koji_task_key()]
+
+    if "flag" in topic:
+        # Pagure commit/pull request flags
+        commits = {
+            body.get("flag", {}).get("commit_hash"),
+            body.get("pullrequest", {}).get("commit_stop"),
+        }
+        return [commit_key(commit) for commit in commits if commit]
+
+    return []
+
+
+def _is_signature_valid(secret: str, headers: dict[str, str], body: bytes) -> bool:
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    if signature := headers.get("x-hub-signature-256"):
+        return hmac.compare_digest(signature, f"sha256={digest}")
+    if signature := headers.get("x-pagure-signature-256"):
+        return hmac.compare_digest(signature, digest)
+    if token := headers.get("x-gitlab-token"):
+        return hmac.compare_digest(token, secret)
+    return False
+
+
+class EventReceiver:
+    """
+    Minimal local HTTP server receiving the forge webhooks (on /webhook)
+    and the message bus events (on /bus, as {"topic": ..., "body": ...},
+    e.g. forwarded by a Fedora Messaging consumer) and publishing them
+    to the event hub.
+    """
+
+    def __init__(
+        self,
+        hub: EventHub,
+        host: str = "0.0.0.0",  # noqa: S104
+        port: int = 8080,
+        secret: Optional[str] = None,
+    ):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.received = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @classmethod
+    def from_env(cls, hub: EventHub) -> "EventReceiver":
+        return cls(
+            hub,
+            host=getenv(EVENTS_HOST_ENV, "0.0.0.0"),  # noqa: S104
+            port=int(getenv(EVENTS_PORT_ENV, "8080")),
+            secret=getenv(EVENTS_SECRET_ENV),
+        )
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logging.info("Listening for webhooks and events on %s:%d", self.host, self.port)
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            status = await self._process(reader)
+        except Exception as e:
+            logging.warning("Failed to process incoming event: %s", e)
+            status = 400
+        writer.write(
+            f"HTTP/1.1 {status} \r\nContent-Length: 0\r\nConnection: close\r\n\r\n".encode(),
+        )
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+        writer.close()
+
+    async def _process(self, reader: asyncio.StreamReader) -> int:
+        request_line = (await reader.readline()).decode().split()
+        if len(request_line) < 2:  # noqa: PLR2004
+            return 400
+        method, path = request_line[0], request_line[1].split("?")[0]
+
+        headers = {}
+        while (line := (await reader.readline()).decode().strip()) != "":
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if method != "POST" or path not in (WEBHOOK_PATH, MESSAGE_BUS_PATH):
+            return 404
+        if length > MAX_BODY_SIZE:
+            return 413
+
+        body = await reader.readexactly(length)
+        if self.secret and not _is_signature_valid(self.secret, headers, body):
+            return 401
+
+        payload = json.loads(body or b"{}")
+        if path == WEBHOOK_PATH:
+            keys = keys_from_webhook(headers, payload)
+        else:
+            keys = keys_from_message(payload.get("topic", ""), payload.get("body", {}))
+
+        self.received += 1
+        if keys:
+            self.hub.publish(*keys)
+        return 200
+
+
+def publish_event(
+    url: str,
+    topic: str,
+    body: dict,
+    webhook_header: Optional[str] = None,
+    secret: Optional[str] = None,
+) -> int:
+    """
+    Stand-in publisher sending an event to the receiver, e.g. for testing the event mode
+    without real webhooks or message bus.
+
+    Args:
+        url: Base URL of the receiver (e.g. 'http://localhost:8080').
+        topic: Topic of the message bus message, or the value of the webhook header.
+        body: Body of the message/webhook.
+        webhook_header: If set, the event is sent as a forge webhook with this header
+            (e.g. 'X-GitHub-Event') set to the topic.
+        secret: Secret to sign the event with.
+
+    Returns:
+        HTTP status of the response.
+    """
+    if webhook_header:
+        path, payload, headers = WEBHOOK_PATH, body, {webhook_header: topic}
+    else:
+        path, payload, headers = MESSAGE_BUS_PATH, {"topic": topic, "body": body}, {}
+
+    data = json.dumps(payload).encode()
+    if secret:
+        digest = hmac.new(secret.encode(), data, hashlib.sha256).hexdigest()
+        headers["X-Hub-Signature-256"] = f"sha256={digest}"
+
+    response = requests.post(
+        f"{url.rstrip('/')}{path}",
+        data=data,
+        headers={"Content-Type": "application/json", **headers},
+        timeout=30,
+    )
+    return response.status_code
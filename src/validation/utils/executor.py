@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from os import getenv
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+# Number of threads per remote host, bounds the number of concurrent blocking calls
+# we make to a single forge/Copr/Koji instance
+MAX_WORKERS_PER_HOST = int(getenv("VALIDATION_MAX_WORKERS_PER_HOST", "4"))
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+
+
+def get_executor(host: str) -> ThreadPoolExecutor:
+    """
+    Get (or lazily create) the thread pool dedicated to the given host.
+
+    Args:
+        host: Hostname of the remote service (e.g. 'github.com').
+
+    Returns:
+        Thread pool used for all blocking calls to the host.
+    """
+    if host not in _executors:
+        logging.debug(
+            "Creating executor for %s with %d worker(s)",
+            host,
+            MAX_WORKERS_PER_HOST,
+        )
+        _executors[host] = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS_PER_HOST,
+            thread_name_prefix=f"validation-{host}",
+        )
+    return _executors[host]
+
+
+async def run_blocking(host: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking (synchronous) client call in the thread pool of the given host,
+    so that the event loop can keep serving other test suites and test cases.
+
+    Args:
+        host: Hostname of the remote service the call talks to.
+        func: Blocking callable (ogr, Copr or Koji client method).
+        *args: Positional arguments for the callable.
+        **kwargs: Keyword arguments for the callable.
+
+    Returns:
+        Return value of the callable.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(host),
+        functools.partial(func, *args, **kwargs),
+    )
+
+
+def shutdown_executors():
+    """
+    Shut down all the thread pools, waiting for the running calls to finish.
+    """
+    for host, executor in _executors.items():
+        logging.debug("Shutting down executor for %s", host)
+        executor.shutdown(wait=True, cancel_futures=True)
+    _executors.clear()
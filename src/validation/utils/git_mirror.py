@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import shutil
+import subprocess
+import tempfile
+from functools import lru_cache
+from os import getenv
+from pathlib import Path
+from urllib.parse import urlparse
+
+from validation.utils.commands import DEFAULT_TIMEOUT, run_command
+
+# Directory of the persistent git mirrors, kept between the runs
+GIT_MIRROR_DIR_ENV = "VALIDATION_GIT_MIRROR_DIR"
+DEFAULT_GIT_MIRROR_DIR = Path.home() / ".cache" / "packit-validation" / "git"
+
+
+class GitMirror:
+    """
+    Persistent local (bare) mirror of a git repository, fetched incrementally.
+
+    The test cases don't clone the repository, each of them works in its own
+    lightweight worktree of the mirror, so they share one object store.
+    """
+
+    def __init__(self, path: Path, upstream_url: str):
+        self.path = path
+        self.upstream_url = upstream_url
+        # Serializes the git commands creating, resetting or deleting the refs
+        # shared by the mirror and its worktrees or changing its config
+        self.lock = asyncio.Lock()
+
+    async def git(
+        self,
+        *args: str,
+        cwd: Path | str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        exclusive: bool = False,
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a git command in the mirror (or in the given worktree of it).
+
+        Args:
+            args: Arguments of git.
+            cwd: Worktree to run the command in, the mirror by default.
+            timeout: Seconds after which the command is killed.
+            exclusive: Whether the command creates, resets or deletes the shared refs
+                or changes the config, so it must not run concurrently with
+                the other such commands. The commands confined to a worktree
+                (e.g. committing to its branch or pushing it) run concurrently.
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails.
+            subprocess.TimeoutExpired: If the command doesn't finish in time.
+        """
+        if not exclusive:
+            return await self._git(*args, cwd=cwd, timeout=timeout)
+        async with self.lock:
+            return await self._git(*args, cwd=cwd, timeout=timeout)
+
+    async def _git(
+        self,
+        *args: str,
+        cwd: Path | str | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> subprocess.CompletedProcess:
+        return await run_command(["git", *args], cwd=cwd or self.path, timeout=timeout)
+
+    async def sync(self):
+        """
+        Create the mirror if it doesn't exist yet, otherwise fetch the new upstream commits.
+        """
+        async with self.lock:
+            if not (self.path / "HEAD").exists():
+                logging.info("Creating git mirror of %s in %s", self.upstream_url, self.path)
+                self.path.mkdir(parents=True, exist_ok=True)
+                await self._git("init", "--bare")
+                await self._git("remote", "add", "origin", self.upstream_url)
+            else:
+                # Forget the worktrees of the test cases that did not clean up
+                await self._git("worktree", "prune")
+
+            logging.debug("Fetching %s into the git mirror", self.upstream_url)
+            await self._git("fetch", "--prune", "origin")
+
+    async def set_remote(self, name: str, url: str):
+        async with self.lock:
+            remotes = (await self._git("remote")).stdout.split()
+            if name in remotes:
+                await self._git("remote", "set-url", name, url)
+            else:
+                await self._git("remote", "add", name, url)
+
+    async def set_config(self, key: str, value: str):
+        await self.git("config", key, value, exclusive=True)
+
+    async def fetch(self, remote: str):
+        await self.git("fetch", "--prune", remote, exclusive=True)
+
+    async def add_worktree(self, ref: str) -> Path:
+        """
+        Create a new worktree with detached HEAD at the given ref in a temporary directory.
+
+        Returns:
+            Path to the worktree.
+        """
+        parent = Path(tempfile.mkdtemp(prefix="validation-worktree-"))
+        worktree = parent / self.path.stem
+        await self.git("worktree", "add", "--detach", str(worktree), ref, exclusive=True)
+        logging.debug("Created worktree %s at %s", worktree, ref)
+        return worktree
+
+    async def remove_worktree(self, worktree: Path):
+        async with self.lock:
+            try:
+                await self._git("worktree", "remove", "--force", str(worktree))
+            except subprocess.CalledProcessError as e:
+                logging.warning("Failed to remove worktree %s: %s", worktree, e.stderr)
+                shutil.rmtree(worktree, ignore_errors=True)
+                await self._git("worktree", "prune")
+        shutil.rmtree(worktree.parent, ignore_errors=True)
+
+
+@lru_cache
+def git_mirror(upstream_url: str) -> GitMirror:
+    """
+    Get the mirror of the repository shared by all the test cases of the run.
+
+    Args:
+        upstream_url: URL of the repository (for anonymous fetching).
+    """
+    parsed = urlparse(upstream_url)
+    root = Path(getenv(GIT_MIRROR_DIR_ENV, str(DEFAULT_GIT_MIRROR_DIR)))
+    path = root / (parsed.hostname or "local") / parsed.path.strip("/")
+    if path.suffix != ".git":
+        path = path.with_name(f"{path.name}.git")
+    return GitMirror(path, upstream_url)
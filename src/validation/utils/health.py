@@ -0,0 +1,173 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from functools import lru_cache
+from typing import Optional
+
+from copr.v3.exceptions import CoprRequestException, CoprTimeoutException
+
+from validation.utils.async_http import aiohttp
+
+HTTP_SERVER_ERROR = 500
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    # aiohttp.ClientResponseError
+    if isinstance(getattr(error, "status", None), int):
+        return error.status
+    # requests.HTTPError, the Copr client keeps the response in the result
+    response = getattr(error, "response", None)
+    if response is None and isinstance(result := getattr(error, "result", None), dict):
+        response = result.get("__response__")
+    return getattr(response, "status_code", None)
+
+
+def is_outage_error(error: Exception) -> bool:
+    """
+    Check whether the error means the service is unavailable, unlike e.g. a project
+    not created yet.
+    """
+    if (status := _status_code(error)) is not None:
+        return status >= HTTP_SERVER_ERROR
+    # The Copr client wraps the timeouts and the connection errors of requests,
+    # the request exceptions without a response are the latter
+    if isinstance(error, (CoprTimeoutException, CoprRequestException)):
+        return True
+    if aiohttp and isinstance(error, aiohttp.ClientConnectionError):
+        return True
+    # Including the connection errors and timeouts of requests
+    return isinstance(error, (OSError, asyncio.TimeoutError))
+
+
+class RunHealthMonitor:
+    """
+    Run-wide health of packit-service and the build systems, shared by all the suites.
+
+    Trips (like a circuit breaker) when no test on any forge has seen a status from
+    packit-service for a long time after its trigger, or when a build system keeps
+    failing, so that the remaining tests end quickly instead of waiting out their timeouts.
+    """
+
+    NO_STATUS_TIMEOUT = 15 * 60  # seconds - time without any status seen by the waiting tests
+    MAX_CONSECUTIVE_ERRORS = 10  # failed calls in a row after which a service is considered down
+    CHECK_INTERVAL = 30  # seconds - how often the waiting tests check the health
+
+    def __init__(
+        self,
+        no_status_timeout: float = NO_STATUS_TIMEOUT,
+        max_consecutive_errors: int = MAX_CONSECUTIVE_ERRORS,
+    ):
+        self.no_status_timeout = no_status_timeout
+        self.max_consecutive_errors = max_consecutive_errors
+        self.tripped_reason: Optional[str] = None
+        self.aborted = 0
+        self._tripped = asyncio.Event()
+        self._last_status_at: Optional[float] = None
+        # Trigger times of the tests waiting for their first status
+        self._waiting: dict[int, float] = {}
+        self._errors: dict[str, int] = {}
+
+    @property
+    def tripped(self) -> bool:
+        return self._tripped.is_set()
+
+    def trip(self, reason: str):
+        if self.tripped:
+            return
+        logging.error("Ending the remaining tests: %s", reason)
+        self.tripped_reason = reason
+        self._tripped.set()
+
+    def record_trigger(self, test_id: int):
+        """
+        Report that the test has triggered packit-service and waits for its statuses.
+        """
+        self._waiting[test_id] = asyncio.get_running_loop().time()
+
+    def extend_wait(self, test_id: int, seconds: float):
+        """
+        Report that the test knowingly waits for its first status longer than usual
+        (e.g. for a delayed webhook), it doesn't count as waiting for too long
+        until the given seconds pass.
+        """
+        if test_id in self._waiting:
+            self._waiting[test_id] = max(
+                self._waiting[test_id],
+                asyncio.get_running_loop().time() + seconds - self.no_status_timeout,
+            )
+
+    def record_status(self, test_id: int):
+        """
+        Report that the test has seen a (new) status set by packit-service.
+        """
+        self._waiting.pop(test_id, None)
+        self._last_status_at = asyncio.get_running_loop().time()
+
+    def record_done(self, test_id: int):
+        self._waiting.pop(test_id, None)
+
+    def record_call(self, service: str, error: Optional[Exception] = None):
+        """
+        Report the result of a call to a build system (Copr, Koji).
+
+        Args:
+            service: Name of the service.
+            error: The error of the call if it failed.
+        """
+        if error is None or not is_outage_error(error):
+            self._errors[service] = 0
+            return
+
+        self._errors[service] = self._errors.get(service, 0) + 1
+        if self._errors[service] >= self.max_consecutive_errors:
+            self.trip(f"{service} failed {self._errors[service]} times in a row: {error}")
+
+    def check(self):
+        """
+        Trip if no status has been seen for too long by the tests waiting for one.
+        """
+        if not self._waiting or self.tripped:
+            return
+
+        now = asyncio.get_running_loop().time()
+        since = max(min(self._waiting.values()), self._last_status_at or 0)
+        if now - since > self.no_status_timeout:
+            self.trip(
+                f"no status from packit-service seen by any of {len(self._waiting)} "
+                f"waiting test(s) for {int(now - since) // 60} minutes",
+            )
+
+    async def wait_tripped(self):
+        """
+        Wait until the monitor trips, checking the health regularly.
+        """
+        while not self.tripped:
+            self.check()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._tripped.wait(), timeout=self.CHECK_INTERVAL)
+
+
+@lru_cache
+def health_monitor() -> RunHealthMonitor:
+    """
+    Get the health monitor shared by all the suites of the run.
+    """
+    return RunHealthMonitor()
+
+
+@contextmanager
+def tracked_call(service: str) -> Iterator[None]:
+    """
+    Report the result of the call made in the block to the health monitor.
+    """
+    try:
+        yield
+    except Exception as e:
+        health_monitor().record_call(service, e)
+        raise
+    health_monitor().record_call(service)
@@ -0,0 +1,278 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import json
+import logging
+import sqlite3
+import statistics
+import threading
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from os import getenv
+from pathlib import Path
+from typing import Optional
+
+from validation.utils.latency import LatencyPhase, TestLatency
+
+# SQLite file of the history of the runs, kept between the runs
+HISTORY_FILE_ENV = "VALIDATION_HISTORY_FILE"
+DEFAULT_HISTORY_FILE = Path.home() / ".cache" / "packit-validation" / "history.sqlite"
+
+_PHASES = [phase.value for phase in LatencyPhase]
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    deployment TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    aborted_reason TEXT
+);
+CREATE TABLE IF NOT EXISTS suites (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    instance_url TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    api_requests INTEGER,
+    cache_hits INTEGER,
+    cache_misses INTEGER
+);
+CREATE TABLE IF NOT EXISTS tests (
+    id INTEGER PRIMARY KEY,
+    suite_id INTEGER NOT NULL REFERENCES suites(id),
+    trigger TEXT NOT NULL,
+    pr_url TEXT,
+    pr_title TEXT,
+    passed INTEGER NOT NULL,
+    reason TEXT,
+    triggered_at TEXT,
+    {", ".join(f"{phase} REAL" for phase in _PHASES)},
+    checks TEXT
+);
+"""
+# The columns of the phases are the fixed names of LatencyPhase
+INSERT_TEST = (
+    "INSERT INTO tests (suite_id, trigger, pr_url, pr_title, passed, reason, "  # noqa: S608
+    f"triggered_at, {', '.join(_PHASES)}, checks) "
+    f"VALUES ({', '.join('?' * (len(_PHASES) + 8))})"
+)
+SELECT_TEST_PHASES = (
+    f"SELECT run_id, instance_url, {', '.join(_PHASES)} "  # noqa: S608
+    "FROM tests JOIN suites ON tests.suite_id = suites.id WHERE run_id >= ?"
+)
+
+
+@dataclass
+class TestRecord:
+    latency: TestLatency
+    passed: bool
+    pr_url: Optional[str] = None
+    pr_title: Optional[str] = None
+    reason: Optional[str] = None
+
+
+@dataclass
+class SuiteRecord:
+    instance_url: str
+    tests: list[TestRecord]
+    # Requests of the API rate limit used by the suite, if known
+    api_requests: Optional[int] = None
+    cache_hits: Optional[int] = None
+    cache_misses: Optional[int] = None
+
+
+@dataclass
+class RunTrend:
+    """
+    Median phase latencies of a past run per forge, with the phases
+    that regressed compared with the preceding runs.
+    """
+
+    run_id: int
+    deployment: str
+    started_at: str
+    passed: int
+    failed: int
+    aborted_reason: Optional[str]
+    # Median seconds since the trigger by the instance URL and the phase
+    medians: dict[str, dict[str, float]] = field(default_factory=dict)
+    # Regressed phases by the instance URL and the phase, with their baseline
+    regressions: dict[str, dict[str, float]] = field(default_factory=dict)
+
+
+class RunHistory:
+    """
+    Persisted history of the validation runs: the suites, the tests with their
+    phase latencies and failure reasons, and the API requests made.
+    """
+
+    BASELINE_RUNS = 7  # previous runs the latencies of a run are compared with
+    REGRESSION_RATIO = 1.5  # median latency (relative to the baseline) considered a regression
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.run_id: Optional[int] = None
+        # The suites finish independently
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.path)) as connection:
+            connection.row_factory = sqlite3.Row
+            connection.executescript(SCHEMA)
+            with connection:
+                yield connection
+
+    def start_run(self, deployment: str):
+        """
+        Start recording a new run, the suites are recorded only within a run.
+        """
+        try:
+            with self._lock, self._connect() as connection:
+                self.run_id = connection.execute(
+                    "INSERT INTO runs (deployment, started_at) VALUES (?, ?)",
+                    (deployment, datetime.now(tz=timezone.utc).isoformat()),
+                ).lastrowid
+        except (OSError, sqlite3.Error) as e:
+            logging.warning("Failed to record the run to %s: %s", self.path, e)
+
+    def finish_run(self, aborted_reason: Optional[str] = None):
+        if self.run_id is None:
+            return
+        try:
+            with self._lock, self._connect() as connection:
+                connection.execute(
+                    "UPDATE runs SET finished_at = ?, aborted_reason = ? WHERE id = ?",
+                    (datetime.now(tz=timezone.utc).isoformat(), aborted_reason, self.run_id),
+                )
+        except (OSError, sqlite3.Error) as e:
+            logging.warning("Failed to record the end of the run to %s: %s", self.path, e)
+
+    def record_suite(self, suite: SuiteRecord):
+        """
+        Record the results of a suite to the current run, if any.
+        """
+        if self.run_id is None:
+            return
+        try:
+            with self._lock, self._connect() as connection:
+                suite_id = connection.execute(
+                    "INSERT INTO suites (run_id, instance_url, total, passed, failed, "
+                    "api_requests, cache_hits, cache_misses) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        self.run_id,
+                        suite.instance_url,
+                        len(suite.tests),
+                        sum(test.passed for test in suite.tests),
+                        sum(not test.passed for test in suite.tests),
+                        suite.api_requests,
+                        suite.cache_hits,
+                        suite.cache_misses,
+                    ),
+                ).lastrowid
+                connection.executemany(
+                    INSERT_TEST,
+                    [self._test_row(suite_id, test) for test in suite.tests],
+                )
+        except (OSError, sqlite3.Error) as e:
+            logging.warning("Failed to record the suite to %s: %s", self.path, e)
+
+    @staticmethod
+    def _test_row(suite_id: int, test: TestRecord) -> tuple:
+        latency = test.latency.as_dict()
+        return (
+            suite_id,
+            test.latency.trigger,
+            test.pr_url,
+            test.pr_title,
+            test.passed,
+            test.reason,
+            latency["triggered_at"],
+            *(latency[phase.value] for phase in LatencyPhase),
+            json.dumps(latency["checks"]),
+        )
+
+    def trends(
+        self,
+        limit: int = 20,
+        baseline_runs: int = BASELINE_RUNS,
+        regression_ratio: float = REGRESSION_RATIO,
+    ) -> list[RunTrend]:
+        """
+        Get the median phase latencies of the latest runs, flagging the phases
+        that regressed compared with the rolling baseline.
+
+        Args:
+            limit: Number of the latest runs to return.
+            baseline_runs: Number of the preceding runs whose medians form the baseline.
+            regression_ratio: Median latency relative to the baseline considered a regression.
+
+        Returns:
+            The runs, oldest first.
+        """
+        with self._lock, self._connect() as connection:
+            runs = connection.execute(
+                "SELECT runs.id, deployment, started_at, aborted_reason, "
+                "COALESCE(SUM(passed), 0) AS passed, COALESCE(SUM(failed), 0) AS failed "
+                "FROM runs LEFT JOIN suites ON suites.run_id = runs.id "
+                "GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?",
+                (limit + baseline_runs,),
+            ).fetchall()
+            tests = connection.execute(
+                SELECT_TEST_PHASES,
+                (runs[-1]["id"] if runs else 0,),
+            ).fetchall()
+
+        trends = [
+            RunTrend(
+                run_id=run["id"],
+                deployment=run["deployment"],
+                started_at=run["started_at"],
+                passed=run["passed"],
+                failed=run["failed"],
+                aborted_reason=run["aborted_reason"],
+            )
+            for run in reversed(runs)
+        ]
+        by_id = {trend.run_id: trend for trend in trends}
+        values: dict[tuple[int, str, str], list[float]] = {}
+        for test in tests:
+            for phase in LatencyPhase:
+                if test[phase.value] is not None:
+                    key = (test["run_id"], test["instance_url"], phase.value)
+                    values.setdefault(key, []).append(test[phase.value])
+        for (run_id, instance_url, phase), seconds in values.items():
+            by_id[run_id].medians.setdefault(instance_url, {})[phase] = statistics.median(seconds)
+
+        for i, trend in enumerate(trends):
+            # Only the runs of the same deployment are comparable
+            previous = [other for other in trends[:i] if other.deployment == trend.deployment][
+                -baseline_runs:
+            ]
+            for instance_url, medians in trend.medians.items():
+                for phase, median in medians.items():
+                    history = [
+                        other.medians[instance_url][phase]
+                        for other in previous
+                        if phase in other.medians.get(instance_url, {})
+                    ]
+                    if not history:
+                        continue
+                    baseline = statistics.median(history)
+                    if median > baseline * regression_ratio:
+                        trend.regressions.setdefault(instance_url, {})[phase] = baseline
+        return trends[-limit:]
+
+
+@lru_cache
+def run_history() -> RunHistory:
+    """
+    Get the run history shared by all the suites of the run.
+    """
+    return RunHistory(Path(getenv(HISTORY_FILE_ENV, str(DEFAULT_HISTORY_FILE))))
@@ -0,0 +1,122 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import enum
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from validation.utils.status_tracker import CheckTimeline
+
+# Percentiles of the phase latencies in the summary of a suite
+SUMMARY_PERCENTILES = (50, 90)
+
+
+class LatencyPhase(str, enum.Enum):
+    """
+    Milestones of the reaction of packit-service to a trigger.
+    """
+
+    first_status = "first_status"
+    build_submitted = "build_submitted"
+    build_finished = "build_finished"
+    checks_completed = "checks_completed"
+
+
+@dataclass
+class TestLatency:
+    """
+    Times of the milestones of one test, measured from its trigger.
+    """
+
+    forge: str
+    trigger: str
+    triggered_at: Optional[datetime] = None
+    reached_at: dict[LatencyPhase, datetime] = field(default_factory=dict)
+    # Timelines of the individual checks by their names
+    checks: dict[str, CheckTimeline] = field(default_factory=dict)
+
+    def start(self, triggered_at: datetime, checks: Optional[dict[str, CheckTimeline]] = None):
+        self.triggered_at = triggered_at
+        self.reached_at.clear()
+        self.checks = {} if checks is None else checks
+
+    def record(self, phase: LatencyPhase):
+        """
+        Record that the phase was reached now, only the first time counts.
+        """
+        if self.triggered_at and phase not in self.reached_at:
+            self.reached_at[phase] = datetime.now(tz=timezone.utc)
+
+    def seconds(self, phase: LatencyPhase) -> Optional[float]:
+        """
+        Get the seconds from the trigger to the phase, None if not reached.
+        """
+        if phase not in self.reached_at:
+            return None
+        return (self.reached_at[phase] - self.triggered_at).total_seconds()
+
+    def seconds_since_trigger(self, time: Optional[datetime]) -> Optional[float]:
+        if not time or not self.triggered_at:
+            return None
+        return (time - self.triggered_at).total_seconds()
+
+    def as_dict(self) -> dict:
+        return {
+            "forge": self.forge,
+            "trigger": self.trigger,
+            "triggered_at": self.triggered_at.isoformat() if self.triggered_at else None,
+            **{phase.value: self.seconds(phase) for phase in LatencyPhase},
+            "checks": {
+                name: {
+                    "appeared": self.seconds_since_trigger(timeline.appeared_at),
+                    "pending": self.seconds_since_trigger(timeline.pending_at),
+                    "completed": self.seconds_since_trigger(timeline.completed_at),
+                    "successful": timeline.successful,
+                }
+                for name, timeline in self.checks.items()
+            },
+        }
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    Get the percentile of the values (nearest-rank method).
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def _summary_line(label: str, values: list[float]) -> str:
+    stats = ", ".join(
+        f"p{percent}={percentile(values, percent):.0f}s" for percent in SUMMARY_PERCENTILES
+    )
+    return f"    {label}: {stats}, max={max(values):.0f}s (n={len(values)})"
+
+
+def latency_summary(latencies: list[TestLatency]) -> list[str]:
+    """
+    Summarize the phase latencies of the tests (of one forge) for the log.
+
+    Returns:
+        Lines of the summary, one per reached phase and one per completed check.
+    """
+    lines = []
+    for phase in LatencyPhase:
+        values = [
+            seconds for latency in latencies if (seconds := latency.seconds(phase)) is not None
+        ]
+        if values:
+            lines.append(_summary_line(phase.value, values))
+
+    completed: dict[str, list[float]] = {}
+    for latency in latencies:
+        for name, timeline in latency.checks.items():
+            if (seconds := latency.seconds_since_trigger(timeline.completed_at)) is not None:
+                completed.setdefault(name, []).append(seconds)
+    for name, values in sorted(completed.items()):
+        lines.append(_summary_line(f"check {name} completed", values))
+    return lines
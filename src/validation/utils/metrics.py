@@ -0,0 +1,304 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import math
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from functools import lru_cache
+from os import getenv
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+# Port of the local HTTP endpoint serving the metrics (on /metrics) while running,
+# the endpoint is started only if it is set
+METRICS_PORT_ENV = "VALIDATION_METRICS_PORT"
+METRICS_HOST_ENV = "VALIDATION_METRICS_HOST"
+# File the metrics are written to at the end of the run (node_exporter textfile collector)
+METRICS_FILE_ENV = "VALIDATION_METRICS_FILE"
+# URL of a Prometheus Pushgateway the metrics are pushed to at the end of the run
+METRICS_PUSHGATEWAY_ENV = "VALIDATION_METRICS_PUSHGATEWAY"
+
+METRICS_PATH = "/metrics"
+PUSHGATEWAY_JOB = "packit-validation"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# seconds - buckets of the latencies of the reaction of packit-service
+LATENCY_BUCKETS = (30, 60, 120, 300, 600, 900, 1800, 3600, 7200)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class Metric:
+    """
+    Metric with a value per combination of its labels, in the Prometheus data model.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[tuple[str, ...], float] = {}
+        # Updated from the executor threads
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if set(labels) != set(self.labels):
+            msg = f"{self.name} expects labels {self.labels}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+                for key, value in self._values.items()
+            ]
+
+    def render(self) -> str:
+        return "\n".join(
+            [
+                f"# HELP {self.name} {_escape(self.documentation)}",
+                f"# TYPE {self.name} {self.type}",
+                *self.samples(),
+            ],
+        )
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = (*sorted(buckets), math.inf)
+        self._observations: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._observations.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._observations[key] = (counts, total + value)
+
+    def samples(self) -> list[str]:
+        samples = []
+        with self._lock:
+            for key, (counts, total) in self._observations.items():
+                for bound, count in zip(self.buckets, counts):
+                    labels = _format_labels((*self.labels, "le"), (*key, _format_value(bound)))
+                    samples.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labels, key)
+                samples.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                samples.append(f"{self.name}_count{labels} {counts[-1]}")
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Metrics of the run, rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kls: type, name: str, documentation: str, labels: tuple[str, ...], **kwargs):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = kls(name, documentation, labels, **kwargs)
+            metric = self._metrics[name]
+        if not isinstance(metric, kls):
+            msg = f"Metric {name} is already registered as a {metric.type}"
+            raise ValueError(msg)
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._get(Counter, name, documentation, labels)
+
+    def gauge(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Gauge:
+        return self._get(Gauge, name, documentation, labels)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._get(Histogram, name, documentation, labels, buckets=buckets)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(f"{metric.render()}\n" for metric in metrics)
+
+
+@lru_cache
+def metrics() -> MetricsRegistry:
+    """
+    Get the metrics registry shared by all the suites of the run.
+    """
+    return MetricsRegistry()
+
+
+@contextmanager
+def counted_call(host: str) -> Iterator[None]:
+    """
+    Count the API call made in the block, by the host of the service and the outcome.
+    """
+    calls = metrics().counter(
+        "validation_api_calls_total",
+        "Calls made to the forge, Copr and Koji APIs.",
+        ("host", "outcome"),
+    )
+    try:
+        yield
+    except Exception:
+        calls.inc(host=host, outcome="error")
+        raise
+    calls.inc(host=host, outcome="success")
+
+
+def metrics_server_enabled() -> bool:
+    return bool(getenv(METRICS_PORT_ENV))
+
+
+class MetricsServer:
+    """
+    Minimal local HTTP server exposing the metrics of the running validation
+    on /metrics for Prometheus to scrape.
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        host: str = "0.0.0.0",  # noqa: S104
+        port: int = 9090,
+    ):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @classmethod
+    def from_env(cls, registry: MetricsRegistry) -> "MetricsServer":
+        return cls(
+            registry,
+            host=getenv(METRICS_HOST_ENV, "0.0.0.0"),  # noqa: S104
+            port=int(getenv(METRICS_PORT_ENV, "9090")),
+        )
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logging.info("Serving metrics on %s:%d%s", self.host, self.port, METRICS_PATH)
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        status, body = 404, b""
+        try:
+            request_line = (await reader.readline()).decode().split()
+            # Skip the headers, the request has no body
+            while (await reader.readline()).strip():
+                pass
+            if request_line[:2] == ["GET", METRICS_PATH]:
+                status, body = 200, self.registry.render().encode()
+        except Exception as e:
+            logging.warning("Failed to serve the metrics: %s", e)
+            status = 400
+        head = (
+            f"HTTP/1.1 {status} \r\nContent-Type: {CONTENT_TYPE}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        )
+        writer.write(head.encode() + body)
+        with suppress(ConnectionError):
+            await writer.drain()
+        writer.close()
+
+
+def export_metrics(registry: MetricsRegistry, deployment: str):
+    """
+    Write the metrics to the textfile and push them to the Pushgateway,
+    if configured, at the end of the run.
+
+    Args:
+        registry: Metrics of the run.
+        deployment: Name of the validated deployment, grouping the pushed metrics.
+    """
+    text = registry.render()
+    if path := getenv(METRICS_FILE_ENV):
+        try:
+            # Replace atomically, the collector can read the file anytime
+            tmp_path = Path(f"{path}.{os.getpid()}.tmp")
+            tmp_path.write_text(text)
+            tmp_path.replace(path)
+            logging.info("Metrics written to %s", path)
+        except OSError as e:
+            logging.warning("Failed to write the metrics to %s: %s", path, e)
+
+    if url := getenv(METRICS_PUSHGATEWAY_ENV):
+        try:
+            response = requests.put(
+                f"{url.rstrip('/')}/metrics/job/{PUSHGATEWAY_JOB}/deployment/{deployment}",
+                data=text.encode(),
+                headers={"Content-Type": CONTENT_TYPE},
+                timeout=30,
+            )
+            response.raise_for_status()
+            logging.info("Metrics pushed to %s", url)
+        except requests.RequestException as e:
+            logging.warning("Failed to push the metrics to %s: %s", url, e)
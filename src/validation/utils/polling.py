@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import enum
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from validation.utils.metrics import metrics
+from validation.utils.rate_limit import RateLimitBudget
+
+
+class PollingPhase(str, enum.Enum):
+    statuses_appear = "statuses_appear"
+    reaction = "reaction"
+    build_submit = "build_submit"
+    build = "build"
+    watch_statuses = "watch_statuses"
+
+
+@dataclass(frozen=True)
+class PollingPolicy:
+    """
+    Intervals between the polls of one phase of the test.
+
+    The first poll waits `initial` seconds, every next interval is multiplied
+    by `factor` up to `maximum` seconds. When the polled state changes,
+    the interval drops back to `after_change` (or `initial`) seconds,
+    since more changes are likely to follow shortly.
+    """
+
+    initial: float  # seconds
+    maximum: float  # seconds
+    factor: float = 1.5
+    after_change: Optional[float] = None  # seconds
+
+
+class PollingSchedule:
+    """
+    Adaptive (backoff) schedule of the polls of one phase following a PollingPolicy.
+
+    If a wakeup event is given (set when a webhook or message bus event about
+    the polled state is received), the wait ends as soon as it is set and
+    the timed polls serve only as a fallback. The polls woken up by the events
+    are still at least `initial` seconds apart, a busy event stream (e.g. all
+    the Koji build tasks) doesn't turn into busy polling. If a rate limit budget
+    is given, the intervals are stretched when it runs short.
+    """
+
+    def __init__(
+        self,
+        phase: PollingPhase,
+        policy: PollingPolicy,
+        wakeup: Optional[asyncio.Event] = None,
+        rate_limit: Optional[RateLimitBudget] = None,
+    ):
+        self.phase = phase
+        self.policy = policy
+        self.wakeup = wakeup
+        self.rate_limit = rate_limit
+        self.polls = 0
+        self.wakeups = 0
+        self._interval = policy.initial
+
+    @property
+    def interval(self) -> float:
+        """
+        Seconds to wait before the next poll.
+        """
+        return self._interval
+
+    def changed(self):
+        """
+        Report that the polled state has changed, poll faster again.
+        """
+        self._interval = min(
+            self.policy.after_change or self.policy.initial,
+            self.policy.maximum,
+        )
+
+    async def wait(self):
+        """
+        Wait before the next poll and back off the interval for the following one.
+        """
+        interval = self.rate_limit.pace(self._interval) if self.rate_limit else self._interval
+        logging.debug("Next %s poll in %d seconds", self.phase.value, interval)
+        if self.wakeup is None:
+            await asyncio.sleep(interval)
+        else:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                logging.debug("Woken up for the %s poll by an event", self.phase.value)
+                # Not sooner than the shortest interval after the previous poll
+                floor = min(self.policy.initial, interval)
+                if (remaining := floor - (loop.time() - started)) > 0:
+                    await asyncio.sleep(remaining)
+                self.wakeups += 1
+                metrics().counter(
+                    "validation_poll_wakeups_total",
+                    "Polls woken up by a webhook or message bus event.",
+                    ("phase",),
+                ).inc(phase=self.phase.value)
+            self.wakeup.clear()
+        self.polls += 1
+        metrics().counter(
+            "validation_polls_total",
+            "Polls of the forge, Copr and Koji APIs by the phase of the tests.",
+            ("phase",),
+        ).inc(phase=self.phase.value)
+        self._interval = min(self._interval * self.policy.factor, self.policy.maximum)
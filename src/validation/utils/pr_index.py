@@ -0,0 +1,146 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from os import getenv
+from pathlib import Path
+from typing import Optional
+
+# Common prefix of the titles of all the test PRs (comment, push and opened PR tests)
+TEST_PR_TITLE_PREFIX = "Basic test case"
+
+
+def opened_pr_title(deployment: str) -> str:
+    """
+    Get the title of the PR created by the opened PR test.
+    """
+    return f"{TEST_PR_TITLE_PREFIX} ({deployment}): opened PR trigger"
+
+
+# File of the persisted index of the test PRs, kept between the runs
+PR_INDEX_FILE_ENV = "VALIDATION_PR_INDEX_FILE"
+DEFAULT_PR_INDEX_FILE = Path.home() / ".cache" / "packit-validation" / "test-prs.json"
+
+
+@dataclass
+class IndexedProject:
+    pr_ids: list[int]
+    # Time of the last full listing of the PRs of the project
+    indexed_at: float
+    # Whether the PR of the opened PR test was closed by the test (none is left open)
+    opened_pr_closed: bool = False
+
+
+class TestPrIndex:
+    """
+    Persisted index of the ids of the test PRs of each project.
+
+    The forges without a server-side PR search re-validate the known test PRs
+    one by one instead of listing all the open PRs of the project on every run.
+    """
+
+    REINDEX_INTERVAL = 24 * 60 * 60  # seconds - time after which all the PRs are listed again
+
+    def __init__(self, path: Path):
+        self.path = path
+        # Used from the executor threads of the forges
+        self._lock = threading.Lock()
+
+    def get(self, project_key: str) -> Optional[IndexedProject]:
+        """
+        Get the indexed test PRs of the project.
+
+        Returns:
+            The indexed PRs or None if the project is not indexed or the index is stale.
+        """
+        with self._lock:
+            entry = self._load().get(project_key)
+        if not entry or time.time() - entry["indexed_at"] > self.REINDEX_INTERVAL:
+            return None
+        return IndexedProject(
+            pr_ids=entry["pr_ids"],
+            indexed_at=entry["indexed_at"],
+            opened_pr_closed=entry.get("opened_pr_closed", False),
+        )
+
+    def store(
+        self,
+        project_key: str,
+        pr_ids: list[int],
+        *,
+        indexed_at: Optional[float] = None,
+        opened_pr_closed: bool = False,
+    ):
+        """
+        Store the test PRs of the project.
+
+        Args:
+            project_key: Identifier of the project, e.g. its URL.
+            pr_ids: Ids of the test PRs.
+            indexed_at: Time of the full listing the PRs come from, now by default.
+            opened_pr_closed: Whether the PR of the opened PR test is known to be closed.
+        """
+        with self._lock:
+            index = self._load()
+            index[project_key] = {
+                "pr_ids": sorted(pr_ids),
+                "indexed_at": time.time() if indexed_at is None else indexed_at,
+                "opened_pr_closed": opened_pr_closed,
+            }
+            self._save(index)
+
+    def add_opened_pr(self, project_key: str, pr_id: int):
+        """
+        Add the PR just created by the opened PR test, so that it's found (and closed)
+        by the next runs even if this one leaves it open.
+        """
+        with self._lock:
+            index = self._load()
+            # Without an entry, the project is fully listed (and indexed) by the next run
+            entry = index.setdefault(project_key, {"pr_ids": [], "indexed_at": 0})
+            entry["pr_ids"] = sorted({*entry["pr_ids"], pr_id})
+            entry["opened_pr_closed"] = False
+            self._save(index)
+
+    def remove_opened_pr(self, project_key: str, pr_id: int):
+        """
+        Remove the PR of the opened PR test closed by the test.
+        """
+        with self._lock:
+            index = self._load()
+            if entry := index.get(project_key):
+                entry["pr_ids"] = [
+                    indexed_id for indexed_id in entry["pr_ids"] if indexed_id != pr_id
+                ]
+                entry["opened_pr_closed"] = True
+                self._save(index)
+
+    def _save(self, index: dict):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(index, indent=2))
+        except OSError as e:
+            logging.warning("Failed to store the test PR index to %s: %s", self.path, e)
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable test PR index %s: %s", self.path, e)
+            return {}
+
+
+@lru_cache
+def test_pr_index() -> TestPrIndex:
+    """
+    Get the test PR index shared by all the suites of the run.
+    """
+    return TestPrIndex(Path(getenv(PR_INDEX_FILE_ENV, str(DEFAULT_PR_INDEX_FILE))))
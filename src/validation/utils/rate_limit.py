@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+import requests
+
+from validation.utils.metrics import metrics
+
+# Rate limit headers of GitHub (X-RateLimit-*) and GitLab (RateLimit-*)
+REMAINING_HEADERS = ("X-RateLimit-Remaining", "RateLimit-Remaining")
+LIMIT_HEADERS = ("X-RateLimit-Limit", "RateLimit-Limit")
+RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+# GitHub has separate budgets for the search and GraphQL APIs, only the core one is tracked
+RESOURCE_HEADER = "X-RateLimit-Resource"
+CORE_RESOURCE = "core"
+# Reset values below this are relative (seconds), above it absolute (epoch)
+_EPOCH_THRESHOLD = 10**9
+
+
+@dataclass(frozen=True)
+class RateLimitState:
+    remaining: int
+    limit: Optional[int] = None
+    reset_at: Optional[float] = None  # epoch seconds
+
+
+def _first_header(headers: Mapping[str, str], names: tuple[str, ...]) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+class RateLimitBudget:
+    """
+    Live API rate limit budget of a service host.
+
+    Updated from the rate limit headers of the responses of all the clients of the host,
+    the polls are stretched and the triggers wait for the reset of the rate limit
+    when the budget runs short.
+    """
+
+    LOW_WATER = 0.2  # fraction of the limit under which the polls are stretched
+    MAX_WAIT = 3600  # seconds - longest wait for the reset of the rate limit
+    # seconds - wait if the time of the reset is unknown (per missing request,
+    # at least the minimum)
+    UNKNOWN_RESET_MIN_WAIT = 60
+
+    def __init__(self, host: str, reserve: int = 0):
+        """
+        Args:
+            host: Host of the service (for logging).
+            reserve: Requests that should be left for the checks of the running tests,
+                the triggers wait for the reset if the budget would drop under it.
+        """
+        self.host = host
+        self.reserve = reserve
+        self.updates = 0
+        self._state: Optional[RateLimitState] = None
+        # Updated from the executor threads
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        remaining: int,
+        limit: Optional[int] = None,
+        reset_at: Optional[float] = None,
+    ):
+        self._set_state(RateLimitState(remaining=remaining, limit=limit, reset_at=reset_at))
+        with self._lock:
+            self.updates += 1
+
+    def _set_state(self, state: RateLimitState):
+        with self._lock:
+            self._state = state
+        metrics().gauge(
+            "validation_rate_limit_remaining",
+            "Requests remaining in the API rate limit of the service.",
+            ("host",),
+        ).set(state.remaining, host=self.host)
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        Update the budget from the rate limit headers of a response, if it has any.
+        """
+        resource = headers.get(RESOURCE_HEADER)
+        if resource and resource != CORE_RESOURCE:
+            return
+
+        remaining = _first_header(headers, REMAINING_HEADERS)
+        if remaining is None:
+            return
+
+        limit = _first_header(headers, LIMIT_HEADERS)
+        reset = _first_header(headers, RESET_HEADERS)
+        reset_at = None
+        if reset is not None:
+            reset_at = float(reset)
+            if reset_at < _EPOCH_THRESHOLD:
+                reset_at += time.time()
+        self.update(
+            int(float(remaining)),
+            limit=int(float(limit)) if limit is not None else None,
+            reset_at=reset_at,
+        )
+
+    @property
+    def state(self) -> Optional[RateLimitState]:
+        """
+        Latest known state of the budget, None if unknown or if the rate limit has been
+        reset since (the next response will tell).
+        """
+        state = self._state
+        if state and state.reset_at and state.reset_at <= time.time():
+            return None
+        return state
+
+    @property
+    def remaining(self) -> Optional[int]:
+        state = self.state
+        return state.remaining if state else None
+
+    def seconds_to_reset(self) -> Optional[float]:
+        state = self.state
+        if not state or state.reset_at is None:
+            return None
+        return max(state.reset_at - time.time(), 0)
+
+    def pace(self, interval: float) -> float:
+        """
+        Stretch the interval between the polls when the budget runs short.
+
+        Args:
+            interval: Interval the poll would wait otherwise (seconds).
+
+        Returns:
+            Interval to wait (seconds).
+        """
+        state = self.state
+        if not state:
+            return interval
+
+        to_reset = self.seconds_to_reset()
+        spare = state.remaining - self.reserve
+        if spare <= 0:
+            return max(interval, to_reset or interval)
+
+        low_water = self.LOW_WATER * state.limit if state.limit else 2 * self.reserve
+        if spare >= low_water:
+            return interval
+
+        # Spread the polls so that the spare requests last until the reset
+        stretched = interval * low_water / spare
+        if to_reset is not None:
+            stretched = min(stretched, max(interval, to_reset))
+        logging.debug(
+            "Rate limit budget of %s is short (%d remaining), polling every %d seconds",
+            self.host,
+            state.remaining,
+            stretched,
+        )
+        return stretched
+
+    async def wait_for(self, requests_needed: int):
+        """
+        Wait until the budget has the given number of requests above the reserve,
+        i.e. for the reset of the rate limit if it's short.
+        """
+        state = self.state
+        if not state or state.remaining - requests_needed >= self.reserve:
+            return
+
+        to_reset = self.seconds_to_reset()
+        if to_reset is None:
+            deficit = requests_needed + self.reserve - state.remaining
+            to_reset = max(self.UNKNOWN_RESET_MIN_WAIT, deficit)
+        wait = min(to_reset, self.MAX_WAIT)
+        logging.warning(
+            "Rate limit budget of %s is short: %d remaining (need %d). "
+            "Waiting %d seconds for the reset.",
+            self.host,
+            state.remaining,
+            requests_needed + self.reserve,
+            wait,
+        )
+        await asyncio.sleep(wait)
+
+
+@lru_cache
+def rate_limit_budget(host: str) -> RateLimitBudget:
+    """
+    Get the rate limit budget shared by all the clients of the given host.
+    """
+    return RateLimitBudget(host)
+
+
+class _RateLimitHook:
+    def __init__(self, budget: RateLimitBudget):
+        self.budget = budget
+
+    def __call__(self, response: requests.Response, **_kwargs):
+        self.budget.update_from_headers(response.headers)
+
+
+def install_rate_limit_tracking(session: requests.Session, budget: RateLimitBudget):
+    """
+    Feed the budget from the responses of the session (e.g. python-gitlab, ogr Pagure).
+    """
+    hooks = session.hooks["response"]
+    if not any(isinstance(hook, _RateLimitHook) for hook in hooks):
+        hooks.append(_RateLimitHook(budget))
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from collections.abc import Awaitable
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+CommitFetcher = Callable[[str], Awaitable[list]]
+BatchFetcher = Callable[[list[str]], Awaitable[dict[str, list]]]
+
+
+@dataclass
+class _PendingCommit:
+    fetch: CommitFetcher
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+class StatusPoller:
+    """
+    Suite-wide poller of commit statuses shared by all the test cases of a suite.
+
+    The requests of the test cases are collected and served together in polling
+    cycles. Each commit is fetched only once per cycle and if a batch fetcher
+    is available (e.g. a GraphQL query in GitHub), the whole cycle is a single
+    API call, so the number of calls does not grow with the number of tests.
+    """
+
+    BATCH_WINDOW = 5  # seconds - time to collect the requests before a cycle starts
+    MIN_CYCLE_INTERVAL = 10  # seconds - minimal time between the starts of two cycles
+
+    def __init__(
+        self,
+        batch_fetch: Optional[BatchFetcher] = None,
+        batch_window: float = BATCH_WINDOW,
+        min_cycle_interval: float = MIN_CYCLE_INTERVAL,
+    ):
+        self.batch_fetch = batch_fetch
+        self.batch_window = batch_window
+        self.min_cycle_interval = min_cycle_interval
+        self.cycles = 0
+        self._pending: dict[str, _PendingCommit] = {}
+        self._cycle: Optional[asyncio.Task] = None
+        self._last_cycle_at: Optional[float] = None
+
+    async def get_statuses(self, commit: str, fetch: CommitFetcher) -> list:
+        """
+        Get the statuses of the commit from the next polling cycle.
+
+        Args:
+            commit: SHA of the commit.
+            fetch: Coroutine function fetching the statuses of a single commit,
+                used when there is no batch fetcher.
+
+        Returns:
+            All the statuses of the commit (not filtered).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(commit, _PendingCommit(fetch=fetch)).futures.append(future)
+
+        if self._cycle is None:
+            delay = self.batch_window
+            if self._last_cycle_at is not None:
+                delay = max(delay, self._last_cycle_at + self.min_cycle_interval - loop.time())
+            self._cycle = asyncio.create_task(self._run_cycle(delay))
+
+        return await future
+
+    async def _fetch(self, pending: dict[str, _PendingCommit]) -> dict[str, Any]:
+        if self.batch_fetch:
+            try:
+                statuses = await self.batch_fetch(list(pending))
+            except Exception as e:
+                return dict.fromkeys(pending, e)
+            return {commit: statuses.get(commit, []) for commit in pending}
+
+        results = await asyncio.gather(
+            *(entry.fetch(commit) for commit, entry in pending.items()),
+            return_exceptions=True,
+        )
+        return dict(zip(pending, results))
+
+    async def _run_cycle(self, delay: float):
+        await asyncio.sleep(delay)
+
+        pending, self._pending = self._pending, {}
+        self._cycle = None
+        self._last_cycle_at = asyncio.get_running_loop().time()
+        self.cycles += 1
+        logging.debug(
+            "Status polling cycle #%d for %d commit(s), %d request(s)",
+            self.cycles,
+            len(pending),
+            sum(len(entry.futures) for entry in pending.values()),
+        )
+
+        results = await self._fetch(pending)
+        for commit, entry in pending.items():
+            result = results[commit]
+            for future in entry.futures:
+                if future.done():
+                    # the waiting test case was cancelled meanwhile
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -0,0 +1,120 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+from collections.abc import Hashable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Generic, Optional, TypeVar
+
+S = TypeVar("S")
+
+
+@dataclass
+class CheckTimeline:
+    """
+    Times when a named check (commit status) was first seen in each of its states.
+    """
+
+    name: str
+    appeared_at: datetime
+    pending_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    successful: Optional[bool] = None
+
+
+class StatusTracker(Generic[S]):
+    """
+    Tracker of the statuses of the tested commit, diffing each polled snapshot
+    against the previous one.
+
+    Only the new or changed statuses are evaluated (whether they were created
+    after the trigger, in which state they are), the transitions of the named checks
+    are recorded to their timelines.
+    """
+
+    def __init__(
+        self,
+        name_of: Callable[[S], str],
+        key_of: Callable[[S], Hashable],
+        is_recent: Callable[[S], bool],
+        is_completed: Callable[[S], bool],
+        is_successful: Callable[[S], bool],
+    ):
+        """
+        Args:
+            name_of: Name of the check of the status.
+            key_of: Identity of the status in its current state, a status with
+                an unchanged key is not evaluated again.
+            is_recent: Whether the status was created after the trigger.
+            is_completed: Whether the status is completed.
+            is_successful: Whether the completed status is successful.
+        """
+        self.name_of = name_of
+        self.key_of = key_of
+        self._is_recent = is_recent
+        self.is_completed = is_completed
+        self.is_successful = is_successful
+        self.timelines: dict[str, CheckTimeline] = {}
+        # Increased on every snapshot with a new or changed recent status
+        self.version = 0
+        # Recent statuses of the latest snapshot
+        self.statuses: list[S] = []
+        # Recency of the statuses of the latest snapshot by their keys
+        self._recent: dict[Hashable, bool] = {}
+
+    def is_recent(self, status: S) -> bool:
+        """
+        Check whether the status was created after the trigger, evaluated only
+        if it's not known from the latest snapshot.
+        """
+        recent = self._recent.get(self.key_of(status))
+        return self._is_recent(status) if recent is None else recent
+
+    def update(self, statuses: list[S]) -> list[S]:
+        """
+        Diff the snapshot of the statuses against the previous one.
+
+        Returns:
+            The recent statuses that are new or changed since the previous snapshot.
+        """
+        now = datetime.now(tz=timezone.utc)
+        recent_by_key = {}
+        changed = []
+        for status in statuses:
+            key = self.key_of(status)
+            recent = self._recent.get(key)
+            if recent is None:
+                recent = self._is_recent(status)
+                if recent:
+                    changed.append(status)
+                    self._record(status, now)
+            recent_by_key[key] = recent
+
+        self._recent = recent_by_key
+        self.statuses = [status for status in statuses if recent_by_key[self.key_of(status)]]
+        if changed:
+            self.version += 1
+        return changed
+
+    def _record(self, status: S, now: datetime):
+        name = self.name_of(status)
+        timeline = self.timelines.get(name)
+        if not timeline:
+            timeline = self.timelines[name] = CheckTimeline(name=name, appeared_at=now)
+            logging.debug("Check %s appeared", name)
+
+        if not self.is_completed(status):
+            if not timeline.pending_at:
+                timeline.pending_at = now
+                logging.debug("Check %s went pending", name)
+        elif not timeline.completed_at:
+            timeline.completed_at = now
+            timeline.successful = self.is_successful(status)
+            logging.debug(
+                "Check %s completed (%s) in %d seconds since it appeared",
+                name,
+                "success" if timeline.successful else "failure",
+                (now - timeline.appeared_at).total_seconds(),
+            )
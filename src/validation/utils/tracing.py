@@ -0,0 +1,235 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import enum
+import json
+import logging
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, wraps
+from os import getenv
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+# File the spans are appended to (as OTLP JSON lines, one trace per run),
+# the tracing is enabled only if it is set
+TRACE_FILE_ENV = "VALIDATION_TRACE_FILE"
+SERVICE_NAME = "packit-validation"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class SpanKind(enum.IntEnum):
+    # Values of the OTLP SpanKind
+    internal = 1
+    client = 3
+
+
+# Value of the OTLP StatusCode of the failed spans
+STATUS_CODE_ERROR = 2
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Span:
+    """
+    Timed operation of the run, a node of the trace of the whole run.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent: Optional["Span"] = None,
+        kind: SpanKind = SpanKind.internal,
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attributes(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    def as_otlp(self) -> dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+                if value is not None
+            ],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error is not None:
+            span["status"] = {"code": STATUS_CODE_ERROR, "message": self.error}
+        return span
+
+
+class FileSpanExporter:
+    """
+    Exporter appending the finished spans to a file in the format of the file exporter
+    of the OpenTelemetry Collector (a line of OTLP JSON per span), which can be loaded
+    by its otlpjsonfile receiver or inspected directly.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.failed = False
+        # The spans end in any of the running tests
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        line = json.dumps(
+            {
+                "resourceSpans": [
+                    {
+                        "resource": {
+                            "attributes": [
+                                {"key": "service.name", "value": _otlp_value(SERVICE_NAME)},
+                            ],
+                        },
+                        "scopeSpans": [
+                            {"scope": {"name": "validation"}, "spans": [span.as_otlp()]},
+                        ],
+                    },
+                ],
+            },
+        )
+        with self._lock:
+            if self.failed:
+                return
+            try:
+                with self.path.open("a") as trace_file:
+                    trace_file.write(f"{line}\n")
+            except OSError as e:
+                # Don't fail (or flood the log) on every span
+                self.failed = True
+                logging.warning("Failed to write the spans to %s: %s", self.path, e)
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Tracer of the run, all the spans of the run form a single trace.
+
+    The parent of a span is the span current in its context, the tasks of the tests
+    started in a span (e.g. of the suite) inherit it as their parent.
+    """
+
+    def __init__(self, exporter: FileSpanExporter):
+        self.exporter = exporter
+        self.trace_id = secrets.token_hex(16)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.internal,
+        attributes: Optional[dict[str, Any]] = None,
+    ) -> Iterator[Span]:
+        span = Span(name, self.trace_id, _current_span.get(), kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            # Including the cancellation of the tests ended early
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.export(span)
+
+
+@lru_cache
+def tracer() -> Optional[Tracer]:
+    """
+    Get the tracer of the run, None if the tracing is not enabled.
+    """
+    path = getenv(TRACE_FILE_ENV)
+    if not path:
+        return None
+    run_tracer = Tracer(FileSpanExporter(Path(path)))
+    logging.info("Writing trace %s to %s", run_tracer.trace_id, path)
+    return run_tracer
+
+
+@contextmanager
+def span(
+    name: str,
+    kind: SpanKind = SpanKind.internal,
+    attributes: Optional[dict[str, Any]] = None,
+) -> Iterator[Optional[Span]]:
+    """
+    Trace the block as a span, if the tracing is enabled.
+    """
+    run_tracer = tracer()
+    if not run_tracer:
+        yield None
+        return
+    with run_tracer.span(name, kind, attributes) as new_span:
+        yield new_span
+
+
+def client_span(host: str, operation: str) -> AbstractContextManager[Optional[Span]]:
+    """
+    Trace an outbound call to a forge, Copr or Koji as a client span.
+    """
+    return span(f"{host} {operation}", SpanKind.client, {"server.address": host})
+
+
+def annotate(**attributes: Any):
+    """
+    Add the attributes to the current span, if any.
+    """
+    if current := _current_span.get():
+        current.set_attributes(**attributes)
+
+
+def traced(name: str) -> Callable[[F], F]:
+    """
+    Trace the calls of the coroutine function as spans with the given name.
+
+    An override calling the traced method of its parent stays a single span.
+    """
+
+    def decorator(func: F) -> F:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            current = _current_span.get()
+            if current and current.name == name:
+                return await func(*args, **kwargs)
+            with span(name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
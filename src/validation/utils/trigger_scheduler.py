@@ -0,0 +1,197 @@
+# SPDX-FileCopyrightText: 2023-present Contributors to the Packit Project.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import statistics
+import sys
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+SECONDS_PER_MINUTE = 60
+
+
+@dataclass(frozen=True)
+class TriggerLimits:
+    """
+    Limits of the tests triggering packit-service, a token bucket refilled
+    with `per_minute` triggers per minute holding up to `burst` of them,
+    and optionally a cap of the tests waiting for the reaction of packit-service at once.
+    """
+
+    per_minute: float
+    burst: int = 1
+    max_concurrent: Optional[int] = None
+
+
+class TriggerLimiter:
+    """
+    Token bucket of the triggers with an optional cap of the tests waiting for
+    the reaction of packit-service at once.
+
+    The rate of the bucket adapts to the reaction latency of packit-service
+    (time from a trigger to the first pending status): it's halved when the latency
+    rises well above the median of the recent ones and increased step by step while
+    the service is as quick as usual, within the bounds given by the configured rate.
+    """
+
+    SLOWDOWN_RATIO = 2  # latency (relative to the baseline) over which the rate is halved
+    SPEEDUP_RATIO = 1.25  # latency (relative to the baseline) under which the rate is raised
+    BASELINE_REACTIONS = 10  # recent reactions whose median latency is the baseline
+    RATE_RANGE = 4  # the rate stays within the configured rate divided/multiplied by this
+    RECHECK_INTERVAL = 10  # seconds - longest wait before re-checking the bucket
+
+    def __init__(self, name: str, limits: TriggerLimits):
+        self.name = name
+        self.limits = limits
+        self.rate = limits.per_minute / SECONDS_PER_MINUTE  # tokens per second
+        # Latencies of the recent reactions, the baseline follows the service
+        # when it gets permanently slower or faster
+        self.reactions: deque[float] = deque(maxlen=self.BASELINE_REACTIONS)
+        self.running = 0
+        self._tokens = float(limits.burst)
+        self._updated_at: Optional[float] = None
+        # Waiting tests take the tokens in the order they came
+        self._lock = asyncio.Lock()
+        self._concurrency = asyncio.Semaphore(limits.max_concurrent or sys.maxsize)
+
+    def _refill(self, now: float):
+        if self._updated_at is not None:
+            self._tokens = min(
+                self.limits.burst,
+                self._tokens + (now - self._updated_at) * self.rate,
+            )
+        self._updated_at = now
+
+    def record_reaction(self, latency: float):
+        """
+        Adapt the rate of the triggers to the observed reaction latency of packit-service.
+
+        Args:
+            latency: Seconds from a trigger to the reaction of the service.
+        """
+        configured = self.limits.per_minute / SECONDS_PER_MINUTE
+        baseline = statistics.median(self.reactions) if self.reactions else latency
+        self.reactions.append(latency)
+
+        rate = self.rate
+        if latency > baseline * self.SLOWDOWN_RATIO:
+            rate = max(rate / 2, configured / self.RATE_RANGE)
+        elif latency < baseline * self.SPEEDUP_RATIO:
+            rate = min(rate + configured / self.RATE_RANGE, configured * self.RATE_RANGE)
+
+        if rate != self.rate:
+            logging.info(
+                "Reaction of packit-service took %d seconds, triggering %.2f tests/minute on %s",
+                latency,
+                rate * SECONDS_PER_MINUTE,
+                self.name,
+            )
+            self.rate = rate
+
+    async def _take_token(self):
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._refill(loop.time())
+            if self._tokens < 1:
+                logging.info(
+                    "Waiting %d seconds for a trigger slot of %s",
+                    (1 - self._tokens) / self.rate,
+                    self.name,
+                )
+            while self._tokens < 1:
+                # Re-check regularly, the rate can change meanwhile
+                await asyncio.sleep(min((1 - self._tokens) / self.rate, self.RECHECK_INTERVAL))
+                self._refill(loop.time())
+            self._tokens -= 1
+
+    async def acquire(self):
+        """
+        Take a slot for a trigger, wait for a free one and for a token if needed.
+        """
+        await self._concurrency.acquire()
+        try:
+            await self._take_token()
+        except BaseException:
+            self._concurrency.release()
+            raise
+        self.running += 1
+
+    def release(self):
+        """
+        Free the slot once packit-service has reacted to the trigger.
+        """
+        self.running -= 1
+        self._concurrency.release()
+
+
+class TriggerScheduler:
+    """
+    Scheduler of the triggers of the tests of a forge host, each test triggers
+    packit-service as soon as a trigger slot of both the host and the deployment is free.
+    """
+
+    def __init__(self, host: TriggerLimiter, deployment: TriggerLimiter):
+        self.host = host
+        self.deployment = deployment
+
+    async def acquire(self):
+        """
+        Take a slot of the host and the deployment for a trigger.
+        """
+        await self.host.acquire()
+        try:
+            await self.deployment.acquire()
+        except BaseException:
+            self.host.release()
+            raise
+
+    def release(self):
+        """
+        Free the slots taken for a trigger, once packit-service has reacted to it
+        (or the test gave up on the reaction).
+        """
+        self.deployment.release()
+        self.host.release()
+
+    def record_reaction(self, latency: float):
+        """
+        Report the reaction latency of packit-service observed by a test,
+        the triggers of the deployment (across all the hosts) adapt to it.
+        """
+        self.deployment.record_reaction(latency)
+
+
+_deployment_limiters: dict[str, TriggerLimiter] = {}
+_schedulers: dict[str, TriggerScheduler] = {}
+
+
+def get_trigger_scheduler(
+    host: str,
+    limits: TriggerLimits,
+    deployment: str,
+    deployment_limits: TriggerLimits,
+) -> TriggerScheduler:
+    """
+    Get the trigger scheduler of the host shared by all the suites of the run.
+
+    Args:
+        host: Hostname of the forge.
+        limits: Limits of the triggers on the host.
+        deployment: Name of the packit-service deployment being validated.
+        deployment_limits: Limits of the triggers of the deployment across all the hosts.
+
+    Returns:
+        The scheduler, created with the limits of the first suite of the host.
+    """
+    if deployment not in _deployment_limiters:
+        _deployment_limiters[deployment] = TriggerLimiter(deployment, deployment_limits)
+    if host not in _schedulers:
+        logging.debug("Creating trigger scheduler for %s with %s", host, limits)
+        _schedulers[host] = TriggerScheduler(
+            TriggerLimiter(host, limits),
+            _deployment_limiters[deployment],
+        )
+    return _schedulers[host]